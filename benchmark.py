@@ -1,5 +1,10 @@
 import objectbox
+import os
+import tempfile
 import time
+import numpy as np
+from objectbox import *
+from objectbox.model.idsync import sync_model
 from objectbox.store import Store
 from tests.model import TestEntity
 from tests.common import create_test_store
@@ -110,6 +115,169 @@ class PerfExecutor:
         sys.stdout.flush()
 
 
+class MarshalPerfExecutor:
+    """
+    Compares the generic marshalling code path with the generated one, using one entity per property type
+    """
+
+    samples = {
+        "Bool": (Bool, True),
+        "Int8": (Int8, 42),
+        "Int16": (Int16, 4242),
+        "Int32": (Int32, 424242),
+        "Int64": (Int64, 42424242424242),
+        "Float32": (Float32, 4.2),
+        "Float64": (Float64, 4.242),
+        "Date": (Date, 1717000000.123),
+        "DateNano": (DateNano, 1717000000123456789),
+        "String": (String, "Entity no. 42"),
+        "Bytes": (Bytes, bytes(range(64))),
+        "Flex": (Flex, {"name": "Entity no. 42", "values": [1, 2, 3]}),
+        "BoolVector": (BoolVector, np.ones(64, dtype=np.bool_)),
+        "Int16Vector": (Int16Vector, np.arange(64, dtype=np.int16)),
+        "Int32Vector": (Int32Vector, np.arange(64, dtype=np.int32)),
+        "Int64Vector": (Int64Vector, np.arange(64, dtype=np.int64)),
+        "Float32Vector": (Float32Vector, np.random.rand(128).astype(np.float32)),
+        "Float64Vector": (Float64Vector, np.random.rand(128)),
+        "Float32List": (Float32List, [0.5] * 128),
+    }
+
+    def __init__(self):
+        model = Model()
+        self.entities = {}
+        for name, (prop_type, _) in self.samples.items():
+            user_type = type("Marshal" + name, (), {"id": Id(), "value": prop_type()})
+            self.entities[name] = Entity(model="benchmark")(user_type)
+            model.entity(self.entities[name])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            sync_model(model, os.path.join(tmp_dir, "objectbox-model.json"))
+
+    def run(self, count=10000):
+        print("Marshalling %d objects per property type, unit: microseconds per object" % count)
+        print("Type\t\tGeneric\tGenerated\tSpeedup")
+        for name, (_, value) in self.samples.items():
+            entity = self.entities[name]
+            obj = entity(value=value)
+            assert entity._marshal(obj, 1) == entity._marshal_generic(obj, 1)
+
+            start = time.perf_counter_ns()
+            for i in range(count):
+                entity._marshal_generic(obj, 1)
+            generic = (time.perf_counter_ns() - start) / count / 1000
+
+            start = time.perf_counter_ns()
+            for i in range(count):
+                entity._marshal(obj, 1)
+            generated = (time.perf_counter_ns() - start) / count / 1000
+
+            print("%-15s\t%.2f\t%.2f\t\t%.1fx" % (name, generic, generated, generic / generated))
+
+
+class TxGetPerfExecutor:
+    """
+    Measures getting objects one by one: each box.get() in its own transaction, box.get() reusing the active
+    transaction and TxBox.get() using the transaction's cursor directly
+    """
+
+    def __init__(self, ob: ObjectBoxPerf):
+        self.store = ob.store
+        self.box = ob.box
+
+    def run(self, count=100000):
+        self.box.remove_all()
+        ids = []
+        for start in range(0, count, 10000):  # IDs for put are limited to 10000 per transaction
+            items = [TestEntity(str="Entity no. %d" % i, int64=i) for i in range(start, min(start + 10000, count))]
+            self.box.put(items)
+            ids.extend(item.id for item in items)
+
+        print("Getting %d objects one by one, unit: microseconds per object" % count)
+        results = {}
+
+        start = time.perf_counter_ns()
+        for id in ids:
+            self.box.get(id)
+        results["box.get()"] = time.perf_counter_ns() - start
+
+        # previous behavior: a transaction around the loop did not prevent each get() from starting its own
+        start = time.perf_counter_ns()
+        with objectbox.transaction.read(self.store, activate=False):
+            for id in ids:
+                self.box.get(id)
+        results["box.get() in non-reused tx"] = time.perf_counter_ns() - start
+
+        start = time.perf_counter_ns()
+        with self.store.read_tx():
+            for id in ids:
+                self.box.get(id)
+        results["box.get() in read_tx()"] = time.perf_counter_ns() - start
+
+        start = time.perf_counter_ns()
+        with self.store.read_tx() as tx:
+            tx_box = tx.box(TestEntity)
+            for id in ids:
+                tx_box.get(id)
+        results["tx.box().get()"] = time.perf_counter_ns() - start
+
+        baseline = results["box.get()"]
+        for name, duration in results.items():
+            print("%-30s\t%.2f\t%.1fx" % (name, duration / count / 1000, baseline / duration))
+        self.box.remove_all()
+
+
+class ZeroCopyPerfExecutor:
+    """
+    Compares reading all objects with and without copying their data out of the database memory first; bytes copied
+    per row count the object data copied to bytes plus the vector values copied while decoding
+    """
+
+    def __init__(self, ob: ObjectBoxPerf):
+        self.store = ob.store
+        self.box = ob.box
+
+    @staticmethod
+    def __copied_vector_bytes(objects) -> int:
+        return sum(obj.floats.nbytes for obj in objects)
+
+    def run(self, count=100000):
+        self.box.remove_all()
+        for start in range(0, count, 10000):
+            self.box.put([TestEntity(str="Entity no. %d" % i, int64=i, floats=np.random.rand(16).astype(np.float32))
+                          for i in range(start, min(start + 10000, count))])
+        with self.store.read_tx():
+            c_bytes_array_p = objectbox.c.obx_box_get_all(self.box._c_box)
+            c_bytes_array = c_bytes_array_p.contents
+            object_bytes = sum(c_bytes_array.data[i].size for i in range(c_bytes_array.count))
+            objectbox.c.obx_bytes_array_free(c_bytes_array_p)
+
+        print("Reading %d objects, unit: microseconds per object, bytes copied per object" % count)
+        results = {}
+
+        start = time.perf_counter_ns()
+        objects = self.box.get_all()
+        results["get_all()"] = (time.perf_counter_ns() - start, object_bytes)  # vectors reference the copies
+
+        start = time.perf_counter_ns()
+        objects = self.box.get_all(zero_copy=True)
+        results["get_all(zero_copy)"] = (time.perf_counter_ns() - start, self.__copied_vector_bytes(objects))
+
+        start = time.perf_counter_ns()
+        objects = self.box.get_all(lazy=True)
+        sum(obj.int64 for obj in objects)
+        results["get_all(lazy), one property"] = (time.perf_counter_ns() - start, object_bytes)
+
+        start = time.perf_counter_ns()
+        with self.store.read_tx():
+            objects = self.box.get_all(lazy=True, zero_copy=True)
+            sum(obj.int64 for obj in objects)
+        results["get_all(lazy, zero_copy), one"] = (time.perf_counter_ns() - start, 0)
+
+        baseline = results["get_all()"][0]
+        for name, (duration, copied) in results.items():
+            print("%-30s\t%.2f\t%.1fx\t%d" % (name, duration / count / 1000, baseline / duration, copied / count))
+        self.box.remove_all()
+
+
 if __name__ == "__main__":
     Store.remove_db_files("testdata")
 
@@ -117,4 +285,13 @@ if __name__ == "__main__":
     executor = PerfExecutor(obPerf)
     executor.run(count=10000, runs=20)
 
+    print()
+    MarshalPerfExecutor().run(count=10000)
+
+    print()
+    TxGetPerfExecutor(obPerf).run(count=100000)
+
+    print()
+    ZeroCopyPerfExecutor(obPerf).run(count=100000)
+
     Store.remove_db_files("testdata")
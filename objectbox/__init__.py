@@ -18,7 +18,7 @@ from objectbox.builder import Builder
 from objectbox.model import Model, Entity, Id, String, Index, Bool, Int8, Int16, Int32, Int64, Float32, Float64, Bytes, BoolVector, Int8Vector, Int16Vector, Int32Vector, Int64Vector, Float32Vector, Float64Vector, CharVector, BoolList, Int8List, Int16List, Int32List, Int64List, Float32List, Float64List, CharList, Date, DateNano, Flex, HnswIndex, VectorDistanceType
 from objectbox.store import Store
 from objectbox.objectbox import ObjectBox
-from objectbox.c import NotFoundException, version_core, DebugFlags
+from objectbox.c import NotFoundException, version_core, DebugFlags, PutMode
 from objectbox.version import Version
 
 __all__ = [
@@ -63,7 +63,8 @@ __all__ = [
     'NotFoundException',
     'version',
     'version_info',
-    'DebugFlags'
+    'DebugFlags',
+    'PutMode'
 ]
 
 # Python binding version
@@ -0,0 +1,222 @@
+# Copyright 2019-2024 ObjectBox Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" asyncio support: awaitable variants of Store, Box and Query that do not block the event loop.
+
+Writes are serialized onto a single writer thread, which executes all writes queued meanwhile in a single write
+transaction. Reads run on a bounded thread pool, sized to stay below the store's max_readers.
+
+Example::
+
+    async with AsyncStore(Store(model=...)) as store:
+        box = store.box(Task)
+        task_id = await box.put(Task(text="Buy milk"))
+        async for task in box.query(Task.text.contains("milk")).iter():
+            ...
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import *
+
+from objectbox.box import Box
+from objectbox.condition import QueryCondition
+from objectbox.model.entity import _Entity
+from objectbox.observer import Subscription
+from objectbox.query import Query
+from objectbox.store import Store
+
+# the library's default for Store's max_readers
+_DEFAULT_MAX_READERS = 126
+
+
+class AsyncStore:
+    """ asyncio wrapper of a Store; use box() to get AsyncBox instances. """
+
+    def __init__(self, store: Store, readers: Optional[int] = None, max_write_batch: int = 1000,
+                 close_store: bool = True):
+        """
+        :param store:
+            The store to use.
+        :param readers:
+            The number of reader threads. Defaults to the number of CPUs + 4 (at most 32), but is always kept below
+            the store's max_readers.
+        :param max_write_batch:
+            The maximum number of write operations executed in a single write transaction.
+        :param close_store:
+            If True, close() also closes the store.
+        """
+        max_readers = store._max_readers or _DEFAULT_MAX_READERS
+        if readers is None:
+            readers = min(32, (os.cpu_count() or 1) + 4)
+        readers = max(1, min(readers, max_readers - 2))  # leave readers for the writer and the store itself
+        self.store = store
+        self._close_store = close_store
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="objectbox-aio-reader")
+        self._writer = store.batcher(max_ops=max_write_batch, max_delay_ms=0)  # no delay: batch opportunistically
+
+    def box(self, entity: _Entity) -> 'AsyncBox':
+        return AsyncBox(self, self.store.box(entity))
+
+    def changes(self, entities: Union[_Entity, Iterable[_Entity]]) -> 'AsyncChangeFeed':
+        """ Returns an async iterator yielding the list of changed entities after commits changing any of the given
+        entities; see Store.changes(). Must be called from the event loop's thread. """
+        return AsyncChangeFeed(self.store, entities)
+
+    async def _read(self, fn: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._readers, fn, *args)
+
+    async def _write(self, fn: Callable[[], Any]) -> Any:
+        # only database operations: safe to re-execute individually if the shared transaction failed
+        return await asyncio.wrap_future(self._writer._submit(fn, True))
+
+    def close(self):
+        """ Completes all queued writes, stops the threads and closes the store (if close_store was set). """
+        self._writer.close()
+        self._readers.shutdown(wait=True)
+        if self._close_store:
+            self.store.close()
+
+    async def __aenter__(self) -> 'AsyncStore':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+
+class AsyncBox:
+    """ asyncio variant of Box; see the Box methods of the same name. """
+
+    def __init__(self, store: AsyncStore, box: Box):
+        self._store = store
+        self.box = box
+
+    async def put(self, *objects) -> Optional[int]:
+        return await self._store._write(lambda: self.box.put(*objects))
+
+    async def get(self, id: int):
+        return await self._store._read(self.box.get, id)
+
+    async def get_many(self, ids) -> list:
+        return await self._store._read(self.box.get_many, ids)
+
+    async def get_all(self) -> list:
+        return await self._store._read(self.box.get_all)
+
+    async def count(self, limit: int = 0) -> int:
+        return await self._store._read(self.box.count, limit)
+
+    async def remove(self, id_or_object) -> bool:
+        return await self._store._write(lambda: self.box.remove(id_or_object))
+
+    async def remove_all(self) -> int:
+        return await self._store._write(self.box.remove_all)
+
+    def query(self, condition: Optional[QueryCondition] = None) -> 'AsyncQuery':
+        """ Builds a query for the given condition. """
+        return AsyncQuery(self._store, self.box.query(condition).build())
+
+
+class AsyncQuery:
+    """ asyncio variant of Query; calls on the same AsyncQuery are executed one after another. """
+
+    def __init__(self, store: AsyncStore, query: Query):
+        self._store = store
+        self.query = query
+        self._lock = asyncio.Lock()  # native queries must not be used concurrently
+
+    async def find(self) -> list:
+        async with self._lock:
+            return await self._store._read(self.query.find)
+
+    async def find_ids(self) -> List[int]:
+        async with self._lock:
+            return await self._store._read(self.query.find_ids)
+
+    async def count(self) -> int:
+        async with self._lock:
+            return await self._store._read(self.query.count)
+
+    async def remove(self) -> int:
+        async with self._lock:
+            return await self._store._write(self.query.remove)
+
+    async def iter(self, batch_size: int = 1000) -> AsyncIterator:
+        """ Asynchronously iterates over the objects matching the query, which are visited (see Query.visit_iter())
+        in a background thread, at most two batches of batch_size objects ahead of the consumer. """
+        async with self._lock:
+            batches = self.query._visit_batches(batch_size)
+            try:
+                while True:
+                    batch = await self._store._read(next, batches, None)
+                    if batch is None:
+                        break
+                    for obj in batch:
+                        yield obj
+            finally:
+                await self._store._read(batches.close)
+
+
+class AsyncChangeFeed:
+    """ asyncio variant of ChangeFeed: changes are passed from the store's observer thread to the event loop, where
+    they are coalesced until consumed. Close it (or use it as a context manager) to end the iteration. """
+
+    def __init__(self, store: Store, entities: Union[_Entity, Iterable[_Entity]]):
+        self._loop = asyncio.get_running_loop()
+        self._pending: Dict[int, _Entity] = {}
+        self._event = asyncio.Event()
+        self._closed = False
+        self._subscription: Subscription = store.subscribe(entities, self._on_change)
+        self._subscription._on_close = lambda: self._call_soon(self._on_close)
+
+    def _call_soon(self, fn: Callable, *args):
+        try:
+            self._loop.call_soon_threadsafe(fn, *args)
+        except RuntimeError:
+            pass  # the loop was closed
+
+    def _on_change(self, entities: List[_Entity]):
+        self._call_soon(self._add, entities)
+
+    def _add(self, entities: List[_Entity]):
+        if not self._closed:
+            self._pending.update((entity._id, entity) for entity in entities)
+            self._event.set()
+
+    def _on_close(self):
+        self._closed = True
+        self._event.set()
+
+    def __aiter__(self) -> 'AsyncChangeFeed':
+        return self
+
+    async def __anext__(self) -> List[_Entity]:
+        while not self._pending:
+            if self._closed:
+                raise StopAsyncIteration
+            self._event.clear()
+            await self._event.wait()
+        changed, self._pending = list(self._pending.values()), {}
+        return changed
+
+    def close(self):
+        self._subscription.close()
+        self._on_close()
+
+    async def __aenter__(self) -> 'AsyncChangeFeed':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,70 @@
+# Copyright 2019-2024 ObjectBox Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from concurrent.futures import Future
+from typing import *
+
+from objectbox.c import *
+
+
+class AsyncQueueCompletions:
+    """ Resolves the futures of operations submitted to the store's native async queue once they were processed.
+
+    The C API does not report the completion of individual operations; thus, a background thread repeatedly awaits
+    all operations submitted so far (obx_store_await_async_submitted) and resolves the futures tracked until then.
+    Neither does it report failures of individual operations: a resolved future only means "processed by the queue",
+    not "committed".
+    """
+
+    def __init__(self, c_store):
+        self._c_store = c_store
+        self._pending: List[Tuple[Future, Any]] = []
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="objectbox-async-completions", daemon=True)
+        self._thread.start()
+
+    def track(self, result: Any) -> Future:
+        """ Returns a future resolving to result once all operations submitted so far have been processed. """
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise Exception("Store is closed")
+            self._pending.append((future, result))
+            self._condition.notify()
+        return future
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                pending, self._pending = self._pending, []
+            processed = obx_store_await_async_submitted(self._c_store)
+            for future, result in pending:
+                if processed:
+                    future.set_result(result)
+                else:
+                    future.set_exception(Exception("Async queue was shut down before processing the operation"))
+
+    def close(self):
+        """ Awaits the pending operations (resolving their futures) and stops the background thread. """
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
@@ -0,0 +1,158 @@
+# Copyright 2019-2024 ObjectBox Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+from concurrent.futures import Future, wait
+from typing import *
+
+
+class Batcher:
+    """ Coalesces write operations submitted from any thread (for any box) into shared write transactions.
+
+    Operations are executed by a background thread, which commits a transaction once max_ops operations are pending,
+    the oldest pending operation waited for max_delay_ms, or flush() is called.
+    Each submission returns a concurrent.futures.Future with the result of the operation (or its exception).
+    If an operation fails, the transaction is discarded and the operations are re-executed in individual transactions
+    so that only the failing ones report an error; except for functions passed to submit() that ran already, which
+    are not re-executed but fail with the error that aborted the transaction (as they may not be safe to run twice).
+
+    Create via Store.batcher(); call close() (or use it as a context manager) to commit pending operations.
+    """
+
+    def __init__(self, store: 'Store', max_ops: int = 1000, max_delay_ms: float = 10):
+        if max_ops <= 0:
+            raise ValueError(f"max_ops must be positive, got {max_ops}")
+        if max_delay_ms < 0:
+            raise ValueError(f"max_delay_ms must not be negative, got {max_delay_ms}")
+        self._store = store
+        self._max_ops = max_ops
+        self._max_delay = max_delay_ms / 1000
+        self._pending: List[Tuple[Callable[[], Any], Future, float, bool]] = []  # fn, future, time, retryable
+        self._flush_requested = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="objectbox-batcher", daemon=True)
+        self._thread.start()
+
+    def put(self, box: 'Box', obj) -> Future:
+        """ Puts the object; the future resolves to its ID. """
+        return self._submit(lambda: box.put(obj), True)
+
+    def remove(self, box: 'Box', id_or_object) -> Future:
+        """ Removes the object; the future resolves to True if it existed. """
+        return self._submit(lambda: box.remove(id_or_object), True)
+
+    def submit(self, fn: Callable[[], Any]) -> Future:
+        """ Runs fn, which may perform any writes (e.g. box.put(objects)), in a shared write transaction.
+        The future resolves to the value returned by fn.
+
+        If an operation of the shared transaction fails after fn ran, the transaction is discarded and the future fails
+        with that error, even if fn itself succeeded; fn is not re-executed and its effects outside the database are
+        not undone. Resubmit if appropriate. """
+        return self._submit(fn, False)
+
+    def _submit(self, fn: Callable[[], Any], retryable: bool) -> Future:
+        """ See submit(); retryable operations are re-executed individually if the shared transaction failed. """
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise Exception("Batcher is closed")
+            self._pending.append((fn, future, time.monotonic(), retryable))
+            if len(self._pending) == 1 or len(self._pending) >= self._max_ops:
+                self._condition.notify()
+        return future
+
+    def flush(self):
+        """ Commits the pending operations immediately and waits for them to complete.
+        Must not be called from an operation executed by the batcher, which would wait for itself. """
+        if self._thread is threading.current_thread():
+            raise Exception("Batcher.flush() can't be called from an operation executed by the batcher")
+        with self._condition:
+            futures = [future for _, future, _, _ in self._pending]
+            self._flush_requested = True
+            self._condition.notify()
+        wait(futures)
+
+    def close(self):
+        """ Commits the pending operations and stops the background thread; no more operations are accepted. """
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def __enter__(self) -> 'Batcher':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _next_batch(self) -> Optional[list]:
+        """ Waits until the next batch is due; returns None once closed and all operations were executed. """
+        with self._condition:
+            while True:
+                if self._pending:
+                    if self._closed or self._flush_requested or len(self._pending) >= self._max_ops:
+                        break
+                    remaining = self._pending[0][2] + self._max_delay - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                elif self._closed:
+                    return None
+                else:
+                    self._condition.wait()
+            batch = self._pending[:self._max_ops]
+            del self._pending[:self._max_ops]
+            if not self._pending:
+                self._flush_requested = False
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            batch = [operation for operation in batch if operation[1].set_running_or_notify_cancel()]
+            for (_, future, _, _), (result, error) in zip(batch, self._execute(batch)):
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+
+    def _execute(self, batch: list) -> List[Tuple[Any, Optional[BaseException]]]:
+        try:
+            results = []
+            with self._store.write_tx():
+                for fn, _, _, _ in batch:
+                    results.append((fn(), None))
+            return results
+        except BaseException as e:
+            error = e
+
+        # the transaction was aborted: run each operation in its own transaction to isolate failing ones, except for
+        # submitted functions that ran already (up to the failing one, if any)
+        executed = len(results) + 1
+        results = []
+        for i, (fn, _, _, retryable) in enumerate(batch):
+            if not retryable and i < executed:
+                results.append((None, error))
+                continue
+            try:
+                with self._store.write_tx():
+                    results.append((fn(), None))
+            except BaseException as e:
+                results.append((None, e))
+        return results
@@ -13,11 +13,47 @@
 # limitations under the License.
 
 
+from concurrent.futures import Future
+from contextlib import nullcontext
+
+import objectbox.transaction
+from objectbox.model.codegen import detach_lazy
 from objectbox.model.entity import _Entity
 from objectbox.store import Store
 from objectbox.query_builder import QueryBuilder
 from objectbox.condition import QueryCondition
+from objectbox.object_cache import ObjectCache, MISSING
+from objectbox.query import Query
+from objectbox.query_cache import QueryCache
 from objectbox.c import *
+from objectbox.model.columns import resolve_properties, bytes_array_to_buffer, decode_columns, encode_columns
+
+# the maximum number of IDs obx_box_ids_for_put() reserves at once
+_MAX_IDS_FOR_PUT = 10000
+
+_PADDING = bytes(8)
+
+
+class _Arena:
+    """ Objects marshalled into a single buffer to be passed to obx_box_put_many() (instead of allocating a bytes
+    object per object). """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.offsets: List[int] = []
+        self.sizes: List[int] = []
+        self.data_size = 0  # total size of the objects (excluding padding)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def marshal(self, marshal_into: Callable, *args) -> None:
+        """ Appends an object using a marshaller generated with into=True, e.g. _Entity._marshaller_into. """
+        self.offsets.append(len(self.buffer))
+        size = marshal_into(self.buffer, *args)
+        self.sizes.append(size)
+        self.data_size += size
+        self.buffer += _PADDING[:-len(self.buffer) % 8]  # keep each object 8-byte aligned like separate allocations
 
 
 class Box:
@@ -28,6 +64,9 @@ class Box:
         self._store = store 
         self._entity = entity
         self._c_box = obx_box(store._c_store, entity._id)
+        self._c_async = None  # the box's shared async queue handle (owned by the box); see _async()
+        self._query_cache = QueryCache(self)
+        self._cache: Optional[ObjectCache] = None  # see enable_cache()
 
     def is_empty(self) -> bool:
         is_empty = ctypes.c_bool()
@@ -39,9 +78,44 @@ class Box:
         obx_box_count(self._c_box, limit, ctypes.byref(count))
         return int(count.value)
 
-    def put(self, *objects):
-        """Puts an object (or a list of objects) and returns its ID (or nothing for a list objects)"""
+    def put(self, *objects, mode: PutMode = PutMode.PUT, chunk_size: Optional[int] = None,
+            max_bytes: Optional[int] = None, single_tx: bool = False,
+            progress: Optional[Callable[[int, int], Any]] = None):
+        """Puts an object (or a list of objects) and returns its ID (or nothing for a list objects)
+
+        :param mode:
+            PutMode.INSERT or PutMode.UPDATE only put objects that do not exist yet or that exist, respectively (by ID;
+            objects with ID 0 are new). Instead of the ID, whether the object was put (or, for a list, a NumPy bool
+            array with a flag per object) is returned then; see insert() and update().
+
+        If chunk_size or max_bytes is given, objects may also be any iterable (e.g. a generator), which is consumed in
+        chunks; thus, memory usage and transaction sizes are bounded regardless of the number of objects.
+        The number of objects put is returned then.
 
+        :param chunk_size:
+            The maximum number of objects per chunk.
+        :param max_bytes:
+            A chunk is put once the size of its (marshalled) objects reaches max_bytes.
+        :param single_tx:
+            If True, all chunks are put in a single transaction; otherwise, each chunk is committed in its own
+            transaction (and chunks committed before an error stay committed).
+        :param progress:
+            Called after each chunk with the total number of objects and bytes put so far. The chunk is committed
+            at that point unless single_tx is set (or a transaction is already active): then, progress is reported
+            before the commit, and nothing is stored if the transaction fails later on.
+        """
+
+        if mode != PutMode.PUT:
+            if mode not in (PutMode.INSERT, PutMode.UPDATE):
+                raise ValueError(f"Unsupported put mode: {mode}")
+            if chunk_size is not None or max_bytes is not None:
+                raise ValueError("Chunked puts only support PutMode.PUT")
+            if len(objects) == 1 and not isinstance(objects[0], list):
+                return bool(self._put_with_mode(objects, mode)[0])
+            return self._put_with_mode(objects[0] if len(objects) == 1 else objects, mode)
+        if chunk_size is not None or max_bytes is not None:
+            iterable = len(objects) == 1 and not isinstance(objects[0], self._entity._user_type)
+            return self._put_chunked(objects[0] if iterable else objects, chunk_size, max_bytes, single_tx, progress)
         if len(objects) != 1:
             self._put_many(objects)
         elif isinstance(objects[0], list):
@@ -49,6 +123,16 @@ class Box:
         else:
             return self._put_one(objects[0])
 
+    def insert(self, *objects):
+        """ Puts objects (one or a list) that do not exist yet, i.e. new ones (ID 0) or ones with an unused ID.
+        Returns whether the object was inserted; for a list, a NumPy bool array with a flag per object. """
+        return self.put(*objects, mode=PutMode.INSERT)
+
+    def update(self, *objects):
+        """ Puts objects (one or a list) that exist already; others, including new ones (ID 0), are skipped.
+        Returns whether the object was updated; for a list, a NumPy bool array with a flag per object. """
+        return self.put(*objects, mode=PutMode.UPDATE)
+
     def _put_one(self, obj) -> int:
         id = object_id = self._entity._get_object_id(obj)
 
@@ -57,6 +141,7 @@ class Box:
 
         data = self._entity._marshal(obj, id)
         obx_box_put(self._c_box, id, bytes(data), len(data))
+        self._store._objects_changed(self._entity._id, [id])
 
         if id != object_id:
             self._entity._set_object_id(obj, id)
@@ -65,51 +150,172 @@ class Box:
 
     def _put_many(self, objects) -> None:
         # retrieve IDs from the objects (to distinguish new objects and updates)
-        new = {}
-        ids = {}
-        for k in range(len(objects)):
-            id = self._entity._get_object_id(objects[k])
-            if not id:
-                new[k] = 0
-            ids[k] = id
-
-        # acquire IDs for the new objects and set them
-        if len(new) > 0:
-            c_next_id = obx_id()
-            obx_box_ids_for_put(self._c_box, len(new), ctypes.byref(c_next_id))
-            next_id = c_next_id.value
-            for k in new.keys():
-                ids[k] = next_id
-                next_id += 1
-
-        # allocate a C bytes array structure where we will push the object data
-        # OBX_bytes_array with .count = len(objects)
-        c_bytes_array_p = obx_bytes_array(len(objects))
+        get_id = self._entity._get_object_id
+        ids = np.fromiter((get_id(obj) for obj in objects), dtype=np.uint64, count=len(objects))
+        new = self._assign_new_ids(ids)
+        arena = _Arena()
+        marshal_into = self._entity._marshaller_into
+        for obj, id in zip(objects, ids.tolist()):
+            arena.marshal(marshal_into, obj, id)
+        self._put_arena(ids, arena)
 
-        try:
-            # we need to keep the data around until put_many is executed because obx_bytes_array_set doesn't do a copy
-            data = {}
-            for k in range(len(objects)):
-                data[k] = bytes(self._entity._marshal(objects[k], ids[k]))
-                key = ctypes.c_size_t(k)
+        # assign new IDs on the objects
+        for k, id in zip(new.tolist(), ids[new].tolist()):
+            self._entity._set_object_id(objects[k], id)
+
+    def _put_with_mode(self, objects, mode: PutMode) -> np.ndarray:
+        """ Puts the objects passing the mode's ID check; returns a flag per object telling whether it was put. """
+        get_id = self._entity._get_object_id
+        ids = np.fromiter((get_id(obj) for obj in objects), dtype=np.uint64, count=len(objects))
+        with self._store.write_tx():
+            # a failing ID check aborts the transaction (and put_many does not tell which object failed);
+            # thus, check the IDs upfront within the transaction, without reading the objects' data
+            exists = np.zeros(len(ids), dtype=np.bool_)
+            known = np.flatnonzero(ids)
+            if len(known) > 0:
+                exists[known] = self._contains_many(ids[known])
+            if mode == PutMode.INSERT:
+                accepted = ~exists
+                _, first = np.unique(ids, return_index=True)
+                duplicate = ids != 0
+                duplicate[first] = False  # an ID given multiple times is only inserted once
+                accepted &= ~duplicate
+            else:
+                accepted = exists
+
+            indices = np.flatnonzero(accepted)
+            put_ids = ids[indices]
+            new = self._assign_new_ids(put_ids)
+            arena = _Arena()
+            marshal_into = self._entity._marshaller_into
+            for k, id in zip(indices.tolist(), put_ids.tolist()):
+                arena.marshal(marshal_into, objects[k], id)
+            self._put_arena(put_ids, arena, mode)
 
-                # OBX_bytes_array.data[k] = data
-                obx_bytes_array_set(c_bytes_array_p, key,
-                                    data[k], len(data[k]))
+        # assign new IDs on the objects
+        for k, id in zip(indices[new].tolist(), put_ids[new].tolist()):
+            self._entity._set_object_id(objects[k], id)
+        return accepted
+
+    def _contains_many(self, ids: np.ndarray) -> np.ndarray:
+        """ Returns a flag per (non-zero) ID telling whether the object exists; its data is not copied. """
+        c_ids = c_id_array(ids)
+        # OBX_bytes_array*
+        c_bytes_array_p = obx_box_get_many(self._c_box, ctypes.byref(c_ids))
+        try:
+            # OBX_bytes_array
+            c_bytes_array = c_bytes_array_p.contents
+            count = c_bytes_array.count
+            # OBX_bytes is {void* data; size_t size}; data is NULL if the object does not exist
+            c_words = ctypes.cast(c_bytes_array.data, ctypes.POINTER(ctypes.c_size_t * (2 * count))).contents
+            return np.frombuffer(c_words, dtype=np.uintp).reshape(count, 2)[:, 0] != 0
+        finally:
+            obx_bytes_array_free(c_bytes_array_p)
 
-            c_ids = (obx_id * len(ids))(*ids.values())
-            obx_box_put_many(self._c_box, c_bytes_array_p,
-                             c_ids, OBXPutMode_PUT)
+    def _assign_new_ids(self, ids: np.ndarray) -> np.ndarray:
+        """ Acquires IDs for the new objects (ID 0) in bulk and sets them in ids; returns the indices of the new ones. """
+        new = np.flatnonzero(ids == 0)
+        for start in range(0, len(new), _MAX_IDS_FOR_PUT):
+            chunk = new[start:start + _MAX_IDS_FOR_PUT]
+            c_first_id = obx_id()
+            obx_box_ids_for_put(self._c_box, len(chunk), ctypes.byref(c_first_id))
+            ids[chunk] = np.arange(c_first_id.value, c_first_id.value + len(chunk), dtype=np.uint64)
+        return new
 
+    def _put_arena(self, ids: np.ndarray, arena: '_Arena', mode: int = OBXPutMode_PUT) -> None:
+        """ Puts the objects marshalled into the arena with the given IDs (uint64), in the same order. """
+        count = len(ids)
+        if count == 0:
+            return
+        # OBX_bytes_array with .count = len(objects)
+        c_bytes_array_p = obx_bytes_array(count)
+        try:
+            # the arena can't be resized while referenced by the ctypes array; released when put_many is done
+            c_arena = (ctypes.c_ubyte * len(arena.buffer)).from_buffer(arena.buffer)
+            # OBX_bytes is {void* data; size_t size}; set all at once instead of calling obx_bytes_array_set() for each
+            c_words = ctypes.cast(c_bytes_array_p.contents.data, ctypes.POINTER(ctypes.c_size_t * (2 * count))).contents
+            words = np.frombuffer(c_words, dtype=np.uintp).reshape(count, 2)
+            words[:, 0] = np.array(arena.offsets, dtype=np.uintp) + ctypes.addressof(c_arena)
+            words[:, 1] = arena.sizes
+            obx_box_put_many(self._c_box, c_bytes_array_p, ids.ctypes.data_as(ctypes.POINTER(obx_id)), mode)
+            self._store._objects_changed(self._entity._id, ids.tolist())
         finally:
             obx_bytes_array_free(c_bytes_array_p)
 
-        # assign new IDs on the object
-        for k in new.keys():
-            self._entity._set_object_id(objects[k], ids[k])
+    def _put_chunked(self, objects: Iterable, chunk_size: Optional[int], max_bytes: Optional[int], single_tx: bool,
+                     progress: Optional[Callable[[int, int], Any]]) -> int:
+        if chunk_size is not None and chunk_size <= 0:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}")
+        get_id = self._entity._get_object_id
+        marshal_into = self._entity._marshaller_into
+        objects = iter(objects)
+        written_objects = 0
+        written_bytes = 0
+        with self._store.write_tx() if single_tx else nullcontext():
+            more = True
+            while more:
+                more = False
+                arena = _Arena()
+                ids = []
+                new = []
+                with self._store.write_tx():
+                    for obj in objects:
+                        id = get_id(obj)
+                        if not id:
+                            # reserved one by one: the chunk's size is only known once its objects are marshalled
+                            id = obx_box_id_for_put(self._c_box, 0)
+                            new.append((obj, id))
+                        ids.append(id)
+                        arena.marshal(marshal_into, obj, id)
+                        if len(ids) == chunk_size or (max_bytes is not None and arena.data_size >= max_bytes):
+                            more = True
+                            break
+                    if not ids:
+                        break
+                    self._put_arena(np.array(ids, dtype=np.uint64), arena)
+                    for obj, id in new:
+                        self._entity._set_object_id(obj, id)
+                written_objects += len(ids)
+                written_bytes += arena.data_size
+                if progress is not None:
+                    progress(written_objects, written_bytes)
+        return written_objects
+
+    def put_columns(self, columns: Dict[str, Any]) -> np.ndarray:
+        """ Puts objects given as columns of property values, without creating objects.
+
+        :param columns:
+            Maps property names to NumPy arrays (or sequences) with one value per object; e.g. a 2-D array for a
+            vector property. Properties not given are left unset. Objects with an ID of 0 (or all objects, if there
+            is no ID column) are inserted as new objects.
+        :return:
+            The IDs of the objects (uint64).
+        """
+        ids, rows = encode_columns(self._entity, columns)
+        count = len(ids)
+        if count == 0:
+            return ids
+        with self._store.write_tx():
+            self._assign_new_ids(ids)
+            arena = _Arena()
+            marshal_into = self._entity._values_marshaller_into
+            for id, values in zip(ids.tolist(), rows):
+                arena.marshal(marshal_into, id, *values)
+            self._put_arena(ids, arena)
+        return ids
 
     def get(self, id: int):
-        with self._store.read_tx():
+        # the cache is only used outside of transactions, which may see another state of the object
+        cache = self._cache if self._store._active_tx.tx is None else None
+        if cache is not None:
+            obj = cache.get(id)
+            if obj is not MISSING:
+                return obj
+            generation = cache.generation
+
+        with self._store._read_tx_if_needed():
             c_data = ctypes.c_void_p()
             c_size = ctypes.c_size_t()
             code : obx_err = obx_box_get(self._c_box, id, ctypes.byref(
@@ -119,10 +325,136 @@ class Box:
             elif code != 0:
                 raise CoreException(code)
             data = c_voidp_as_bytes(c_data, c_size.value)
-            return self._entity._unmarshal(data)
+            obj = self._entity._unmarshal(data)
+
+        if cache is not None:
+            cache.add(id, obj, len(data), generation)
+        return obj
+
+    def enable_cache(self, max_entries: int = 1000, max_bytes: int = 0, observe: bool = False) -> ObjectCache:
+        """ Enables an LRU cache for the objects read by get() on this Box (outside of transactions); replaces a
+        previously enabled one. Returned objects are shared and must not be modified. See ObjectCache for details
+        and the parameters; its hits/misses attributes and stats() describe the cache's effectiveness. """
+        self.disable_cache()
+        self._cache = ObjectCache(self._store, self._entity, max_entries, max_bytes, observe)
+        self._store._object_caches.setdefault(self._entity._id, []).append(self._cache)
+        return self._cache
+
+    def disable_cache(self):
+        if self._cache is not None:
+            self._store._object_caches[self._entity._id].remove(self._cache)
+            self._cache.close()
+            self._cache = None
+
+    @property
+    def cache(self) -> Optional[ObjectCache]:
+        """ The cache enabled via enable_cache(), if any. """
+        return self._cache
+
+    def _async(self):
+        if self._c_async is None:
+            self._c_async = obx_async(self._c_box)
+        return self._c_async
+
+    def put_async(self, obj) -> 'Future[int]':
+        """ Puts the object asynchronously via the store's async queue (see the Store's async_* options).
+
+        The object's ID is assigned immediately (and set on the object); the data is written later in a transaction
+        shared with other async operations. Raises if the operation could not be enqueued (e.g. queue full).
+
+        Failures while processing the operation (e.g. a unique constraint violation) are not reported to the caller:
+        the native queue only logs them. Use put() (e.g. via a Batcher) if the outcome must be known.
+
+        :return:
+            A concurrent.futures.Future resolving to the object's ID once the operation was processed by the queue;
+            this does not mean it was committed successfully (it fails only if the queue was shut down).
+        """
+        id = object_id = self._entity._get_object_id(obj)
+        if not id:
+            id = obx_box_id_for_put(self._c_box, 0)
+
+        data = self._entity._marshal(obj, id)
+        obx_async_put(self._async(), id, bytes(data), len(data))
+
+        if id != object_id:
+            self._entity._set_object_id(obj, id)
+        return self._track_async_change(id, id)
+
+    def remove_async(self, id_or_object) -> 'Future[None]':
+        """ Removes the object asynchronously via the store's async queue; see put_async(), also regarding failures.
+
+        :return:
+            A concurrent.futures.Future resolving to None once the operation was processed by the queue, which does
+            not mean it was committed successfully.
+        """
+        if isinstance(id_or_object, self._entity._user_type):
+            id = self._entity._get_object_id(id_or_object)
+        else:
+            id = id_or_object
+        obx_async_remove(self._async(), id)
+        return self._track_async_change(id, None)
+
+    def _track_async_change(self, id: int, result: Any) -> 'Future':
+        """ Invalidates the cached object now and once the async operation was processed (as it may have been read
+        meanwhile); returns the future of the operation, see Store._track_async(). """
+        self._store._objects_changed(self._entity._id, [id])
+        future = Future()  # resolved after invalidating, so that callers won't see the outdated object afterwards
+
+        def processed(tracked: 'Future'):
+            self._store._objects_changed(self._entity._id, [id])
+            if tracked.exception() is not None:
+                future.set_exception(tracked.exception())
+            else:
+                future.set_result(tracked.result())
+
+        self._store._track_async(result).add_done_callback(processed)
+        return future
+
+    def get_many(self, ids: Union[List[int], np.ndarray]) -> list:
+        """ Gets the objects with the given IDs (e.g. a uint64 array as returned by find_ids_by_score_numpy())
+        within a single read transaction.
+
+        :return:
+            The objects in the order of the given IDs; None for IDs that do not exist.
+        """
+        if len(ids) == 0:
+            return []
+        with self._store._read_tx_if_needed():
+            return self._get_many_in_tx(ids, objectbox.transaction.unmarshaller(self._entity, False, False))
+
+    def _get_many_in_tx(self, ids: Union[List[int], np.ndarray], unmarshal: Callable[[int, int], Any]) -> list:
+        """ Like get_many(), but requires an active read transaction; see objectbox.transaction.unmarshaller(). """
+        c_ids = c_id_array(ids)
+        # OBX_bytes_array*
+        c_bytes_array_p = obx_box_get_many(self._c_box, ctypes.byref(c_ids))
+        try:
+            # OBX_bytes_array
+            c_bytes_array = c_bytes_array_p.contents
+
+            result = [None] * c_bytes_array.count
+            for i in range(c_bytes_array.count):
+                # OBX_bytes; data is NULL if the object does not exist
+                c_bytes = c_bytes_array.data[i]
+                if c_bytes.data:
+                    result[i] = unmarshal(c_bytes.data, c_bytes.size)
+            return result
+        finally:
+            obx_bytes_array_free(c_bytes_array_p)
+
+    def get_all(self, lazy: bool = False, zero_copy: bool = False) -> list:
+        """ Gets all objects of this box.
 
-    def get_all(self) -> list:
-        with self._store.read_tx():
+        :param lazy:
+            If True, returns lightweight objects that decode each property only on its first access.
+            Useful for large objects (e.g. vectors/bytes) of which only a few properties are read.
+        :param zero_copy:
+            If True, objects are decoded directly from the database memory instead of copying their data first.
+            Combined with lazy, this must be called within a transaction (see Store.read_tx()) and the objects are only
+            usable until it ends (accessing properties afterwards raises); call detach() on the ones to keep.
+        """
+        tx = self._store._active_tx.tx
+        with self._store._read_tx_if_needed():
+            unmarshal = objectbox.transaction.unmarshaller(self._entity, lazy, zero_copy, tx)
             # OBX_bytes_array*
             c_bytes_array_p = obx_box_get_all(self._c_box)
 
@@ -134,13 +466,31 @@ class Box:
                 for i in range(c_bytes_array.count):
                     # OBX_bytes
                     c_bytes = c_bytes_array.data[i]
-                    data = c_voidp_as_bytes(c_bytes.data, c_bytes.size)
-                    result.append(self._entity._unmarshal(data))
+                    result.append(unmarshal(c_bytes.data, c_bytes.size))
 
                 return result
             finally:
                 obx_bytes_array_free(c_bytes_array_p)
 
+    def detach(self, objects):
+        """ Decodes the remaining properties of lazy objects (a single one or a list), so that they stay usable after
+        the transaction they were read zero-copy in ended (see get_all()); other objects are left as they are.
+        Returns the given objects. """
+        for obj in (objects if isinstance(objects, list) else [objects]):
+            detach_lazy(obj)
+        return objects
+
+    def get_all_columns(self, props: Optional[List[Union[int, str, 'Property']]] = None) -> Dict[str, np.ndarray]:
+        """ Gets the property values of all objects as NumPy arrays (one per property); see Query.find_columns(). """
+        props = resolve_properties(self._entity, props)
+        with self._store._read_tx_if_needed():
+            c_bytes_array_p = obx_box_get_all(self._c_box)
+            try:
+                buffer, starts = bytes_array_to_buffer(c_bytes_array_p.contents)
+            finally:
+                obx_bytes_array_free(c_bytes_array_p)
+        return decode_columns(buffer, starts, props)
+
     def remove(self, id_or_object) -> bool:
         if isinstance(id_or_object, self._entity._user_type):
             id = self._entity._get_object_id(id_or_object)
@@ -151,11 +501,48 @@ class Box:
             return False
         elif code != 0:
             raise CoreException(code)
+        self._store._objects_changed(self._entity._id, [id])
         return True
 
+    def remove_many(self, ids: Union[List[int], np.ndarray], chunk_size: int = 0) -> int:
+        """ Removes the objects with the given IDs; IDs that do not exist are ignored.
+
+        :param chunk_size:
+            If positive, removes at most chunk_size objects per write transaction, which limits the size of each
+            transaction for huge removals. Otherwise, all objects are removed in a single write transaction.
+        :return:
+            The number of removed objects.
+        """
+        ids = np.ascontiguousarray(ids, dtype=np.uint64)
+        if chunk_size <= 0:
+            chunk_size = max(len(ids), 1)
+        removed = 0
+        for start in range(0, len(ids), chunk_size):
+            c_ids = c_id_array(ids[start:start + chunk_size])
+            count = ctypes.c_uint64()
+            with self._store.write_tx():
+                obx_box_remove_many(self._c_box, ctypes.byref(c_ids), ctypes.byref(count))
+                self._store._objects_changed(self._entity._id, ids[start:start + chunk_size].tolist())
+            removed += int(count.value)
+        return removed
+
+    def remove_range(self, first_id: int, last_id: int, chunk_size: int = 0) -> int:
+        """ Removes the objects with IDs from first_id to last_id (both inclusive).
+
+        :param chunk_size:
+            See remove_many(). Without it, the objects are removed by a query in a single write transaction.
+        :return:
+            The number of removed objects.
+        """
+        query = self.query(self._entity._id_property.between(first_id, last_id)).build()
+        if chunk_size <= 0:
+            return query.remove()
+        return self.remove_many(query.find_ids(), chunk_size)
+
     def remove_all(self) -> int:
         count = ctypes.c_uint64()
         obx_box_remove_all(self._c_box, ctypes.byref(count))
+        self._store._objects_changed(self._entity._id)
         return int(count.value)
 
     def query(self, condition: Optional[QueryCondition] = None) -> QueryBuilder:
@@ -170,3 +557,11 @@ class Box:
         if condition is not None:
             condition.apply(qb)
         return qb
+
+    def cached_query(self, condition: Optional[QueryCondition] = None) -> ContextManager[Query]:
+        """ Gets a query for the given condition, reusing a query built before for a condition of the same shape
+        (i.e. differing only in values, which are then set as query parameters). The query is for exclusive use
+        within the with block and must not be kept afterwards; e.g.:
+            ``with box.cached_query(Person.age.greater_than(age)) as query: persons = query.find()``
+        """
+        return self._query_cache.query(condition)
@@ -97,6 +97,12 @@ class DebugFlags(IntEnum):
     LOG_TREE = 128
 
 
+class PutMode(IntEnum):
+    PUT = 1  # insert or update
+    INSERT = 2  # only if no object with the ID exists yet
+    UPDATE = 3  # only if an object with the ID exists
+
+
 class OBX_model(ctypes.Structure):
     pass
 
@@ -189,6 +195,76 @@ class OBX_id_score_array(ctypes.Structure):
 OBX_id_score_array_p = ctypes.POINTER(OBX_id_score_array)
 
 
+class OBX_string_array(ctypes.Structure):
+    _fields_ = [
+        ('items', ctypes.POINTER(ctypes.c_char_p)),
+        ('count', ctypes.c_size_t),
+    ]
+
+
+OBX_string_array_p = ctypes.POINTER(OBX_string_array)
+
+
+class OBX_int64_array(ctypes.Structure):
+    _fields_ = [
+        ('items', ctypes.POINTER(ctypes.c_int64)),
+        ('count', ctypes.c_size_t),
+    ]
+
+
+OBX_int64_array_p = ctypes.POINTER(OBX_int64_array)
+
+
+class OBX_int32_array(ctypes.Structure):
+    _fields_ = [
+        ('items', ctypes.POINTER(ctypes.c_int32)),
+        ('count', ctypes.c_size_t),
+    ]
+
+
+OBX_int32_array_p = ctypes.POINTER(OBX_int32_array)
+
+
+class OBX_int16_array(ctypes.Structure):
+    _fields_ = [
+        ('items', ctypes.POINTER(ctypes.c_int16)),
+        ('count', ctypes.c_size_t),
+    ]
+
+
+OBX_int16_array_p = ctypes.POINTER(OBX_int16_array)
+
+
+class OBX_int8_array(ctypes.Structure):
+    _fields_ = [
+        ('items', ctypes.POINTER(ctypes.c_int8)),
+        ('count', ctypes.c_size_t),
+    ]
+
+
+OBX_int8_array_p = ctypes.POINTER(OBX_int8_array)
+
+
+class OBX_double_array(ctypes.Structure):
+    _fields_ = [
+        ('items', ctypes.POINTER(ctypes.c_double)),
+        ('count', ctypes.c_size_t),
+    ]
+
+
+OBX_double_array_p = ctypes.POINTER(OBX_double_array)
+
+
+class OBX_float_array(ctypes.Structure):
+    _fields_ = [
+        ('items', ctypes.POINTER(ctypes.c_float)),
+        ('count', ctypes.c_size_t),
+    ]
+
+
+OBX_float_array_p = ctypes.POINTER(OBX_float_array)
+
+
 class OBX_txn(ctypes.Structure):
     pass
 
@@ -203,6 +279,13 @@ class OBX_box(ctypes.Structure):
 OBX_box_p = ctypes.POINTER(OBX_box)
 
 
+class OBX_cursor(ctypes.Structure):
+    pass
+
+
+OBX_cursor_p = ctypes.POINTER(OBX_cursor)
+
+
 class OBX_async(ctypes.Structure):
     pass
 
@@ -210,6 +293,20 @@ class OBX_async(ctypes.Structure):
 OBX_async_p = ctypes.POINTER(OBX_async)
 
 
+class OBX_query_prop(ctypes.Structure):
+    pass
+
+
+OBX_query_prop_p = ctypes.POINTER(OBX_query_prop)
+
+
+class OBX_observer(ctypes.Structure):
+    pass
+
+
+OBX_observer_p = ctypes.POINTER(OBX_observer)
+
+
 class OBX_query_builder(ctypes.Structure):
     pass
 
@@ -245,6 +342,8 @@ class CoreException(Exception):
         10201: "UNIQUE_VIOLATED",
         10202: "NON_UNIQUE_RESULT",
         10203: "PROPERTY_TYPE_MISMATCH",
+        10210: "ID_ALREADY_EXISTS",
+        10211: "ID_NOT_FOUND",
         10299: "CONSTRAINT_VIOLATED",
         10301: "STD_ILLEGAL_ARGUMENT",
         10302: "STD_OUT_OF_RANGE",
@@ -345,6 +444,11 @@ def c_str(string: str) -> ctypes.c_char_p:
     return string.encode('utf-8')
 
 
+def c_voidp_as_memoryview(voidp, size) -> memoryview:
+    """ Returns a view of the native memory without copying it; it's only valid as long as the memory is. """
+    return memoryview((ctypes.c_ubyte * size).from_address(voidp)).cast('B')
+
+
 def c_voidp_as_bytes(voidp, size):
     # TODO verify which of the following two approaches is better. Performance-wise, it seems the same.
 
@@ -355,6 +459,14 @@ def c_voidp_as_bytes(voidp, size):
     return memoryview(ctypes.cast(voidp, ctypes.POINTER(ctypes.c_ubyte * size))[0]).tobytes()
 
 
+def c_id_array(ids: Union[List[int], np.ndarray]) -> OBX_id_array:
+    """ Creates an OBX_id_array of the given IDs; the IDs are copied only if they're not a (contiguous) uint64 array. """
+    ids = np.ascontiguousarray(ids, dtype=np.uint64)
+    c_ids = OBX_id_array(ids.ctypes.data_as(ctypes.POINTER(obx_id)), len(ids))
+    c_ids.ids_array = ids  # keep the memory alive as long as the struct
+    return c_ids
+
+
 def c_array(py_list: Union[List[Any], np.ndarray], c_type):
     """ Converts the given python list or ndarray into a C array of c_type. """
     if isinstance(py_list, np.ndarray):
@@ -579,6 +691,49 @@ obx_txn_abort = c_fn_rc('obx_txn_abort', [OBX_txn_p])
 # obx_err (OBX_txn* txn);
 obx_txn_success = c_fn_rc('obx_txn_success', [OBX_txn_p])
 
+# OBX_cursor* (OBX_txn* txn, obx_schema_id entity_id);
+obx_cursor = c_fn('obx_cursor', OBX_cursor_p, [OBX_txn_p, obx_schema_id])
+
+# obx_err (OBX_cursor* cursor);
+obx_cursor_close = c_fn_rc('obx_cursor_close', [OBX_cursor_p])
+
+# obx_id (OBX_cursor* cursor, obx_id id_or_zero);
+obx_cursor_id_for_put = c_fn('obx_cursor_id_for_put', obx_id, [OBX_cursor_p, obx_id])
+
+# obx_err (OBX_cursor* cursor, obx_id id, const void* data, size_t size);
+obx_cursor_put = c_fn_rc('obx_cursor_put', [OBX_cursor_p, obx_id, ctypes.c_void_p, ctypes.c_size_t])
+
+# obx_err (OBX_cursor* cursor, obx_id id, const void** data, size_t* size);
+obx_cursor_get = c_fn_nocheck('obx_cursor_get', obx_err, [
+    OBX_cursor_p, obx_id, ctypes.POINTER(ctypes.c_void_p), ctypes.POINTER(ctypes.c_size_t)])
+
+# obx_err (OBX_cursor* cursor, const void** data, size_t* size);
+obx_cursor_first = c_fn_nocheck('obx_cursor_first', obx_err, [
+    OBX_cursor_p, ctypes.POINTER(ctypes.c_void_p), ctypes.POINTER(ctypes.c_size_t)])
+
+# obx_err (OBX_cursor* cursor, const void** data, size_t* size);
+obx_cursor_next = c_fn_nocheck('obx_cursor_next', obx_err, [
+    OBX_cursor_p, ctypes.POINTER(ctypes.c_void_p), ctypes.POINTER(ctypes.c_size_t)])
+
+# obx_err (OBX_cursor* cursor, const void** data, size_t* size);
+obx_cursor_current = c_fn_nocheck('obx_cursor_current', obx_err, [
+    OBX_cursor_p, ctypes.POINTER(ctypes.c_void_p), ctypes.POINTER(ctypes.c_size_t)])
+
+# obx_err (OBX_cursor* cursor, obx_id id);
+obx_cursor_seek = c_fn_nocheck('obx_cursor_seek', obx_err, [OBX_cursor_p, obx_id])
+
+# OBX_bytes_array* (OBX_cursor* cursor);
+obx_cursor_get_all = c_fn('obx_cursor_get_all', OBX_bytes_array_p, [OBX_cursor_p])
+
+# obx_err (OBX_cursor* cursor, obx_id id);
+obx_cursor_remove = c_fn_nocheck('obx_cursor_remove', obx_err, [OBX_cursor_p, obx_id])
+
+# obx_err (OBX_cursor* cursor);
+obx_cursor_remove_all = c_fn_rc('obx_cursor_remove_all', [OBX_cursor_p])
+
+# obx_err (OBX_cursor* cursor, uint64_t* out_count);
+obx_cursor_count = c_fn_rc('obx_cursor_count', [OBX_cursor_p, ctypes.POINTER(ctypes.c_uint64)])
+
 # OBX_box* (OBX_store* store, obx_schema_id entity_id);
 obx_box = c_fn('obx_box', OBX_box_p, [OBX_store_p, obx_schema_id])
 
@@ -589,6 +744,9 @@ obx_box_get = c_fn_nocheck('obx_box_get', obx_err, [
 # OBX_bytes_array* (OBX_box* box);
 obx_box_get_all = c_fn('obx_box_get_all', OBX_bytes_array_p, [OBX_box_p])
 
+# OBX_bytes_array* (OBX_box* box, const OBX_id_array* ids);
+obx_box_get_many = c_fn('obx_box_get_many', OBX_bytes_array_p, [OBX_box_p, OBX_id_array_p])
+
 # obx_id (OBX_box* box, obx_id id_or_zero);
 obx_box_id_for_put = c_fn('obx_box_id_for_put', obx_id, [OBX_box_p, obx_id])
 
@@ -606,6 +764,10 @@ obx_box_put_many = c_fn_rc('obx_box_put_many', [
 # obx_err (OBX_box* box, obx_id id);
 obx_box_remove = c_fn_nocheck('obx_box_remove', obx_err, [OBX_box_p, obx_id])
 
+# obx_err (OBX_box* box, const OBX_id_array* ids, uint64_t* out_count);
+obx_box_remove_many = c_fn_rc('obx_box_remove_many', [
+    OBX_box_p, OBX_id_array_p, ctypes.POINTER(ctypes.c_uint64)])
+
 # obx_err (OBX_box* box, uint64_t* out_count);
 obx_box_remove_all = c_fn_rc('obx_box_remove_all', [
     OBX_box_p, ctypes.POINTER(ctypes.c_uint64)])
@@ -618,6 +780,46 @@ obx_box_is_empty = c_fn_rc('obx_box_is_empty', [
 obx_box_count = c_fn_rc('obx_box_count', [
     OBX_box_p, ctypes.c_uint64, ctypes.POINTER(ctypes.c_uint64)])
 
+# OBX_async* (OBX_box* box);
+obx_async = c_fn('obx_async', OBX_async_p, [OBX_box_p])
+
+# obx_err (OBX_async* async, obx_id id, const void* data, size_t size);
+obx_async_put = c_fn_rc('obx_async_put', [OBX_async_p, obx_id, ctypes.c_void_p, ctypes.c_size_t])
+
+# obx_err (OBX_async* async, obx_id id, const void* data, size_t size, OBXPutMode mode);
+obx_async_put5 = c_fn_rc('obx_async_put5', [OBX_async_p, obx_id, ctypes.c_void_p, ctypes.c_size_t, OBXPutMode])
+
+# obx_err (OBX_async* async, obx_id id, const void* data, size_t size);
+obx_async_insert = c_fn_rc('obx_async_insert', [OBX_async_p, obx_id, ctypes.c_void_p, ctypes.c_size_t])
+
+# obx_err (OBX_async* async, obx_id id, const void* data, size_t size);
+obx_async_update = c_fn_rc('obx_async_update', [OBX_async_p, obx_id, ctypes.c_void_p, ctypes.c_size_t])
+
+# obx_err (OBX_async* async, obx_id id);
+obx_async_remove = c_fn_rc('obx_async_remove', [OBX_async_p, obx_id])
+
+# bool (OBX_store* store);
+obx_store_await_async_completion = c_fn_nocheck('obx_store_await_async_completion', ctypes.c_bool, [OBX_store_p])
+
+# bool (OBX_store* store);
+obx_store_await_async_submitted = c_fn_nocheck('obx_store_await_async_submitted', ctypes.c_bool, [OBX_store_p])
+
+# typedef void obx_observer_single_type(void* user_data);
+obx_observer_single_type = ctypes.CFUNCTYPE(None, ctypes.c_void_p)
+
+# OBX_observer* (OBX_store* store, obx_schema_id type_id, obx_observer_single_type* callback, void* user_data);
+obx_observe_single_type = c_fn('obx_observe_single_type', OBX_observer_p, [
+    OBX_store_p, obx_schema_id, obx_observer_single_type, ctypes.c_void_p])
+
+# typedef void obx_observer(const obx_schema_id* type_ids, size_t type_ids_count, void* user_data);
+obx_observer = ctypes.CFUNCTYPE(None, ctypes.POINTER(obx_schema_id), ctypes.c_size_t, ctypes.c_void_p)
+
+# OBX_observer* (OBX_store* store, obx_observer* callback, void* user_data);
+obx_observe = c_fn('obx_observe', OBX_observer_p, [OBX_store_p, obx_observer, ctypes.c_void_p])
+
+# obx_err (OBX_observer* observer);
+obx_observer_close = c_fn_rc('obx_observer_close', [OBX_observer_p])
+
 # OBX_query_builder* obx_query_builder(OBX_store* store, obx_schema_id entity_id);
 obx_query_builder = c_fn('obx_query_builder', OBX_query_builder_p, [OBX_store_p, obx_schema_id])
 
@@ -830,6 +1032,33 @@ obx_query_param_alias_string = c_fn_rc('obx_query_param_alias_string', [OBX_quer
 # OBX_C_API obx_err obx_query_param_alias_int(OBX_query* query, const char* alias, int64_t value);
 obx_query_param_alias_int = c_fn_rc('obx_query_param_alias_int', [OBX_query_p, ctypes.c_char_p, ctypes.c_int64])
 
+# OBX_C_API obx_err obx_query_param_alias_double(OBX_query* query, const char* alias, double value);
+obx_query_param_alias_double = c_fn_rc('obx_query_param_alias_double', [OBX_query_p, ctypes.c_char_p, ctypes.c_double])
+
+# OBX_C_API obx_err obx_query_param_alias_2ints(OBX_query* query, const char* alias, int64_t value_a, int64_t value_b);
+obx_query_param_alias_2ints = c_fn_rc('obx_query_param_alias_2ints',
+                                      [OBX_query_p, ctypes.c_char_p, ctypes.c_int64, ctypes.c_int64])
+
+# OBX_C_API obx_err obx_query_param_alias_2doubles(OBX_query* query, const char* alias, double value_a, double value_b);
+obx_query_param_alias_2doubles = c_fn_rc('obx_query_param_alias_2doubles',
+                                         [OBX_query_p, ctypes.c_char_p, ctypes.c_double, ctypes.c_double])
+
+# OBX_C_API obx_err obx_query_param_alias_bytes(OBX_query* query, const char* alias, const void* value, size_t size);
+obx_query_param_alias_bytes = c_fn_rc('obx_query_param_alias_bytes',
+                                      [OBX_query_p, ctypes.c_char_p, ctypes.c_void_p, ctypes.c_size_t])
+
+# OBX_C_API obx_err obx_query_param_alias_int64s(OBX_query* query, const char* alias, const int64_t values[], size_t count);
+obx_query_param_alias_int64s = c_fn_rc('obx_query_param_alias_int64s',
+                                       [OBX_query_p, ctypes.c_char_p, ctypes.POINTER(ctypes.c_int64), ctypes.c_size_t])
+
+# OBX_C_API obx_err obx_query_param_alias_int32s(OBX_query* query, const char* alias, const int32_t values[], size_t count);
+obx_query_param_alias_int32s = c_fn_rc('obx_query_param_alias_int32s',
+                                       [OBX_query_p, ctypes.c_char_p, ctypes.POINTER(ctypes.c_int32), ctypes.c_size_t])
+
+# OBX_C_API obx_err obx_query_param_alias_strings(OBX_query* query, const char* alias, const char* const values[], size_t count);
+obx_query_param_alias_strings = c_fn_rc('obx_query_param_alias_strings',
+                                        [OBX_query_p, ctypes.c_char_p, ctypes.POINTER(ctypes.c_char_p), ctypes.c_size_t])
+
 # OBX_C_API obx_err obx_qb_order(OBX_query_builder* builder, obx_schema_id property_id, OBXOrderFlags flags);
 obx_qb_order = c_fn_rc('obx_qb_order', [OBX_query_builder_p, obx_schema_id, OBXOrderFlags])
 
@@ -870,10 +1099,11 @@ obx_query_find_unique = c_fn_rc('obx_query_find_unique',
 # OBX_C_API OBX_bytes_score_array* obx_query_find_with_scores(OBX_query* query);
 obx_query_find_with_scores = c_fn('obx_query_find_with_scores', OBX_bytes_score_array_p, [OBX_query_p])
 
-# typedef bool obx_data_visitor(void* user_data, const void* data, size_t size);
+# typedef bool obx_data_visitor(const void* data, size_t size, void* user_data);
+obx_data_visitor = ctypes.CFUNCTYPE(ctypes.c_bool, ctypes.c_void_p, ctypes.c_size_t, ctypes.c_void_p)
 
 # OBX_C_API obx_err obx_query_visit(OBX_query* query, obx_data_visitor* visitor, void* user_data);
-# obx_query_visit = fn('obx_query_visit', obx_err, [OBX_query_p, obx_data_visitor_p, ctypes.c_void_p])
+obx_query_visit = c_fn_rc('obx_query_visit', [OBX_query_p, obx_data_visitor, ctypes.c_void_p])
 
 # OBX_C_API OBX_id_array* obx_query_find_ids(OBX_query* query);
 obx_query_find_ids = c_fn('obx_query_find_ids', OBX_id_array_p, [OBX_query_p])
@@ -896,6 +1126,77 @@ obx_query_describe = c_fn('obx_query_describe', ctypes.c_char_p, [OBX_query_p])
 # OBX_C_API const char* obx_query_describe_params(OBX_query* query);
 obx_query_describe_params = c_fn('obx_query_describe_params', ctypes.c_char_p, [OBX_query_p])
 
+# OBX_C_API OBX_query_prop* obx_query_prop(OBX_query* query, obx_schema_id property_id);
+obx_query_prop = c_fn('obx_query_prop', OBX_query_prop_p, [OBX_query_p, obx_schema_id])
+
+# OBX_C_API obx_err obx_query_prop_close(OBX_query_prop* query);
+obx_query_prop_close = c_fn_rc('obx_query_prop_close', [OBX_query_prop_p])
+
+# OBX_C_API obx_err obx_query_prop_distinct(OBX_query_prop* query, bool distinct);
+obx_query_prop_distinct = c_fn_rc('obx_query_prop_distinct', [OBX_query_prop_p, ctypes.c_bool])
+
+# OBX_C_API obx_err obx_query_prop_distinct_case(OBX_query_prop* query, bool distinct, bool case_sensitive);
+obx_query_prop_distinct_case = c_fn_rc('obx_query_prop_distinct_case', [OBX_query_prop_p, ctypes.c_bool, ctypes.c_bool])
+
+# OBX_C_API obx_err obx_query_prop_count(OBX_query_prop* query, uint64_t* out_count);
+obx_query_prop_count = c_fn_rc('obx_query_prop_count', [OBX_query_prop_p, ctypes.POINTER(ctypes.c_uint64)])
+
+# OBX_C_API obx_err obx_query_prop_avg(OBX_query_prop* query, double* out_value, int64_t* out_count);
+obx_query_prop_avg = c_fn_rc('obx_query_prop_avg', [
+    OBX_query_prop_p, ctypes.POINTER(ctypes.c_double), ctypes.POINTER(ctypes.c_int64)])
+
+# OBX_C_API obx_err obx_query_prop_min(OBX_query_prop* query, double* out_value, int64_t* out_count);
+obx_query_prop_min = c_fn_rc('obx_query_prop_min', [
+    OBX_query_prop_p, ctypes.POINTER(ctypes.c_double), ctypes.POINTER(ctypes.c_int64)])
+
+# OBX_C_API obx_err obx_query_prop_min_int(OBX_query_prop* query, int64_t* out_value, int64_t* out_count);
+obx_query_prop_min_int = c_fn_rc('obx_query_prop_min_int', [
+    OBX_query_prop_p, ctypes.POINTER(ctypes.c_int64), ctypes.POINTER(ctypes.c_int64)])
+
+# OBX_C_API obx_err obx_query_prop_max(OBX_query_prop* query, double* out_value, int64_t* out_count);
+obx_query_prop_max = c_fn_rc('obx_query_prop_max', [
+    OBX_query_prop_p, ctypes.POINTER(ctypes.c_double), ctypes.POINTER(ctypes.c_int64)])
+
+# OBX_C_API obx_err obx_query_prop_max_int(OBX_query_prop* query, int64_t* out_value, int64_t* out_count);
+obx_query_prop_max_int = c_fn_rc('obx_query_prop_max_int', [
+    OBX_query_prop_p, ctypes.POINTER(ctypes.c_int64), ctypes.POINTER(ctypes.c_int64)])
+
+# OBX_C_API obx_err obx_query_prop_sum(OBX_query_prop* query, double* out_value, int64_t* out_count);
+obx_query_prop_sum = c_fn_rc('obx_query_prop_sum', [
+    OBX_query_prop_p, ctypes.POINTER(ctypes.c_double), ctypes.POINTER(ctypes.c_int64)])
+
+# OBX_C_API obx_err obx_query_prop_sum_int(OBX_query_prop* query, int64_t* out_value, int64_t* out_count);
+obx_query_prop_sum_int = c_fn_rc('obx_query_prop_sum_int', [
+    OBX_query_prop_p, ctypes.POINTER(ctypes.c_int64), ctypes.POINTER(ctypes.c_int64)])
+
+# OBX_C_API OBX_string_array* obx_query_prop_find_strings(OBX_query_prop* query, const char* value_if_null);
+obx_query_prop_find_strings = c_fn('obx_query_prop_find_strings', OBX_string_array_p, [
+    OBX_query_prop_p, ctypes.c_char_p])
+
+# OBX_C_API OBX_int64_array* obx_query_prop_find_int64s(OBX_query_prop* query, const int64_t* value_if_null);
+obx_query_prop_find_int64s = c_fn('obx_query_prop_find_int64s', OBX_int64_array_p, [
+    OBX_query_prop_p, ctypes.POINTER(ctypes.c_int64)])
+
+# OBX_C_API OBX_int32_array* obx_query_prop_find_int32s(OBX_query_prop* query, const int32_t* value_if_null);
+obx_query_prop_find_int32s = c_fn('obx_query_prop_find_int32s', OBX_int32_array_p, [
+    OBX_query_prop_p, ctypes.POINTER(ctypes.c_int32)])
+
+# OBX_C_API OBX_int16_array* obx_query_prop_find_int16s(OBX_query_prop* query, const int16_t* value_if_null);
+obx_query_prop_find_int16s = c_fn('obx_query_prop_find_int16s', OBX_int16_array_p, [
+    OBX_query_prop_p, ctypes.POINTER(ctypes.c_int16)])
+
+# OBX_C_API OBX_int8_array* obx_query_prop_find_int8s(OBX_query_prop* query, const int8_t* value_if_null);
+obx_query_prop_find_int8s = c_fn('obx_query_prop_find_int8s', OBX_int8_array_p, [
+    OBX_query_prop_p, ctypes.POINTER(ctypes.c_int8)])
+
+# OBX_C_API OBX_double_array* obx_query_prop_find_doubles(OBX_query_prop* query, const double* value_if_null);
+obx_query_prop_find_doubles = c_fn('obx_query_prop_find_doubles', OBX_double_array_p, [
+    OBX_query_prop_p, ctypes.POINTER(ctypes.c_double)])
+
+# OBX_C_API OBX_float_array* obx_query_prop_find_floats(OBX_query_prop* query, const float* value_if_null);
+obx_query_prop_find_floats = c_fn('obx_query_prop_find_floats', OBX_float_array_p, [
+    OBX_query_prop_p, ctypes.POINTER(ctypes.c_float)])
+
 # OBX_bytes_array* (size_t count);
 obx_bytes_array = c_fn('obx_bytes_array', OBX_bytes_array_p, [ctypes.c_size_t])
 
@@ -909,6 +1210,27 @@ obx_bytes_array_free = c_fn('obx_bytes_array_free', None, [OBX_bytes_array_p])
 # OBX_C_API void obx_id_array_free(OBX_id_array* array);
 obx_id_array_free = c_fn('obx_id_array_free', None, [OBX_id_array_p])
 
+# OBX_C_API void obx_string_array_free(OBX_string_array* array);
+obx_string_array_free = c_fn('obx_string_array_free', None, [OBX_string_array_p])
+
+# OBX_C_API void obx_int64_array_free(OBX_int64_array* array);
+obx_int64_array_free = c_fn('obx_int64_array_free', None, [OBX_int64_array_p])
+
+# OBX_C_API void obx_int32_array_free(OBX_int32_array* array);
+obx_int32_array_free = c_fn('obx_int32_array_free', None, [OBX_int32_array_p])
+
+# OBX_C_API void obx_int16_array_free(OBX_int16_array* array);
+obx_int16_array_free = c_fn('obx_int16_array_free', None, [OBX_int16_array_p])
+
+# OBX_C_API void obx_int8_array_free(OBX_int8_array* array);
+obx_int8_array_free = c_fn('obx_int8_array_free', None, [OBX_int8_array_p])
+
+# OBX_C_API void obx_double_array_free(OBX_double_array* array);
+obx_double_array_free = c_fn('obx_double_array_free', None, [OBX_double_array_p])
+
+# OBX_C_API void obx_float_array_free(OBX_float_array* array);
+obx_float_array_free = c_fn('obx_float_array_free', None, [OBX_float_array_p])
+
 # OBX_C_API void obx_bytes_score_array_free(OBX_bytes_score_array* array)
 obx_bytes_score_array_free = c_fn('obx_bytes_score_array_free', None, [OBX_bytes_score_array_p])
 
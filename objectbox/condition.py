@@ -6,6 +6,7 @@ import numpy as np
 
 if TYPE_CHECKING:
     from objectbox.c import obx_qb_cond
+    from objectbox.query import Query
     from objectbox.query_builder import QueryBuilder
 
 
@@ -26,6 +27,15 @@ class QueryCondition:
         """
         raise NotImplementedError
 
+    def _shape(self) -> Hashable:
+        """ Describes the structure of the condition (ops, properties and options) without the values that can be
+        replaced in a built query via parameters; conditions of the same shape can share a query (see QueryCache). """
+        raise NotImplementedError
+
+    def _leaves(self) -> Iterator[PropertyQueryCondition]:
+        """ Yields the property conditions in the order they are applied. """
+        raise NotImplementedError
+
 
 class LogicQueryConditionOp(Enum):
     AND = 1
@@ -49,6 +59,13 @@ class LogicQueryCondition(QueryCondition):
     def _apply_or(self, qb: QueryBuilder) -> obx_qb_cond:
         return qb.any(self._apply_conditions(qb))
 
+    def _shape(self) -> Hashable:
+        return self._op, self._cond1._shape(), self._cond2._shape()
+
+    def _leaves(self) -> Iterator[PropertyQueryCondition]:
+        yield from self._cond1._leaves()
+        yield from self._cond2._leaves()
+
     def apply(self, qb: QueryBuilder) -> obx_qb_cond:
         if self._op == LogicQueryConditionOp.AND:
             return self._apply_and(qb)
@@ -71,6 +88,32 @@ class PropertyQueryConditionOp(Enum):
     BETWEEN = 10
     NEAREST_NEIGHBOR = 11
     CONTAINS_KEY_VALUE = 12
+    IN = 13
+    NOT_IN = 14
+
+
+# args of the ops that can be set via query parameters (obx_query_param_alias_*)
+_PARAM_ARGS: Dict[PropertyQueryConditionOp, Tuple[str, ...]] = {
+    PropertyQueryConditionOp.EQ: ('value',),
+    PropertyQueryConditionOp.NOT_EQ: ('value',),
+    PropertyQueryConditionOp.CONTAINS: ('value',),
+    PropertyQueryConditionOp.STARTS_WITH: ('value',),
+    PropertyQueryConditionOp.ENDS_WITH: ('value',),
+    PropertyQueryConditionOp.GT: ('value',),
+    PropertyQueryConditionOp.GTE: ('value',),
+    PropertyQueryConditionOp.LT: ('value',),
+    PropertyQueryConditionOp.LTE: ('value',),
+    PropertyQueryConditionOp.BETWEEN: ('a', 'b'),
+    PropertyQueryConditionOp.NEAREST_NEIGHBOR: ('query_vector',),
+    PropertyQueryConditionOp.IN: ('values',),
+    PropertyQueryConditionOp.NOT_IN: ('values',),
+}
+
+
+def _hashable(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return tuple(value.tolist() if isinstance(value, np.ndarray) else value)
+    return value
 
 
 class PropertyQueryCondition(QueryCondition):
@@ -88,7 +131,9 @@ class PropertyQueryCondition(QueryCondition):
         PropertyQueryConditionOp.LTE: "_apply_lte",
         PropertyQueryConditionOp.BETWEEN: "_apply_between",
         PropertyQueryConditionOp.NEAREST_NEIGHBOR: "_apply_nearest_neighbor",
-        PropertyQueryConditionOp.CONTAINS_KEY_VALUE: "_contains_key_value"
+        PropertyQueryConditionOp.CONTAINS_KEY_VALUE: "_contains_key_value",
+        PropertyQueryConditionOp.IN: "_apply_in",
+        PropertyQueryConditionOp.NOT_IN: "_apply_not_in",
         # ... new property query conditions here ... :)
     }
 
@@ -244,8 +289,82 @@ class PropertyQueryCondition(QueryCondition):
         case_sensitive = self._args['case_sensitive']
         return qb.contains_key_value(self._property_id, key, value, case_sensitive)
 
+    def _apply_in(self, qb: QueryBuilder) -> obx_qb_cond:
+        values = self._args['values']
+        int_size = self._args.get('int_size')
+        if int_size is None:
+            return qb.in_strings(self._property_id, list(values), self._args['case_sensitive'])
+        elif int_size == 8:
+            return qb.in_int64s(self._property_id, values)
+        elif int_size == 4:
+            return qb.in_int32s(self._property_id, values)
+        else:  # no native set condition for smaller types
+            return qb.any([qb.equals_int(self._property_id, int(value)) for value in values])
+
+    def _apply_not_in(self, qb: QueryBuilder) -> obx_qb_cond:
+        values = self._args['values']
+        int_size = self._args['int_size']
+        if int_size == 8:
+            return qb.not_in_int64s(self._property_id, values)
+        elif int_size == 4:
+            return qb.not_in_int32s(self._property_id, values)
+        else:  # no native set condition for smaller types
+            return qb.all([qb.not_equals_int(self._property_id, int(value)) for value in values])
+
+    def _is_parameter(self) -> bool:
+        """ True if the values can be set via a query parameter. """
+        if self._op not in _PARAM_ARGS:
+            return False
+        if self._op in (PropertyQueryConditionOp.IN, PropertyQueryConditionOp.NOT_IN):
+            return self._args.get('int_size') in (None, 4, 8)  # smaller types are applied as any()/all()
+        return True
+
+    def _shape(self) -> Hashable:
+        param_args = _PARAM_ARGS[self._op] if self._is_parameter() else ()
+        args = tuple(sorted((name, type(value) if name in param_args else _hashable(value))
+                            for name, value in self._args.items()))
+        return self._property_id, self._op, self._alias, args
+
+    def _leaves(self) -> Iterator[PropertyQueryCondition]:
+        yield self
+
+    def _set_parameter(self, query: Query, alias: str):
+        """ Sets the values of this condition on a query built from a condition of the same shape. """
+        op = self._op
+        if op == PropertyQueryConditionOp.BETWEEN:
+            a, b = self._args['a'], self._args['b']
+            if isinstance(a, int) and isinstance(b, int):
+                query.set_parameter_alias_2ints(alias, a, b)
+            else:
+                query.set_parameter_alias_2doubles(alias, a, b)
+        elif op == PropertyQueryConditionOp.NEAREST_NEIGHBOR:
+            query.set_parameter_alias_vector_f32(alias, self._args['query_vector'])
+        elif op in (PropertyQueryConditionOp.IN, PropertyQueryConditionOp.NOT_IN):
+            int_size = self._args.get('int_size')
+            if int_size is None:
+                query.set_parameter_alias_strings(alias, list(self._args['values']))
+            elif int_size == 8:
+                query.set_parameter_alias_int64s(alias, self._args['values'])
+            else:
+                query.set_parameter_alias_int32s(alias, self._args['values'])
+        else:
+            value = self._args['value']
+            if isinstance(value, str):
+                query.set_parameter_alias_string(alias, value)
+            elif isinstance(value, int):
+                query.set_parameter_alias_int(alias, value)
+            elif isinstance(value, float):
+                query.set_parameter_alias_double(alias, value)
+            elif isinstance(value, bytes):
+                query.set_parameter_alias_bytes(alias, value)
+            else:
+                raise Exception(f"Unsupported parameter type for '{op.name}': {type(value)}")
+
     def apply(self, qb: QueryBuilder) -> obx_qb_cond:
         c_cond = self._op_func(qb)
-        if self._alias is not None:
-            qb.alias(self._alias)
+        alias = self._alias
+        if qb._param_aliases is not None:  # building a query for QueryCache
+            alias = next(qb._param_aliases)
+        if alias is not None:
+            qb.alias(alias)
         return c_cond
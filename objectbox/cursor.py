@@ -0,0 +1,211 @@
+# Copyright 2019-2024 ObjectBox Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import *
+
+from objectbox.c import *
+
+
+class Cursor:
+    """ Low-level access to the objects of one entity within a transaction, in the order of their IDs.
+    Obtain via Transaction.cursor(); the cursor is closed when the transaction ends (or by close()).
+
+    The cursor has a position, which is set by first(), next(), seek() and get(); current() gets the object at it.
+    The *_raw() variants return the FlatBuffers data of the object without decoding it (e.g. to copy it elsewhere).
+    """
+
+    def __init__(self, tx: 'Transaction', entity: '_Entity'):
+        self._tx = tx
+        self._entity = entity
+        self._c_cursor = obx_cursor(tx._c_txn, entity._id)
+        self._c_data = ctypes.c_void_p()
+        self._c_size = ctypes.c_size_t()
+        self._c_data_ref = ctypes.byref(self._c_data)
+        self._c_size_ref = ctypes.byref(self._c_size)
+
+    def _cursor(self):
+        if self._c_cursor is None:
+            raise Exception("Cursor is closed (or its transaction has ended)")
+        return self._c_cursor
+
+    def close(self):
+        if self._c_cursor is not None:
+            obx_cursor_close(self._c_cursor)
+            self._c_cursor = None
+
+    def __enter__(self) -> 'Cursor':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _read(self, fn, *args) -> Optional[bytes]:
+        """ Calls a cursor function reading an object; returns its data, or None if there's no (further) object. """
+        code: obx_err = fn(self._cursor(), *args, self._c_data_ref, self._c_size_ref)
+        if code == 404:
+            return None
+        elif code != 0:
+            raise CoreException(code)
+        return c_voidp_as_bytes(self._c_data, self._c_size.value)
+
+    def _read_object(self, fn, *args):
+        """ Like _read() but returns the object, decoded directly from the native memory (without copying it). """
+        code: obx_err = fn(self._cursor(), *args, self._c_data_ref, self._c_size_ref)
+        if code == 404:
+            return None
+        elif code != 0:
+            raise CoreException(code)
+        return self._entity._transient_unmarshaller(c_voidp_as_memoryview(self._c_data.value, self._c_size.value))
+
+    def get_raw(self, id: int) -> Optional[bytes]:
+        return self._read(obx_cursor_get, id)
+
+    def get(self, id: int):
+        """ Gets the object with the given ID (None if it does not exist) and moves the cursor to it. """
+        return self._read_object(obx_cursor_get, id)
+
+    def first_raw(self) -> Optional[bytes]:
+        return self._read(obx_cursor_first)
+
+    def first(self):
+        """ Moves the cursor to the object with the lowest ID and returns it (None if there are no objects). """
+        return self._read_object(obx_cursor_first)
+
+    def next_raw(self) -> Optional[bytes]:
+        return self._read(obx_cursor_next)
+
+    def next(self):
+        """ Moves the cursor to the next object and returns it (None if there are no further objects). """
+        return self._read_object(obx_cursor_next)
+
+    def current_raw(self) -> Optional[bytes]:
+        return self._read(obx_cursor_current)
+
+    def current(self):
+        """ Returns the object at the current position of the cursor (None if there's none). """
+        return self._read_object(obx_cursor_current)
+
+    def seek(self, id: int, lower_bound: bool = False) -> bool:
+        """ Moves the cursor to the object with the given ID; returns False if it does not exist.
+
+        :param lower_bound:
+            If True, moves the cursor to the first object with an ID greater than or equal to the given one instead
+            (e.g. if the object was removed); returns False if there is no such object.
+        """
+        code: obx_err = obx_cursor_seek(self._cursor(), id)
+        if code == 0:
+            return True
+        elif code != 404:
+            raise CoreException(code)
+        if not lower_bound:
+            return False
+        # a missed seek leaves the cursor at the next higher ID; step forward in case it is still before the ID
+        obj = self._read_object(obx_cursor_current)
+        if obj is not None and self._entity._get_object_id(obj) < id:
+            obj = self._read_object(obx_cursor_next)
+        return obj is not None
+
+    def iter(self, start_id: Optional[int] = None, raw: bool = False) -> Iterator:
+        """ Iterates forward over the objects, beginning at the first one or at the one with start_id.
+        Other calls moving this cursor while iterating also change the position of the iteration.
+
+        :param start_id:
+            The ID of the object to start with; if it does not exist, starts with the next higher ID.
+        :param raw:
+            If True, yields the FlatBuffers data of the objects instead of the objects.
+        """
+        read = self._read if raw else self._read_object
+        if start_id is None:
+            item = read(obx_cursor_first)
+        else:
+            item = read(obx_cursor_current) if self.seek(start_id, lower_bound=True) else None
+        while item is not None:
+            yield item
+            item = read(obx_cursor_next)
+
+    def __iter__(self) -> Iterator:
+        return self.iter()
+
+    def count(self) -> int:
+        count = ctypes.c_uint64()
+        obx_cursor_count(self._cursor(), ctypes.byref(count))
+        return int(count.value)
+
+    def put(self, obj) -> int:
+        """ Puts the object (requires a write transaction) and returns its ID, which is also set on the object. """
+        c_cursor = self._cursor()
+        id = object_id = self._entity._get_object_id(obj)
+        if not id:
+            id = obx_cursor_id_for_put(c_cursor, 0)
+
+        data = self._entity._marshal(obj, id)
+        obx_cursor_put(c_cursor, id, bytes(data), len(data))
+        self._tx._store._objects_changed(self._entity._id, [id])
+
+        if id != object_id:
+            self._entity._set_object_id(obj, id)
+        return id
+
+    def put_raw(self, id: int, data: bytes):
+        """ Puts FlatBuffers data as is (e.g. as read via get_raw()); the ID must match the one stored in the data. """
+        obx_cursor_put(self._cursor(), id, bytes(data), len(data))
+        self._tx._store._objects_changed(self._entity._id, [id])
+
+    def remove(self, id_or_object) -> bool:
+        if isinstance(id_or_object, self._entity._user_type):
+            id = self._entity._get_object_id(id_or_object)
+        else:
+            id = id_or_object
+        code: obx_err = obx_cursor_remove(self._cursor(), id)
+        if code == 404:
+            return False
+        elif code != 0:
+            raise CoreException(code)
+        self._tx._store._objects_changed(self._entity._id, [id])
+        return True
+
+    def remove_all(self) -> int:
+        count = self.count()
+        obx_cursor_remove_all(self._cursor())
+        self._tx._store._objects_changed(self._entity._id)
+        return count
+
+
+class TxBox(Cursor):
+    """ Box operations bound to a Transaction, using a cursor (i.e. without any transaction overhead).
+    Obtain via Transaction.box(); valid until the transaction ends. """
+
+    def get_all(self) -> list:
+        # OBX_bytes_array*
+        c_bytes_array_p = obx_cursor_get_all(self._cursor())
+        try:
+            # OBX_bytes_array
+            c_bytes_array = c_bytes_array_p.contents
+
+            unmarshal = self._entity._transient_unmarshaller
+            result = []
+            for i in range(c_bytes_array.count):
+                # OBX_bytes
+                c_bytes = c_bytes_array.data[i]
+                result.append(unmarshal(c_voidp_as_memoryview(c_bytes.data, c_bytes.size)))
+            return result
+        finally:
+            obx_bytes_array_free(c_bytes_array_p)
+
+    def put(self, *objects):
+        """ Puts an object (or a list of objects) and returns its ID (or nothing for a list objects). """
+        if len(objects) == 1 and not isinstance(objects[0], list):
+            return super().put(objects[0])
+        for obj in (objects[0] if len(objects) == 1 else objects):
+            super().put(obj)
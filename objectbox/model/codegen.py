@@ -0,0 +1,467 @@
+# Copyright 2019-2024 ObjectBox Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Generates specialized (de)serialization functions per entity once the model is synced (IDs assigned).
+# All the information that the generic code paths look up per object and per property (property order, FlatBuffers
+# slots, types and default values) is resolved at generation time and baked into straight-line Python code.
+
+import struct
+import flatbuffers
+import flatbuffers.flexbuffers
+import numpy as np
+from datetime import datetime, timezone
+from typing import *
+
+from objectbox.c import *
+from objectbox.utils import date_value_to_int
+
+# numpy element types used to encode vector properties (explicitly little endian, as FlatBuffers requires)
+_numpy_vector_dtypes = {
+    OBXPropertyType_BoolVector: np.dtype(np.bool_),
+    OBXPropertyType_ShortVector: np.dtype('<i2'),
+    OBXPropertyType_CharVector: np.dtype('<u2'),
+    OBXPropertyType_IntVector: np.dtype('<i4'),
+    OBXPropertyType_LongVector: np.dtype('<i8'),
+    OBXPropertyType_FloatVector: np.dtype('<f4'),
+    OBXPropertyType_DoubleVector: np.dtype('<f8'),
+}
+
+
+_ZEROS_SIZE = 4096  # appended by marshal_into() without allocating; larger objects allocate their zeros
+
+
+def _default_value(prop):
+    """ The value to marshal if the user object does not have the property set (i.e. it's still the class member). """
+    if prop._py_type == np.ndarray:
+        return np.array([])
+    elif prop._ob_type == OBXPropertyType_Date or prop._ob_type == OBXPropertyType_DateNano:
+        return 0.0  # For marshalling, prefer float over datetime
+    elif prop._ob_type == OBXPropertyType_Flex:
+        return None
+    else:
+        return prop._py_type()
+
+
+def _compile(source: str, name: str, namespace: Dict[str, Any]) -> Callable:
+    code = compile(source, f"<objectbox-codegen {name}>", "exec")
+    exec(code, namespace)
+    return namespace[name]
+
+
+def _align(lines: List[str], size: int, additional: str = ""):
+    """ Appends the source for flatbuffers.Builder.Prep(); `o` is the current offset from the end of the buffer.
+    Padding bytes are not written as the generated code always starts from a zero-initialized buffer. """
+    if size <= 1:
+        return
+    if additional:
+        lines.append(f"    o += -(o + {additional}) & {size - 1}")
+    else:
+        lines.append(f"    o += -o & {size - 1}")
+
+
+def generate_marshaller(entity, from_values: bool = False, into: bool = False) -> Callable:
+    """ Generates the function marshal(object, id) -> bytearray for the given (synced) entity.
+
+    Instead of going through flatbuffers.Builder, the generated code writes the FlatBuffers table directly into a
+    buffer, replicating the Builder's layout decisions (alignment, field order, vtable) which are known upfront.
+    Thus, it produces exactly the same bytes as _Entity._marshal_generic().
+
+    :param from_values:
+        If True, generates marshal_values(id, *values) -> bytearray instead, taking the property values (all
+        properties except the ID, in the entity's order) as arguments; None stands for an unset value.
+    :param into:
+        If True, the generated function takes a bytearray as first argument and appends the data to it instead of
+        returning a new buffer, e.g. marshal_into(buf, object, id) -> int; returns the size of the appended data.
+    """
+    u16 = flatbuffers.packer.voffset
+    u32 = flatbuffers.packer.uoffset
+    s32 = flatbuffers.packer.soffset
+    ns = {
+        "FlexBuilder": flatbuffers.flexbuffers.Builder,
+        "np": np,
+        "date_value_to_int": date_value_to_int,
+        "pack_u32": u32.pack_into,
+        "pack_s32": s32.pack_into,
+    }
+    offset_props = set(id(prop) for prop in entity._offset_properties)
+    if from_values:
+        name = "marshal_values_into" if into else "marshal_values"
+        params = [f"v{i}" for i, prop in enumerate(entity._properties) if prop != entity._id_property]
+        lines = [f"def {name}({'buf, ' if into else ''}id_, {', '.join(params)}):"]
+    else:
+        name = "marshal_into" if into else "marshal"
+        lines = [f"def {name}({'buf, ' if into else ''}obj, id_):"]
+    end = "end" if into else "size"  # the buffer position the data is written backwards from
+    static_size = 0  # upper bound of the buffer size, excluding variable-sized data
+    min_align = 4  # offsets (uint32) are always present; see Builder.minalign
+
+    def read_value(i, prop):
+        ns[f"p{i}"] = prop
+        ns[f"d{i}"] = _default_value(prop)
+        if not from_values:
+            lines.append(f"    v{i} = obj.{prop.name}")
+            lines.append(f"    if v{i} is p{i}:")
+            lines.append(f"        v{i} = d{i}")
+        elif ns[f"d{i}"] is not None:
+            lines.append(f"    if v{i} is None:")
+            lines.append(f"        v{i} = d{i}")
+
+    # 1) collect the variable-sized data (strings, vectors, flex) as bytes
+    var_sizes = []
+    for i, prop in enumerate(entity._properties):
+        if id(prop) not in offset_props:
+            continue
+        ob_type = prop._ob_type
+        read_value(i, prop)
+        if ob_type == OBXPropertyType_String:
+            lines.append(f"    x{i} = v{i}.encode('utf-8')")
+        elif ob_type == OBXPropertyType_ByteVector:
+            lines.append(f"    x{i} = v{i}")
+            lines.append(f"    if not isinstance(x{i}, (bytes, bytearray)):")
+            lines.append(f"        raise TypeError('non-byte vector passed to CreateByteVector')")
+        elif ob_type == OBXPropertyType_Flex:
+            fb = flatbuffers.flexbuffers.Builder()
+            fb.Add(None)
+            ns[f"n{i}"] = bytes(fb.Finish())  # None (unset) is common, encode it only once
+            lines.append(f"    if v{i} is None:")
+            lines.append(f"        x{i} = n{i}")
+            lines.append(f"    else:")
+            lines.append(f"        fb = FlexBuilder()")
+            lines.append(f"        fb.Add(v{i})")
+            lines.append(f"        x{i} = bytes(fb.Finish())")
+        elif ob_type in _numpy_vector_dtypes:
+            dtype = _numpy_vector_dtypes[ob_type]
+            min_align = max(min_align, dtype.alignment)
+            ns[f"t{i}"] = dtype
+            lines.append(f"    a{i} = np.array(v{i}, dtype=t{i})")
+            lines.append(f"    if a{i}.ndim > 1:")
+            lines.append(f"        raise TypeError('multidimensional-ndarray passed to CreateNumpyVector')")
+            lines.append(f"    x{i} = a{i}.tobytes()")
+        else:
+            assert False, "programming error - invalid type OB & FB type combination"
+        var_sizes.append(f"len(x{i})")
+        static_size += 16  # length prefix, zero terminator (strings) and padding
+
+    # 2) write the variable-sized data (vectors) in front of the table; each r<i> is the vector's offset
+    alloc_at = len(lines)
+    for i, prop in enumerate(entity._properties):
+        if id(prop) not in offset_props:
+            continue
+        ob_type = prop._ob_type
+        lines.append(f"    n = len(x{i})")
+        if ob_type == OBXPropertyType_String:
+            _align(lines, 4, "n + 1")
+            lines.append("    o += n + 1")  # includes the zero terminator
+        elif ob_type in _numpy_vector_dtypes:
+            dtype = _numpy_vector_dtypes[ob_type]
+            _align(lines, 4, "n")
+            if dtype.alignment > 4:
+                _align(lines, dtype.alignment, "n")
+            lines.append("    o += n")
+        else:
+            _align(lines, 4, "n")
+            lines.append("    o += n")
+        lines.append(f"    buf[{end} - o:{end} - o + n] = x{i}")
+        lines.append("    o += 4")
+        if ob_type in _numpy_vector_dtypes:
+            lines.append(f"    pack_u32(buf, {end} - o, a{i}.size)")
+        else:
+            lines.append(f"    pack_u32(buf, {end} - o, n)")
+        lines.append(f"    r{i} = o")
+
+    # 3) the table (object) fields; each s<i> is the field's offset, later referenced by the vtable
+    lines.append("    object_end = o")
+    slots = {}
+    for i, prop in enumerate(entity._properties):
+        slots[prop._fb_slot] = i
+        if id(prop) in offset_props:
+            static_size += 8
+            _align(lines, 4)
+            lines.append("    o += 4")
+            lines.append(f"    pack_u32(buf, {end} - o, o - r{i})")
+            lines.append(f"    s{i} = o")
+            continue
+
+        if prop == entity._id_property:
+            lines.append(f"    v{i} = id_")
+        else:
+            read_value(i, prop)
+            if prop._ob_type == OBXPropertyType_Date:
+                lines.append(f"    v{i} = date_value_to_int(v{i}, 1000)")  # convert to milliseconds
+            elif prop._ob_type == OBXPropertyType_DateNano:
+                lines.append(f"    v{i} = date_value_to_int(v{i}, 1000000000)")  # convert to nanoseconds
+
+        width = prop._fb_type.bytewidth
+        min_align = max(min_align, width)
+        static_size += 2 * width
+        ns[f"pack{i}"] = prop._fb_type.packer_type.pack_into
+        _align(lines, width)
+        lines.append(f"    o += {width}")
+        lines.append(f"    pack{i}(buf, {end} - o, v{i})")
+        lines.append(f"    s{i} = o")
+
+    # 4) the vtable (see Builder.WriteVtable()); it's preceded by the table's offset to it
+    num_slots = max(slots.keys()) + 1 if slots else 0  # trailing empty slots are trimmed
+    vtable_bytes = (num_slots + 2) * u16.size
+    static_size += 8 + vtable_bytes
+    ns["pack_vtable"] = struct.Struct(f"<{num_slots + 2}H").pack_into
+    _align(lines, 4)
+    lines.append("    o += 4")
+    lines.append("    object_offset = o")
+    lines.append(f"    o += {vtable_bytes}")
+    vtable_values = [str(vtable_bytes), "object_offset - object_end"]
+    for slot in range(num_slots):
+        vtable_values.append(f"object_offset - s{slots[slot]}" if slot in slots else "0")
+    lines.append(f"    pack_vtable(buf, {end} - o, {', '.join(vtable_values)})")
+    lines.append(f"    pack_s32(buf, {end} - object_offset, {vtable_bytes})")
+
+    # 5) finish: root offset pointing to the table (see Builder.Finish())
+    static_size += min_align + 8
+    _align(lines, min_align, "4")
+    lines.append("    o += 4")
+    lines.append(f"    pack_u32(buf, {end} - o, o - object_offset)")
+    if into:
+        lines.append("    del buf[base:end - o]")  # drop the unused part of the (upper bound) size in front of the data
+        lines.append("    return o")
+    else:
+        lines.append("    return buf[size - o:]")
+
+    # allocate the (zero-initialized) buffer in front of the writing code (step 2), now that the static size is known
+    alloc = [f"    size = {' + '.join([str(static_size)] + var_sizes)}"]
+    if into:
+        ns["zeros"] = memoryview(bytes(_ZEROS_SIZE))
+        alloc.append("    base = len(buf)")
+        alloc.append(f"    buf += zeros[:size] if size <= {_ZEROS_SIZE} else bytes(size)")
+        alloc.append("    end = base + size")
+    else:
+        alloc.append("    buf = bytearray(size)")
+    alloc.append("    o = 0")
+    lines[alloc_at:alloc_at] = alloc
+    return _compile("\n".join(lines) + "\n", name, ns)
+
+
+# FlatBuffers element types used to decode vector properties; as used by _Entity._unmarshal_generic()
+_vector_fb_types = {
+    OBXPropertyType_BoolVector: flatbuffers.number_types.BoolFlags,
+    OBXPropertyType_ShortVector: flatbuffers.number_types.Int16Flags,
+    OBXPropertyType_CharVector: flatbuffers.number_types.Int16Flags,
+    OBXPropertyType_IntVector: flatbuffers.number_types.Int32Flags,
+    OBXPropertyType_LongVector: flatbuffers.number_types.Int64Flags,
+    OBXPropertyType_FloatVector: flatbuffers.number_types.Float32Flags,
+    OBXPropertyType_DoubleVector: flatbuffers.number_types.Float64Flags,
+}
+
+
+def _decode_expressions(prop, i: int, ns: Dict[str, Any], transient: bool = False) -> Tuple[List[str], str]:
+    """ Returns the source lines to decode the property value present at position `p` (absolute position of the
+    field in `data`) into `v`, and the source expression of the value used if the field is absent.
+    If transient is True, `data` is a memoryview only valid during the call; thus values must not reference it. """
+    ob_type = prop._ob_type
+    py_type = prop._py_type
+    to_list = py_type == list
+    if ob_type == OBXPropertyType_String:
+        return ["p += unpack_u32(data, p)[0]",
+                "n = unpack_u32(data, p)[0]",
+                "v = str(data[p + 4:p + 4 + n], 'utf-8')"], "''"
+    elif ob_type == OBXPropertyType_ByteVector:
+        ns[f"t{i}"] = py_type
+        return ["p += unpack_u32(data, p)[0]",
+                "n = unpack_u32(data, p)[0]",
+                f"v = t{i}(data[p + 4:p + 4 + n])"], f"t{i}()"
+    elif ob_type == OBXPropertyType_Flex:
+        return ["p += unpack_u32(data, p)[0]",
+                "n = unpack_u32(data, p)[0]",
+                "v = flex_loads(bytes(data[p + 4:p + 4 + n]))" if transient else
+                "v = flex_loads(data[p + 4:p + 4 + n])"], "None"
+    elif ob_type in _vector_fb_types:
+        ns[f"t{i}"] = flatbuffers.number_types.to_numpy_type(_vector_fb_types[ob_type])
+        lines = ["p += unpack_u32(data, p)[0]",
+                 f"v = frombuffer(data, dtype=t{i}, count=unpack_u32(data, p)[0], offset=p + 4)"]
+        if to_list:
+            lines.append("v = v.tolist()")
+        elif transient:
+            lines.append("v = v.copy()")
+        return lines, "[]" if to_list else f"frombuffer(b'', dtype=t{i})"
+
+    # scalars
+    ns[f"unpack{i}"] = prop._fb_type.packer_type.unpack_from
+    lines = [f"v = unpack{i}(data, p)[0]"]
+    if ob_type == OBXPropertyType_Date or (ob_type == OBXPropertyType_DateNano and py_type == datetime):
+        divisor = "1000.0" if ob_type == OBXPropertyType_Date else "1000000000.0"
+        if py_type == datetime:
+            lines.append(f"v = datetime.fromtimestamp(v / {divisor}, tz=utc)")
+            return lines, "datetime.fromtimestamp(0, tz=utc)"
+        elif py_type == float:
+            lines.append(f"v = v / {divisor}")
+            return lines, "0.0"
+    if ob_type == OBXPropertyType_Date or ob_type == OBXPropertyType_DateNano:
+        return lines, "0"
+    return lines, repr(py_type())
+
+
+def _num_slots(entity) -> int:
+    return max([prop._fb_slot for prop in entity._properties], default=-1) + 1
+
+
+def _decode_namespace(num_slots: int) -> Dict[str, Any]:
+    return {
+        "struct": struct,
+        "unpack_u32": flatbuffers.packer.uoffset.unpack_from,
+        "unpack_s32": flatbuffers.packer.soffset.unpack_from,
+        "unpack_u16": flatbuffers.packer.voffset.unpack_from,
+        "unpack_vtable": struct.Struct(f"<{num_slots}H").unpack_from,
+        "frombuffer": np.frombuffer,
+        "flex_loads": flatbuffers.flexbuffers.Loads,
+        "datetime": datetime,
+        "utc": timezone.utc,
+    }
+
+
+def _read_vtable_lines(num_slots: int) -> List[str]:
+    """ Returns the source lines reading the root table position `pos` and its field offsets `f` (indexed by slot;
+    0 if the field is absent) from `data`. """
+    return [
+        "    pos = unpack_u32(data, 0)[0]",
+        "    vt = pos - unpack_s32(data, pos)[0]",
+        # the vtable starts with its size and the object size, followed by the field offsets (i.e. the slots)
+        "    vt_slots = (unpack_u16(data, vt)[0] - 4) >> 1",
+        f"    if vt_slots >= {num_slots}:",
+        "        f = unpack_vtable(data, vt + 4)",
+        "    else:",
+        f"        f = struct.unpack_from('<%dH' % vt_slots, data, vt + 4) + (0,) * ({num_slots} - vt_slots)",
+    ]
+
+
+def generate_unmarshaller(entity, transient: bool = False) -> Callable:
+    """ Generates the function unmarshal(data: bytes) -> object for the given (synced) entity.
+
+    Produces the same objects as _Entity._unmarshal_generic(). Fields absent in the data (e.g. properties added to the
+    entity after the object was written) are decoded as if they were zero or empty.
+
+    :param transient:
+        If True, the generated function takes a memoryview of data that is only valid during the call (e.g. native
+        memory passed to a visitor) instead of bytes; e.g. vectors are then copied instead of referencing the data.
+    """
+    num_slots = _num_slots(entity)
+    ns = _decode_namespace(num_slots)
+    ns["user_type"] = entity._user_type
+    lines = ["def unmarshal(data):"]
+    lines += _read_vtable_lines(num_slots)
+    lines.append("    obj = user_type()")
+    for i, prop in enumerate(entity._properties):
+        decode, default = _decode_expressions(prop, i, ns, transient)
+        lines.append(f"    o = f[{prop._fb_slot}]")
+        lines.append("    if o:")
+        lines.append("        p = pos + o")
+        lines += ["        " + line for line in decode]
+        lines.append(f"        obj.{prop.name} = v")
+        lines.append("    else:")
+        lines.append(f"        obj.{prop.name} = {default}")
+    lines.append("    return obj")
+
+    return _compile("\n".join(lines) + "\n", "unmarshal", ns)
+
+
+class _LazyProperty:
+    """ Non-data descriptor of a lazy proxy type: decodes the property value on first access and caches it in the
+    instance __dict__, which takes precedence over this descriptor for all subsequent accesses (and assignments). """
+    __slots__ = ("_prop", "_name", "_decode")
+
+    def __init__(self, prop, decode: Callable):
+        self._prop = prop
+        self._name = prop.name
+        self._decode = decode
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self._prop
+        data = instance._obx_data
+        try:
+            value = self._decode(data, instance._obx_pos, instance._obx_fields)
+        except ValueError:
+            if isinstance(data, memoryview) and _is_released(data):
+                raise Exception(f"Property \"{self._name}\" was accessed after the transaction the object was read in "
+                                f"had ended; call Box.detach() within the transaction to keep objects read zero-copy")
+            raise
+        instance.__dict__[self._name] = value
+        return value
+
+
+def _is_released(view: memoryview) -> bool:
+    try:
+        len(view)
+        return False
+    except ValueError:
+        return True
+
+
+def detach_lazy(obj) -> None:
+    """ Decodes all not yet decoded properties of a lazy object (no-op for others), which then no longer references
+    the data it was read from. """
+    lazy_type = type(obj)
+    if not hasattr(lazy_type, "_obx_data"):
+        return
+    for name, attribute in vars(lazy_type).items():
+        if isinstance(attribute, _LazyProperty):
+            getattr(obj, name)
+    obj._obx_data = None
+
+
+def generate_lazy_unmarshaller(entity, transient: bool = False) -> Callable:
+    """ Generates the function unmarshal_lazy(data: bytes) -> object for the given (synced) entity.
+
+    Instead of decoding all properties up-front, the returned object is an instance of a subclass of the user type,
+    which keeps a reference to `data` and decodes each property on its first access.
+    Property values are identical to the ones produced by generate_unmarshaller().
+
+    :param transient:
+        If True, `data` is a memoryview that is released once it becomes invalid (e.g. native memory of a transaction);
+        values are then decoded as by generate_unmarshaller(transient=True), i.e. never reference the data.
+    """
+    num_slots = _num_slots(entity)
+    user_type = entity._user_type
+    attributes = {"__slots__": ("_obx_data", "_obx_pos", "_obx_fields")}
+    for i, prop in enumerate(entity._properties):
+        ns = _decode_namespace(num_slots)
+        decode, default = _decode_expressions(prop, i, ns, transient)
+        lines = [f"def decode_{prop.name}(data, pos, f):",
+                 f"    o = f[{prop._fb_slot}]",
+                 "    if o:",
+                 "        p = pos + o"]
+        lines += ["        " + line for line in decode]
+        lines.append("        return v")
+        lines.append(f"    return {default}")
+        decode_fn = _compile("\n".join(lines) + "\n", f"decode_{prop.name}", ns)
+        attributes[prop.name] = _LazyProperty(prop, decode_fn)
+    lazy_type = type(user_type.__name__, (user_type,), attributes)
+    lazy_type.__qualname__ = user_type.__qualname__
+    lazy_type.__module__ = user_type.__module__
+
+    ns = _decode_namespace(num_slots)
+    ns["lazy_type"] = lazy_type
+    ns["new"] = object.__new__
+    lines = ["def unmarshal_lazy(data):"]
+    lines += _read_vtable_lines(num_slots)
+    if user_type.__init__ is object.__init__:
+        lines.append("    obj = new(lazy_type)")
+    else:
+        # run the user constructor like unmarshal() does, but don't let it shadow the lazy properties
+        lines.append("    obj = lazy_type()")
+        lines.append("    d = obj.__dict__")
+        lines += [f"    d.pop({prop.name!r}, None)" for prop in entity._properties]
+    lines += ["    obj._obx_data = data",
+              "    obj._obx_pos = pos",
+              "    obj._obx_fields = f",
+              "    return obj"]
+    return _compile("\n".join(lines) + "\n", "unmarshal_lazy", ns)
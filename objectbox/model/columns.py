@@ -0,0 +1,250 @@
+# Copyright 2019-2024 ObjectBox Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Columnar (NumPy) access to the FlatBuffers data of many objects at once.
+# For reading, all objects are copied into a single buffer; fields are then located and decoded using vectorized NumPy
+# operations, i.e. without creating a Python object per row (except for strings, bytes and flex values).
+# For writing, the rows of the columns are passed to the entity's generated marshal_values(); no objects are created.
+
+import itertools
+import flatbuffers
+import flatbuffers.flexbuffers
+import numpy as np
+from typing import *
+
+from objectbox.c import *
+from objectbox.model.properties import Property
+
+# numpy element types of vector properties; decoded like _Entity._unmarshal() does
+_vector_dtypes = {
+    OBXPropertyType_BoolVector: np.dtype(np.bool_),
+    OBXPropertyType_ByteVector: np.dtype(np.int8),  # unless py_type is bytes
+    OBXPropertyType_ShortVector: np.dtype('<i2'),
+    OBXPropertyType_CharVector: np.dtype('<i2'),
+    OBXPropertyType_IntVector: np.dtype('<i4'),
+    OBXPropertyType_LongVector: np.dtype('<i8'),
+    OBXPropertyType_FloatVector: np.dtype('<f4'),
+    OBXPropertyType_DoubleVector: np.dtype('<f8'),
+}
+
+_date_dtypes = {
+    OBXPropertyType_Date: np.dtype('datetime64[ms]'),
+    OBXPropertyType_DateNano: np.dtype('datetime64[ns]'),
+}
+
+
+def resolve_properties(entity, props: Optional[Iterable[Union[int, str, Property]]]) -> List[Property]:
+    """ Gets the entity's properties given by ID, name or Property; all properties if props is None. """
+    if props is None:
+        return list(entity._properties)
+    by_id = {prop.id: prop for prop in entity._properties}
+    result = []
+    for prop in props:
+        prop_id = entity._get_property_id(prop)
+        if prop_id not in by_id:
+            raise Exception(f"Property {prop_id} not found in Entity: \"{entity._name}\"")
+        result.append(by_id[prop_id])
+    return result
+
+
+def bytes_array_to_buffer(c_bytes_array: OBX_bytes_array) -> Tuple[np.ndarray, np.ndarray]:
+    """ Copies the data of all objects into a single buffer.
+
+    :return:
+        The buffer (uint8) and the start position of each object in it (int64).
+    """
+    count = c_bytes_array.count
+    if count == 0:
+        return np.empty(0, dtype=np.uint8), np.empty(0, dtype=np.int64)
+    # OBX_bytes is {void* data; size_t size}; read the whole array at once
+    c_words = ctypes.cast(c_bytes_array.data, ctypes.POINTER(ctypes.c_size_t * (2 * count))).contents
+    words = np.frombuffer(c_words, dtype=np.uintp).reshape(count, 2)
+    sizes = words[:, 1].astype(np.int64)
+    starts = np.zeros(count, dtype=np.int64)
+    np.cumsum(sizes[:-1], out=starts[1:])
+    buffer = np.empty(int(starts[-1] + sizes[-1]), dtype=np.uint8)
+    address = buffer.ctypes.data
+    # the objects are scattered in native memory: one memmove() per object (no per-byte work in Python)
+    for data, start, size in zip(words[:, 0].tolist(), starts.tolist(), sizes.tolist()):
+        ctypes.memmove(address + start, data, size)
+    return buffer, starts
+
+
+_GATHER_CHUNK_SIZE = 1 << 18  # maximum number of indices gathered at once by _decode_vectors()
+
+
+def _gather(buffer: np.ndarray, positions: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    """ Reads one (little endian) value of the given dtype at each of the given positions. """
+    dtype = np.dtype(dtype)
+    # positions are not necessarily aligned: gather byte by byte into the preallocated result
+    result = np.empty(len(positions), dtype=dtype)
+    result_bytes = result.view(np.uint8).reshape(len(positions), dtype.itemsize)
+    for k in range(dtype.itemsize):
+        result_bytes[:, k] = buffer[positions + k]
+    return result
+
+
+class _Tables:
+    """ Locates the fields of the root tables of many FlatBuffers stored in one buffer. """
+
+    def __init__(self, buffer: np.ndarray, starts: np.ndarray):
+        self.buffer = buffer
+        self.count = len(starts)
+        self.pos = starts + _gather(buffer, starts, '<u4')
+        self.vtable = self.pos - _gather(buffer, self.pos, '<i4')
+        self.vtable_size = _gather(buffer, self.vtable, '<u2')
+
+    def field_positions(self, slot: int) -> Tuple[np.ndarray, np.ndarray]:
+        """ Returns the absolute positions of the field in the given slot and a mask of the tables having it. """
+        v_offset = 4 + 2 * slot
+        offsets = np.zeros(self.count, dtype=np.int64)
+        in_vtable = self.vtable_size > v_offset
+        offsets[in_vtable] = _gather(self.buffer, self.vtable[in_vtable] + v_offset, '<u2')
+        return self.pos + offsets, offsets != 0
+
+    def vectors(self, slot: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """ Returns the positions of the first elements and the lengths of the vectors (or strings) in the given slot
+        (length 0 if absent), and a mask of the tables having it. """
+        positions, present = self.field_positions(slot)
+        starts = np.zeros(self.count, dtype=np.int64)
+        lengths = np.zeros(self.count, dtype=np.int64)
+        refs = positions[present]
+        refs += _gather(self.buffer, refs, '<u4')
+        starts[present] = refs + 4
+        lengths[present] = _gather(self.buffer, refs, '<u4')
+        return starts, lengths, present
+
+
+def _decode_scalars(tables: _Tables, prop: Property) -> np.ndarray:
+    positions, present = tables.field_positions(prop._fb_slot)
+    dtype = flatbuffers.number_types.to_numpy_type(prop._fb_type)
+    column = np.zeros(tables.count, dtype=dtype)
+    column[present] = _gather(tables.buffer, positions[present], dtype)
+    if prop._ob_type in _date_dtypes:
+        column = column.view(_date_dtypes[prop._ob_type])
+    return column
+
+
+def _decode_vectors(tables: _Tables, prop: Property, dtype: np.dtype) -> np.ndarray:
+    """ Decodes a vector property into a 2-D array if all vectors have the same length; otherwise into an object array
+    holding a 1-D array per object (absent vectors are empty). """
+    starts, lengths, _ = tables.vectors(prop._fb_slot)
+    buffer = tables.buffer
+    if tables.count > 0 and (lengths == lengths[0]).all():
+        dim = int(lengths[0])
+        column = np.empty((tables.count, dim), dtype=dtype)
+        if dim == 0:
+            return column
+        if (starts % dtype.itemsize == 0).all():
+            # all vectors are aligned in the buffer: gather whole elements instead of bytes
+            source = buffer[:len(buffer) - len(buffer) % dtype.itemsize].view(dtype)
+            starts = starts // dtype.itemsize
+            target = column
+        else:
+            source = buffer
+            target = column.view(np.uint8).reshape(tables.count, dim * dtype.itemsize)
+        size = target.shape[1]
+        # gather chunks of rows at once, bounding the size of the (rows x size) index array
+        rows = max(1, _GATHER_CHUNK_SIZE // size)
+        offsets = np.arange(size)
+        for first in range(0, tables.count, rows):
+            target[first:first + rows] = source[starts[first:first + rows, None] + offsets]
+        return column
+    column = np.empty(tables.count, dtype=object)
+    for i, (start, length) in enumerate(zip(starts.tolist(), lengths.tolist())):
+        column[i] = np.frombuffer(buffer, dtype=dtype, count=length, offset=start)
+    return column
+
+
+def _decode_objects(tables: _Tables, prop: Property) -> np.ndarray:
+    """ Decodes strings, bytes and flex values into an object array. """
+    starts, lengths, present = tables.vectors(prop._fb_slot)
+    ob_type = prop._ob_type
+    if ob_type == OBXPropertyType_String:
+        decode, default = lambda b: str(b, 'utf-8'), ''
+    elif ob_type == OBXPropertyType_ByteVector:
+        decode, default = bytes, b''
+    else:
+        decode, default = lambda b: flatbuffers.flexbuffers.Loads(bytes(b)), None
+    column = np.full(tables.count, default, dtype=object)
+    data = tables.buffer.data
+    for i in np.flatnonzero(present).tolist():
+        start = int(starts[i])
+        column[i] = decode(data[start:start + int(lengths[i])])
+    return column
+
+
+def decode_columns(buffer: np.ndarray, starts: np.ndarray, props: List[Property]) -> Dict[str, np.ndarray]:
+    """ Decodes the given properties of the objects stored in `buffer` at `starts` (see bytes_array_to_buffer()).
+
+    :return:
+        A dict mapping property names to NumPy arrays of one value per object.
+    """
+    tables = _Tables(buffer, starts)
+    result = {}
+    for prop in props:
+        ob_type = prop._ob_type
+        if ob_type in _vector_dtypes and not (ob_type == OBXPropertyType_ByteVector and prop._py_type == bytes):
+            result[prop.name] = _decode_vectors(tables, prop, _vector_dtypes[ob_type])
+        elif ob_type in (OBXPropertyType_String, OBXPropertyType_ByteVector, OBXPropertyType_Flex):
+            result[prop.name] = _decode_objects(tables, prop)
+        else:
+            result[prop.name] = _decode_scalars(tables, prop)
+    return result
+
+
+def _column_values(prop: Property, column, count: int) -> Iterable:
+    """ Converts the column into a sequence of Python values as expected by the generated marshal_values(). """
+    if isinstance(column, np.ndarray):
+        if len(column) != count:
+            raise ValueError(f"Column \"{prop.name}\" has {len(column)} values, expected {count}")
+        if prop._ob_type in _date_dtypes and np.issubdtype(column.dtype, np.datetime64):
+            column = column.astype(_date_dtypes[prop._ob_type]).view(np.int64)  # ints are taken as ms/ns
+        if column.ndim > 1 or column.dtype == object:
+            return list(column)  # rows of a 2-D array (e.g. vectors) or the objects as they are
+        return column.tolist()
+    column = list(column)
+    if len(column) != count:
+        raise ValueError(f"Column \"{prop.name}\" has {len(column)} values, expected {count}")
+    return column
+
+
+def encode_columns(entity, columns: Dict[str, Any]) -> Tuple[np.ndarray, Iterable[tuple]]:
+    """ Prepares the given columns (property name to NumPy array or sequence) to be marshalled.
+
+    :return:
+        The IDs (uint64; taken from the ID column if given, otherwise 0 for new objects) and an iterable of the value
+        tuples to pass to the entity's marshal_values() for each object.
+    """
+    for name in columns.keys():
+        entity._get_property(name)  # raises for unknown properties
+    if len(columns) == 0:
+        raise ValueError("No columns given")
+    count = len(next(iter(columns.values())))
+
+    id_name = entity._id_property.name
+    if id_name in columns:
+        ids = np.array(_column_values(entity._id_property, columns[id_name], count), dtype=np.uint64)
+    else:
+        ids = np.zeros(count, dtype=np.uint64)
+
+    values = []
+    for prop in entity._properties:
+        if prop == entity._id_property:
+            continue
+        if prop.name in columns:
+            values.append(_column_values(prop, columns[prop.name], count))
+        else:
+            values.append(itertools.repeat(None, count))  # unset
+    return ids, zip(*values) if values else itertools.repeat((), count)
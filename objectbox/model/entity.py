@@ -22,6 +22,7 @@ from objectbox.c import *
 from objectbox.model.iduid import IdUid
 from objectbox.model.properties import Property
 from objectbox.utils import date_value_to_int
+from objectbox.model.codegen import generate_marshaller, generate_unmarshaller, generate_lazy_unmarshaller
 import threading
 
 
@@ -38,6 +39,13 @@ class _Entity(object):
         self._id_property = None
         self._fill_properties()
         self._tl = threading.local()
+        self._marshaller = None  # generated on sync, see _on_sync()
+        self._marshaller_into = None  # generated on sync, see _on_sync()
+        self._values_marshaller_into = None  # generated on sync, see _on_sync()
+        self._unmarshaller = None  # generated on sync, see _on_sync()
+        self._transient_unmarshaller = None  # generated on sync, see _on_sync()
+        self._lazy_unmarshaller = None  # generated on sync, see _on_sync()
+        self._transient_lazy_unmarshaller = None  # generated on sync, see _on_sync()
 
     @property
     def _id(self) -> int:
@@ -55,6 +63,13 @@ class _Entity(object):
         assert self._iduid.is_assigned()
         for prop in self._properties:
             prop.on_sync()
+        self._marshaller = generate_marshaller(self)
+        self._marshaller_into = generate_marshaller(self, into=True)
+        self._values_marshaller_into = generate_marshaller(self, from_values=True, into=True)
+        self._unmarshaller = generate_unmarshaller(self)
+        self._transient_unmarshaller = generate_unmarshaller(self, transient=True)
+        self._lazy_unmarshaller = generate_lazy_unmarshaller(self)
+        self._transient_lazy_unmarshaller = generate_lazy_unmarshaller(self, transient=True)
 
     def __call__(self, **properties):
         """ The constructor of the user Entity class. """
@@ -151,6 +166,10 @@ class _Entity(object):
         setattr(obj, self._id_property.name, id_)
 
     def _marshal(self, object, id: int) -> bytearray:
+        return self._marshaller(object, id)
+
+    def _marshal_generic(self, object, id: int) -> bytearray:
+        """ Reference implementation of _marshal() that does not rely on generated code. """
         if not hasattr(self._tl, "builder"):
             self._tl.builder = flatbuffers.Builder(256)
         builder = self._tl.builder
@@ -212,6 +231,10 @@ class _Entity(object):
         return builder.Output()
 
     def _unmarshal(self, data: bytes):
+        return self._unmarshaller(data)
+
+    def _unmarshal_generic(self, data: bytes):
+        """ Reference implementation of _unmarshal() that does not rely on generated code. """
         pos = flatbuffers.encode.Get(flatbuffers.packer.uoffset, data, 0)
         table = flatbuffers.Table(data, pos)
 
@@ -287,6 +287,18 @@ class _IntProperty(_NumericProperty):
         args = {'value': value}
         return PropertyQueryCondition(self.id, PropertyQueryConditionOp.NOT_EQ, args)
 
+    def is_in(self, values) -> PropertyQueryCondition:
+        """ Matches if the value is one of the given values (a list or NumPy array, passed to the core as a whole). """
+        self._assert_ids_assigned()
+        args = {'values': values, 'int_size': self._fb_type.bytewidth}
+        return PropertyQueryCondition(self.id, PropertyQueryConditionOp.IN, args)
+
+    def not_in(self, values) -> PropertyQueryCondition:
+        """ Matches if the value is none of the given values (a list or NumPy array). """
+        self._assert_ids_assigned()
+        args = {'values': values, 'int_size': self._fb_type.bytewidth}
+        return PropertyQueryCondition(self.id, PropertyQueryConditionOp.NOT_IN, args)
+
 
 # ID property (primary key)
 class Id(_IntProperty):
@@ -322,6 +334,12 @@ class String(Property):
         self._assert_ids_assigned()
         args = {'value': value, 'case_sensitive': case_sensitive}
         return PropertyQueryCondition(self.id, PropertyQueryConditionOp.NOT_EQ, args)
+
+    def is_in(self, values: Iterable[str], case_sensitive: bool = True) -> PropertyQueryCondition:
+        """ Matches if the value is one of the given strings. """
+        self._assert_ids_assigned()
+        args = {'values': values, 'case_sensitive': case_sensitive}
+        return PropertyQueryCondition(self.id, PropertyQueryConditionOp.IN, args)
     
     def contains(self, value: str, case_sensitive: bool = True) -> PropertyQueryCondition:
         self._assert_ids_assigned()
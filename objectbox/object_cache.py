@@ -0,0 +1,127 @@
+# Copyright 2019-2024 ObjectBox Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from collections import OrderedDict
+from typing import *
+
+from objectbox.c import *
+
+# returned by ObjectCache.get() for IDs not in the cache
+MISSING = object()
+
+
+class ObjectCache:
+    """ LRU cache of the objects read by Box.get(), bounded by the number of objects and/or the size of their data.
+    Enable via Box.enable_cache().
+
+    Objects are removed once put or removed through any Box (or Query/Cursor, or the async queue) of the same store;
+    if observe is set, the cache is also cleared after any commit changing the entity type.
+    Cached objects are shared between all callers of get() and must thus not be modified.
+    """
+
+    def __init__(self, store: 'Store', entity: '_Entity', max_entries: int = 1000, max_bytes: int = 0,
+                 observe: bool = False):
+        """
+        :param max_entries:
+            The maximum number of cached objects; 0 for no limit (requires max_bytes).
+        :param max_bytes:
+            The maximum total size of the cached objects' data; 0 for no limit.
+        :param observe:
+            Clear the whole cache after each commit changing objects of the entity type, including the ones already
+            invalidated by ID. Only needed for writers this store does not know about, e.g. other processes using the
+            same database or native code; for entity types written often, it lowers the hit rate considerably.
+        """
+        if max_entries <= 0 and max_bytes <= 0:
+            raise ValueError("The cache must be bounded by max_entries and/or max_bytes")
+        self._store = store
+        self._entity = entity
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[int, Tuple[Any, int]] = OrderedDict()  # ID -> (object, size); LRU first
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # incremented by each invalidation; objects read before an invalidation may be outdated and are not cached
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        self._c_observer = None
+        if observe:
+            self._c_callback = obx_observer_single_type(lambda _: self.invalidate())  # keep a reference
+            self._c_observer = obx_observe_single_type(store._c_store, entity._id, self._c_callback, None)
+
+    def get(self, id: int) -> Any:
+        """ Returns the cached object or MISSING. """
+        with self._lock:
+            entry = self._entries.get(id)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(id)
+            self.hits += 1
+            return entry[0]
+
+    def add(self, id: int, obj: Any, size: int, generation: int):
+        """ Caches the object unless an invalidation happened since the given generation (i.e. since it was read). """
+        with self._lock:
+            if generation != self.generation:
+                return
+            previous = self._entries.pop(id, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[id] = (obj, size)
+            self._bytes += size
+            while self._entries and ((self._max_entries and len(self._entries) > self._max_entries) or
+                                     (self._max_bytes and self._bytes > self._max_bytes)):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def invalidate(self, ids: Optional[Iterable[int]] = None):
+        """ Removes the objects with the given IDs (all objects if None). """
+        with self._lock:
+            self.generation += 1
+            self.invalidations += 1
+            if ids is None:
+                self._entries.clear()
+                self._bytes = 0
+                return
+            for id in ids:
+                entry = self._entries.pop(id, None)
+                if entry is not None:
+                    self._bytes -= entry[1]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def close(self):
+        """ Stops observing the store; must be called before the store is closed (Store.close() does so). """
+        c_observer, self._c_observer = self._c_observer, None
+        if c_observer:
+            obx_observer_close(c_observer)
+        self.invalidate()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,161 @@
+# Copyright 2019-2024 ObjectBox Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from typing import *
+
+from objectbox.c import *
+from objectbox.logger import logger
+
+
+class Subscription:
+    """ Subscription to changes of entity types; see Store.subscribe(). Call close() (or use it as a context manager)
+    to stop receiving notifications. """
+
+    def __init__(self, dispatcher: 'ChangeDispatcher', entities: List['_Entity'],
+                 callback: Callable[[List['_Entity']], Any]):
+        self._dispatcher = dispatcher
+        self._entities = {entity._id: entity for entity in entities}
+        self._callback = callback
+        self._on_close: Optional[Callable[[], Any]] = None  # called once the store stops observing
+
+    def close(self):
+        self._dispatcher._unsubscribe(self)
+
+    def __enter__(self) -> 'Subscription':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class ChangeDispatcher:
+    """ Observes all commits of a store (obx_observe) and notifies subscriptions from a dedicated thread.
+
+    The native callback only records the changed entity types; commits happening until the thread gets to them (e.g.
+    while callbacks run) are coalesced, i.e. each subscription is notified once per wakeup. Created by the store on
+    first use.
+    """
+
+    def __init__(self, store: 'Store'):
+        self._subscriptions: List[Subscription] = []
+        self._changed: Set[int] = set()  # entity IDs changed since the last wakeup
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="objectbox-observer", daemon=True)
+        self._thread.start()
+        self._c_callback = obx_observer(self._on_change)  # keep a reference while observing
+        self._c_observer = obx_observe(store._c_store, self._c_callback, None)
+
+    def subscribe(self, entities: List['_Entity'], callback: Callable[[List['_Entity']], Any]) -> Subscription:
+        subscription = Subscription(self, entities, callback)
+        with self._condition:
+            if self._closed:
+                raise Exception("Store is closed")
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription):
+        with self._condition:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def _on_change(self, type_ids, count, _):
+        """ Called by the native library after each commit (from the committing thread). """
+        with self._condition:
+            self._changed.update(type_ids[i] for i in range(count))
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._changed and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                changed, self._changed = self._changed, set()
+                subscriptions = list(self._subscriptions)
+            for subscription in subscriptions:
+                entities = [entity for id, entity in subscription._entities.items() if id in changed]
+                if entities:
+                    try:
+                        subscription._callback(entities)
+                    except Exception:
+                        logger.exception("Change subscription callback failed")
+
+    def close(self):
+        """ Stops observing; must be called before the store is closed (Store.close() does so). """
+        c_observer, self._c_observer = self._c_observer, None
+        if c_observer:
+            obx_observer_close(c_observer)
+        with self._condition:
+            self._closed = True
+            subscriptions, self._subscriptions = self._subscriptions, []
+            self._condition.notify()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+        for subscription in subscriptions:
+            if subscription._on_close is not None:
+                subscription._on_close()
+
+
+class ChangeFeed:
+    """ Iterates over changes of entity types: each item is the list of entities changed since the previous item
+    (i.e. changes are coalesced while not consuming). Blocks until there are changes; see Store.changes().
+    The iteration ends once closed (or the store was closed). """
+
+    def __init__(self, store: 'Store', entities: List['_Entity']):
+        self._pending: Dict[int, '_Entity'] = {}
+        self._closed = False
+        self._condition = threading.Condition()
+        self._subscription = store.subscribe(entities, self._on_change)
+        self._subscription._on_close = self._on_close
+
+    def _on_change(self, entities: List['_Entity']):
+        with self._condition:
+            self._pending.update((entity._id, entity) for entity in entities)
+            self._condition.notify_all()
+
+    def _on_close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def next(self, timeout: Optional[float] = None) -> Optional[List['_Entity']]:
+        """ Waits for changes; returns None on timeout or once closed. """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._pending or self._closed, timeout) or not self._pending:
+                return None
+            changed, self._pending = list(self._pending.values()), {}
+            return changed
+
+    def __iter__(self) -> Iterator[List['_Entity']]:
+        return self
+
+    def __next__(self) -> List['_Entity']:
+        changed = self.next()
+        if changed is None:
+            raise StopIteration
+        return changed
+
+    def close(self):
+        """ Unsubscribes; iteration stops once pending changes were consumed. """
+        self._subscription.close()
+        self._on_close()
+
+    def __enter__(self) -> 'ChangeFeed':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -12,34 +12,207 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import queue
+import threading
+import weakref
+
+import objectbox.transaction
 from objectbox.c import *
+from objectbox.model.columns import resolve_properties, bytes_array_to_buffer, decode_columns, _date_dtypes
 
 
 class Query:
     def __init__(self, c_query, box: 'Box'):
-        self._c_query = c_query
         self._box = box
         self._entity = self._box._entity
         self._store = box._store
+        self._prop_queries = weakref.WeakSet()  # open PropertyQuery objects; closed before this query
+        self._c_query = c_query
+        self._offset = 0  # as set via offset(); QueryCache.release() resets it before reusing the query
+        self._limit = 0  # as set via limit(); QueryCache.release() resets it before reusing the query
 
-    def find(self) -> list:
-        """ Finds a list of objects matching query. """
-        with self._store.read_tx():  # We need a read transaction to ensure the object data stays valid
-            # OBX_bytes_array*
-            c_bytes_array_p = obx_query_find(self._c_query)
+    def _find(self, lazy: bool, zero_copy: bool = False, tx: Optional['Transaction'] = None) -> list:
+        """ Finds and unmarshals the objects; requires an active read transaction (tx if reading lazy zero-copy). """
+        unmarshal = objectbox.transaction.unmarshaller(self._entity, lazy, zero_copy, tx)
+        # OBX_bytes_array*
+        c_bytes_array_p = obx_query_find(self._c_query)
+        try:
+            # OBX_bytes_array
+            c_bytes_array = c_bytes_array_p.contents
+
+            result = []
+            for i in range(c_bytes_array.count):
+                # OBX_bytes
+                c_bytes = c_bytes_array.data[i]
+                result.append(unmarshal(c_bytes.data, c_bytes.size))
+            return result
+        finally:
+            obx_bytes_array_free(c_bytes_array_p)
+
+    def find(self, lazy: bool = False, zero_copy: bool = False) -> list:
+        """ Finds a list of objects matching query.
+
+        :param lazy:
+            If True, returns lightweight objects that decode each property only on its first access.
+            Useful for large objects (e.g. vectors/bytes) of which only a few properties are read.
+        :param zero_copy:
+            If True, objects are decoded directly from the database memory instead of copying their data first.
+            Combined with lazy, this must be called within a transaction (see Store.read_tx()) and the objects are only
+            usable until it ends (accessing properties afterwards raises); call Box.detach() on the ones to keep.
+        """
+        tx = self._store._active_tx.tx
+        with self._store._read_tx_if_needed():  # We need a read transaction to ensure the object data stays valid
+            return self._find(lazy, zero_copy, tx)
+
+    def iter(self, batch_size: int = 1000, batches: bool = False, lazy: bool = False) -> Iterator:
+        """ Iterates over the objects matching the query, fetching at most batch_size objects at a time.
+        Thus, memory usage is bounded regardless of the number of results (except for the IDs of the matching objects,
+        which are found upfront).
+
+        All batches are read within a single read transaction, which is held until the iteration completes or the
+        generator is closed; thus, results are consistent and the generator must be consumed in the creating thread.
+        For the same reason, the thread can't write (e.g. box.put()) while iterating: starting a write transaction
+        raises an error; collect the changes and write them after the iteration instead.
+        Respects the order, offset and limit set on the query.
+
+        :param batch_size:
+            The maximum number of objects to fetch at once (by their IDs; thus, the query runs only once).
+        :param batches:
+            If True, yields lists of (up to batch_size) objects instead of individual objects.
+        :param lazy:
+            See find().
+        """
+        if batch_size <= 0:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+        # not activated: the transaction stays open between yields, where code of this thread must not implicitly use it
+        with objectbox.transaction.read(self._store, activate=False):
+            ids = self._find_ids_numpy()
+            unmarshal = objectbox.transaction.unmarshaller(self._entity, lazy, False)
+            for start in range(0, len(ids), batch_size):
+                batch = self._box._get_many_in_tx(ids[start:start + batch_size], unmarshal)
+                if batches:
+                    yield batch
+                else:
+                    yield from batch
+
+    def _find_ids_numpy(self) -> np.ndarray:
+        """ Finds the IDs of the matching objects (in query order) as a uint64 array. """
+        c_id_array_p = obx_query_find_ids(self._c_query)
+        try:
+            c_id_array: OBX_id_array = c_id_array_p.contents
+            ids = np.empty(c_id_array.count, dtype=np.uint64)
+            if c_id_array.count > 0:
+                ctypes.memmove(ids.ctypes.data, c_id_array.ids, ids.nbytes)
+            return ids
+        finally:
+            obx_id_array_free(c_id_array_p)
+
+    def visit(self, fn: Callable[[Any], Optional[bool]], lazy: bool = False) -> None:
+        """ Calls fn with each object matching the query, without creating a result list.
+        Objects are decoded directly from the database memory, i.e. without copying their data to bytes first.
+        Visiting stops if fn returns False; exceptions raised by fn are propagated.
+
+        :param lazy:
+            If True, passes lazy objects (see find()) referencing the database memory, which are only usable during
+            the call of fn (accessing properties afterwards raises); call Box.detach() on the ones to keep.
+        """
+        unmarshal = self._entity._transient_lazy_unmarshaller if lazy else self._entity._transient_unmarshaller
+        error = None
+
+        def visitor(data, size, _):
+            nonlocal error
+            view = c_voidp_as_memoryview(data, size)
             try:
-                # OBX_bytes_array
-                c_bytes_array = c_bytes_array_p.contents
+                return fn(unmarshal(view)) is not False
+            except BaseException as e:  # must not propagate into native code
+                error = e
+                return False
+            finally:
+                if lazy:
+                    view.release()
 
-                result = []
-                for i in range(c_bytes_array.count):
-                    # OBX_bytes
-                    c_bytes = c_bytes_array.data[i]
-                    data = c_voidp_as_bytes(c_bytes.data, c_bytes.size)
-                    result.append(self._box._entity._unmarshal(data))
-                return result
+        obx_query_visit(self._c_query, obx_data_visitor(visitor), None)
+        if error is not None:
+            raise error
+
+    def visit_iter(self, batch_size: int = 1000) -> Iterator:
+        """ Generator based on visit(): yields the objects matching the query, which are visited in a background
+        thread that is at most two batches (of batch_size objects) ahead. Closing the generator stops visiting.
+        The query must not be used otherwise until the generator is exhausted or closed.
+        """
+        for batch in self._visit_batches(batch_size):
+            yield from batch
+
+    def _visit_batches(self, batch_size: int) -> Iterator[list]:
+        """ Like visit_iter(), but yields lists of (up to batch_size) objects. """
+        if batch_size <= 0:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+        batches = queue.Queue(maxsize=1)
+        stop = threading.Event()
+        done = object()
+
+        def offer(item) -> bool:
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def produce():
+            batch = []
+
+            def collect(obj):
+                batch.append(obj)
+                if len(batch) < batch_size:
+                    return True
+                full = batch.copy()
+                batch.clear()
+                return offer(full)
+
+            try:
+                self.visit(collect)
+                if batch:
+                    offer(batch)
+                offer(done)
+            except BaseException as e:
+                offer(e)
+
+        thread = threading.Thread(target=produce, name="objectbox-query-visit", daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = batches.get()
+                if item is done:
+                    break
+                elif isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            thread.join()
+
+    def find_columns(self, props: Optional[List[Union[int, str, 'Property']]] = None) -> Dict[str, np.ndarray]:
+        """ Finds the objects matching query and returns their property values as NumPy arrays (one per property).
+
+        Values are decoded directly from the object data, without creating objects:
+        scalars use fixed-width dtypes (dates use datetime64), strings/bytes/flex use object arrays and vectors use
+        2-D arrays if all vectors have the same length (e.g. embeddings), otherwise object arrays of 1-D arrays.
+
+        :param props:
+            The properties to get (by Property, name or ID); all properties if None.
+        :return:
+            A dict mapping property names to arrays with one value per object.
+        """
+        props = resolve_properties(self._entity, props)
+        with self._store._read_tx_if_needed():  # We need a read transaction to ensure the object data stays valid
+            c_bytes_array_p = obx_query_find(self._c_query)
+            try:
+                buffer, starts = bytes_array_to_buffer(c_bytes_array_p.contents)
             finally:
                 obx_bytes_array_free(c_bytes_array_p)
+        return decode_columns(buffer, starts, props)
 
     def find_ids(self) -> List[int]:
         """ Finds a list of object IDs matching query. The result is sorted by ID (ascending order). """
@@ -56,18 +229,19 @@ class Query:
     def find_with_scores(self):
         """ Finds objects matching the query associated to their query score (e.g. distance in NN search).
         The result is sorted by score in ascending order. """
-        with self._store.read_tx():  # We need a read transaction to ensure the object data stays valid
+        with self._store._read_tx_if_needed():  # We need a read transaction to ensure the object data stays valid
             c_bytes_score_array_p = obx_query_find_with_scores(self._c_query)
             try:
                 # OBX_bytes_score_array
                 c_bytes_score_array: OBX_bytes_score_array = c_bytes_score_array_p.contents
+                unmarshal = self._entity._unmarshaller
                 result = []
                 for i in range(c_bytes_score_array.count):
                     c_bytes_score: OBX_bytes_score = c_bytes_score_array.bytes_scores[i]
                     data = c_voidp_as_bytes(c_bytes_score.data, c_bytes_score.size)
                     score = c_bytes_score.score
 
-                    object_ = self._box._entity._unmarshal(data)
+                    object_ = unmarshal(data)
                     result.append((object_, score))
                 return result
             finally:
@@ -123,17 +297,27 @@ class Query:
         obx_query_count(self._c_query, ctypes.byref(count))
         return int(count.value)
 
+    def property(self, prop: Union[int, str, 'Property']) -> 'PropertyQuery':
+        """ Creates a query for the values of the given property of the objects matching this query, e.g. to compute
+        aggregates natively: ``query.property(Order.amount).sum()``. """
+        return PropertyQuery(self, resolve_properties(self._entity, [prop])[0])
+
     def remove(self) -> int:
         count = ctypes.c_uint64()
         obx_query_remove(self._c_query, ctypes.byref(count))
+        self._store._objects_changed(self._entity._id)
         return int(count.value)
 
     def offset(self, offset: int) -> 'Query':
+        """ Skips the first results (as ordered, see QueryBuilder.order()). """
         obx_query_offset(self._c_query, offset)
+        self._offset = offset
         return self
 
     def limit(self, limit: int) -> 'Query':
+        """ Limits the number of results (0: no limit); combined with QueryBuilder.order(), e.g. to get the top k. """
         obx_query_limit(self._c_query, limit)
+        self._limit = limit
         return self
 
     def set_parameter_string(self, prop: Union[int, str, 'Property'], value: str) -> 'Query':
@@ -157,12 +341,6 @@ class Query:
         obx_query_param_vector_float32(self._c_query, self._entity._id, prop_id, c_value, num_el)
         return self
 
-    def offset(self, offset: int):
-        return obx_query_offset(self._c_query, offset)
-
-    def limit(self, limit: int):
-        return obx_query_limit(self._c_query, limit)
-
     def set_parameter_alias_string(self, alias: str, value: str):
         return obx_query_param_alias_string(self._c_query, c_str(alias), c_str(value))
 
@@ -172,3 +350,196 @@ class Query:
     def set_parameter_alias_vector_f32(self, alias: str, value: Union[List[float], np.ndarray]):
         return obx_query_param_alias_vector_float32(self._c_query, c_str(alias), c_array(value, ctypes.c_float),
                                                     len(value))
+
+    def set_parameter_alias_double(self, alias: str, value: float):
+        return obx_query_param_alias_double(self._c_query, c_str(alias), value)
+
+    def set_parameter_alias_2ints(self, alias: str, value_a: int, value_b: int):
+        return obx_query_param_alias_2ints(self._c_query, c_str(alias), value_a, value_b)
+
+    def set_parameter_alias_2doubles(self, alias: str, value_a: float, value_b: float):
+        return obx_query_param_alias_2doubles(self._c_query, c_str(alias), value_a, value_b)
+
+    def set_parameter_alias_bytes(self, alias: str, value: bytes):
+        return obx_query_param_alias_bytes(self._c_query, c_str(alias), value, len(value))
+
+    def set_parameter_alias_int64s(self, alias: str, values: Union[List[int], np.ndarray]):
+        c_values = np.ascontiguousarray(values, dtype=np.int64)
+        return obx_query_param_alias_int64s(self._c_query, c_str(alias),
+                                            c_values.ctypes.data_as(ctypes.POINTER(ctypes.c_int64)), len(c_values))
+
+    def set_parameter_alias_int32s(self, alias: str, values: Union[List[int], np.ndarray]):
+        c_values = np.ascontiguousarray(values, dtype=np.int32)
+        return obx_query_param_alias_int32s(self._c_query, c_str(alias),
+                                            c_values.ctypes.data_as(ctypes.POINTER(ctypes.c_int32)), len(c_values))
+
+    def set_parameter_alias_strings(self, alias: str, values: List[str]):
+        c_values = (ctypes.c_char_p * len(values))(*[value.encode('utf-8') for value in values])
+        return obx_query_param_alias_strings(self._c_query, c_str(alias), c_values, len(values))
+
+    def __del__(self):
+        self.close()
+
+    def __enter__(self) -> 'Query':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """ Frees the native query, which must not be used afterwards; also done once garbage collected.
+        Property queries created from it are closed as well. """
+        c_query = getattr(self, '_c_query', None)  # not set if __init__ failed
+        if not c_query:
+            return
+        for prop_query in list(self._prop_queries):
+            prop_query.close()
+        self._c_query = None
+        if self._store._c_store is not None:  # otherwise, already freed with the store
+            obx_query_close(c_query)
+
+
+# property types with integer values and their obx_query_prop_find_* function, the C type and the array free function
+_prop_int_finders = {
+    OBXPropertyType_Bool: (obx_query_prop_find_int8s, ctypes.c_int8, obx_int8_array_free),
+    OBXPropertyType_Byte: (obx_query_prop_find_int8s, ctypes.c_int8, obx_int8_array_free),
+    OBXPropertyType_Short: (obx_query_prop_find_int16s, ctypes.c_int16, obx_int16_array_free),
+    OBXPropertyType_Char: (obx_query_prop_find_int16s, ctypes.c_int16, obx_int16_array_free),
+    OBXPropertyType_Int: (obx_query_prop_find_int32s, ctypes.c_int32, obx_int32_array_free),
+    OBXPropertyType_Long: (obx_query_prop_find_int64s, ctypes.c_int64, obx_int64_array_free),
+    OBXPropertyType_Date: (obx_query_prop_find_int64s, ctypes.c_int64, obx_int64_array_free),
+    OBXPropertyType_DateNano: (obx_query_prop_find_int64s, ctypes.c_int64, obx_int64_array_free),
+    OBXPropertyType_Relation: (obx_query_prop_find_int64s, ctypes.c_int64, obx_int64_array_free),
+}
+
+_prop_float_finders = {
+    OBXPropertyType_Float: (obx_query_prop_find_floats, ctypes.c_float, obx_float_array_free),
+    OBXPropertyType_Double: (obx_query_prop_find_doubles, ctypes.c_double, obx_double_array_free),
+}
+
+
+class PropertyQuery:
+    """ Query for the values of a single property of the objects matching a Query; see Query.property().
+    Aggregates and values are computed natively, i.e. without reading objects into Python.
+    Null values (i.e. properties not set) are ignored unless stated otherwise. """
+
+    def __init__(self, query: Query, prop: 'Property'):
+        self._query = query  # keeps the query alive
+        self._property = prop
+        self._c_prop_query = obx_query_prop(query._c_query, prop.id)
+        query._prop_queries.add(self)
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        c_prop_query = getattr(self, '_c_prop_query', None)  # not set if __init__ failed
+        self._c_prop_query = None
+        # Query.close() closes its property queries first, so the query is still open here
+        if c_prop_query and self._query._store._c_store is not None:  # otherwise, already freed with the store
+            obx_query_prop_close(c_prop_query)
+
+    def __enter__(self) -> 'PropertyQuery':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _is_int(self) -> bool:
+        ob_type = self._property._ob_type
+        if ob_type in _prop_int_finders:
+            return True
+        elif ob_type in _prop_float_finders:
+            return False
+        raise Exception(f"Property \"{self._property.name}\" is not numeric")
+
+    def distinct(self, distinct: bool = True, case_sensitive: Optional[bool] = None) -> 'PropertyQuery':
+        """ Only considers distinct values for count() and find_values().
+
+        :param case_sensitive:
+            For string properties, whether values only differing in case are distinct (default: True).
+        """
+        if case_sensitive is None:
+            obx_query_prop_distinct(self._c_prop_query, distinct)
+        else:
+            obx_query_prop_distinct_case(self._c_prop_query, distinct, case_sensitive)
+        return self
+
+    def count(self) -> int:
+        """ Counts the non-null values (distinct ones only if distinct() was set). """
+        count = ctypes.c_uint64()
+        obx_query_prop_count(self._c_prop_query, ctypes.byref(count))
+        return int(count.value)
+
+    def _aggregate(self, c_fn_float, c_fn_int) -> Tuple[Union[int, float], int]:
+        count = ctypes.c_int64()
+        if self._is_int():
+            value = ctypes.c_int64()
+            c_fn_int(self._c_prop_query, ctypes.byref(value), ctypes.byref(count))
+        else:
+            value = ctypes.c_double()
+            c_fn_float(self._c_prop_query, ctypes.byref(value), ctypes.byref(count))
+        return value.value, count.value
+
+    def min(self) -> Optional[Union[int, float]]:
+        """ Returns the minimum value, or None if there are no values. """
+        value, count = self._aggregate(obx_query_prop_min, obx_query_prop_min_int)
+        return value if count > 0 else None
+
+    def max(self) -> Optional[Union[int, float]]:
+        """ Returns the maximum value, or None if there are no values. """
+        value, count = self._aggregate(obx_query_prop_max, obx_query_prop_max_int)
+        return value if count > 0 else None
+
+    def sum(self) -> Union[int, float]:
+        """ Returns the sum of the values (an int for integer properties; raises if it would overflow int64). """
+        value, _ = self._aggregate(obx_query_prop_sum, obx_query_prop_sum_int)
+        return value
+
+    def avg(self) -> Optional[float]:
+        """ Returns the average of the values, or None if there are no values. """
+        self._is_int()  # checks the property type; integers are averaged as doubles, too (avg_int() would round)
+        value = ctypes.c_double()
+        count = ctypes.c_int64()
+        obx_query_prop_avg(self._c_prop_query, ctypes.byref(value), ctypes.byref(count))
+        return value.value if count.value > 0 else None
+
+    def find_values(self, null_value: Any = None) -> np.ndarray:
+        """ Finds the values of the property, e.g. to further process them with NumPy.
+
+        :param null_value:
+            The value used for objects not having the property set; if None, these objects are skipped.
+        :return:
+            A NumPy array of the property's type (dates as datetime64, bools as bool); an object array for strings.
+        """
+        ob_type = self._property._ob_type
+        if ob_type == OBXPropertyType_String:
+            c_null = None if null_value is None else c_str(null_value)
+            c_array_p = obx_query_prop_find_strings(self._c_prop_query, c_null)
+            try:
+                c_array = c_array_p.contents
+                values = np.empty(c_array.count, dtype=object)
+                for i in range(c_array.count):
+                    values[i] = c_array.items[i].decode('utf-8')
+                return values
+            finally:
+                obx_string_array_free(c_array_p)
+
+        if self._is_int():
+            c_find, c_type, c_free = _prop_int_finders[ob_type]
+        else:
+            c_find, c_type, c_free = _prop_float_finders[ob_type]
+        c_null = None if null_value is None else ctypes.byref(c_type(null_value))
+        c_array_p = c_find(self._c_prop_query, c_null)
+        try:
+            c_array = c_array_p.contents
+            values = np.empty(c_array.count, dtype=np.dtype(c_type))
+            if c_array.count > 0:
+                ctypes.memmove(values.ctypes.data, c_array.items, values.nbytes)
+        finally:
+            c_free(c_array_p)
+        if ob_type == OBXPropertyType_Bool:
+            return values.astype(np.bool_)
+        elif ob_type in _date_dtypes:
+            return values.view(_date_dtypes[ob_type])
+        return values
@@ -11,12 +11,28 @@ from objectbox.utils import check_float_vector
 
 class QueryBuilder:
     def __init__(self, store: Store, box: 'Box'):
+        self._store = store
         self._box = box
         self._entity = box._entity
         self._c_builder = obx_query_builder(store._c_store, box._entity._id)
+        self._param_aliases: Optional[Iterator[Optional[str]]] = None  # aliases for the conditions; see QueryCache
+
+    def __del__(self):
+        self.close()
+
+    def __enter__(self) -> 'QueryBuilder':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     def close(self) -> int:
-        return obx_qb_close(self._c_builder)
+        """ Frees the native query builder; build() does so already. Further calls have no effect. """
+        c_builder = getattr(self, '_c_builder', None)
+        self._c_builder = None
+        if c_builder and self._store._c_store is not None:  # otherwise, already freed with the store
+            return obx_qb_close(c_builder)
+        return 0
 
     def error_code(self) -> int:
         return obx_qb_error_code(self._c_builder)
@@ -89,6 +105,35 @@ class QueryBuilder:
         cond = obx_qb_greater_than_int(self._c_builder, prop_id, value)
         return cond
     
+    def in_int64s(self, prop: Union[int, str, Property], values: Union[List[int], np.ndarray]) -> obx_qb_cond:
+        prop_id = self._entity._get_property_id(prop)
+        c_values = np.ascontiguousarray(values, dtype=np.int64)
+        return obx_qb_in_int64s(self._c_builder, prop_id, c_values.ctypes.data_as(ctypes.POINTER(ctypes.c_int64)),
+                                len(c_values))
+
+    def not_in_int64s(self, prop: Union[int, str, Property], values: Union[List[int], np.ndarray]) -> obx_qb_cond:
+        prop_id = self._entity._get_property_id(prop)
+        c_values = np.ascontiguousarray(values, dtype=np.int64)
+        return obx_qb_not_in_int64s(self._c_builder, prop_id, c_values.ctypes.data_as(ctypes.POINTER(ctypes.c_int64)),
+                                    len(c_values))
+
+    def in_int32s(self, prop: Union[int, str, Property], values: Union[List[int], np.ndarray]) -> obx_qb_cond:
+        prop_id = self._entity._get_property_id(prop)
+        c_values = np.ascontiguousarray(values, dtype=np.int32)
+        return obx_qb_in_int32s(self._c_builder, prop_id, c_values.ctypes.data_as(ctypes.POINTER(ctypes.c_int32)),
+                                len(c_values))
+
+    def not_in_int32s(self, prop: Union[int, str, Property], values: Union[List[int], np.ndarray]) -> obx_qb_cond:
+        prop_id = self._entity._get_property_id(prop)
+        c_values = np.ascontiguousarray(values, dtype=np.int32)
+        return obx_qb_not_in_int32s(self._c_builder, prop_id, c_values.ctypes.data_as(ctypes.POINTER(ctypes.c_int32)),
+                                    len(c_values))
+
+    def in_strings(self, prop: Union[int, str, Property], values: List[str], case_sensitive: bool = True) -> obx_qb_cond:
+        prop_id = self._entity._get_property_id(prop)
+        c_values = (ctypes.c_char_p * len(values))(*[value.encode('utf-8') for value in values])
+        return obx_qb_in_strings(self._c_builder, prop_id, c_values, len(values), case_sensitive)
+
     def greater_than_double(self, prop: Union[int, str, Property], value: float) -> obx_qb_cond:
         prop_id = self._entity._get_property_id(prop)
         cond = obx_qb_greater_than_double(self._c_builder, prop_id, value)
@@ -191,8 +236,42 @@ class QueryBuilder:
         cond = obx_qb_all(self._c_builder, c_conditions, len(conditions))
         return cond
 
+    def order(self, prop: Union[int, str, Property], descending: bool = False, nulls_last: bool = False,
+              case_sensitive: bool = False, unsigned: bool = False, nulls_zero: bool = False) -> 'QueryBuilder':
+        """ Orders the results by the given property; call multiple times to order by further properties for equal
+        values of the previous ones. Combined with Query.limit(), only the first results are returned, e.g. the latest
+        N objects by ``order(Post.created, descending=True)``.
+
+        :param nulls_last:
+            If True, objects not having the property set come last (by default, they come first).
+        :param case_sensitive:
+            For strings, sorts upper case letters (e.g. "Z") before lower case letters (e.g. "a").
+        :param unsigned:
+            For integers, compares values as unsigned.
+        :param nulls_zero:
+            For scalars, treats null values like zero.
+        """
+        prop_id = self._entity._get_property_id(prop)
+        flags = 0
+        if descending:
+            flags |= OBXOrderFlags_DESCENDING
+        if case_sensitive:
+            flags |= OBXOrderFlags_CASE_SENSITIVE
+        if unsigned:
+            flags |= OBXOrderFlags_UNSIGNED
+        if nulls_last:
+            flags |= OBXOrderFlags_NULLS_LAST
+        if nulls_zero:
+            flags |= OBXOrderFlags_NULLS_ZERO
+        obx_qb_order(self._c_builder, prop_id, flags)
+        return self
+
     def build(self) -> Query:
-        c_query = obx_query(self._c_builder)
+        """ Builds the query and closes this builder (the query does not depend on it). """
+        try:
+            c_query = obx_query(self._c_builder)
+        finally:
+            self.close()
         return Query(c_query, self._box)
 
     def alias(self, alias: str):
@@ -0,0 +1,122 @@
+# Copyright 2019-2024 ObjectBox Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import *
+
+from objectbox.condition import QueryCondition
+from objectbox.query import Query
+
+
+class QueryCache:
+    """ LRU cache of built queries, keyed by the shape of their condition (ops, properties and options; not values).
+
+    Queries are built with an alias per condition, through which the values of another condition of the same shape
+    are set (obx_query_param_alias_*) when the query is reused. A query is used by one caller at a time: it's taken
+    out of the cache while in use (concurrent callers thus build further queries) and put back afterwards.
+    Queries evicted beyond max_size are closed. Used via Box.cached_query().
+    """
+
+    def __init__(self, box: 'Box', max_size: int = 32):
+        self._box = box
+        self._max_size = max_size
+        self._idle: OrderedDict[Hashable, List[Query]] = OrderedDict()  # least recently used first
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _aliases(condition: QueryCondition) -> List[Optional[str]]:
+        """ The aliases of the condition's leaves: the one set by the user, or one generated for parameters. """
+        return [leaf._alias if leaf._alias is not None else f"_p{i}" if leaf._is_parameter() else None
+                for i, leaf in enumerate(condition._leaves())]
+
+    def _build(self, condition: Optional[QueryCondition]) -> Query:
+        with self._box.query() as qb:
+            if condition is not None:
+                qb._param_aliases = iter(self._aliases(condition))
+                condition.apply(qb)
+                qb._param_aliases = None
+            return qb.build()
+
+    def acquire(self, condition: Optional[QueryCondition]) -> Tuple[Hashable, Query]:
+        """ Takes a query for the condition out of the cache (or builds one); give it back via release(). """
+        key = None if condition is None else condition._shape()
+        query = None
+        with self._lock:
+            queries = self._idle.get(key)
+            if queries:
+                query = queries.pop()
+                self._size -= 1
+                if not queries:
+                    del self._idle[key]
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if query is None:
+            return key, self._build(condition)
+        if condition is not None:
+            try:
+                for leaf, alias in zip(condition._leaves(), self._aliases(condition)):
+                    if alias is not None and leaf._is_parameter():
+                        leaf._set_parameter(query, alias)
+            except:
+                query.close()
+                raise
+        return key, query
+
+    def release(self, key: Hashable, query: Query):
+        """ Puts the query back into the cache, closing the least recently used queries beyond max_size. """
+        if query._offset or query._limit:
+            query.offset(0).limit(0)
+        evicted = []
+        with self._lock:
+            self._idle.setdefault(key, []).append(query)
+            self._idle.move_to_end(key)
+            self._size += 1
+            while self._size > self._max_size:
+                oldest_key, queries = next(iter(self._idle.items()))
+                evicted.append(queries.pop(0))
+                self._size -= 1
+                if not queries:
+                    del self._idle[oldest_key]
+        for query in evicted:
+            self._close(query)
+
+    @contextmanager
+    def query(self, condition: Optional[QueryCondition]) -> Iterator[Query]:
+        key, query = self.acquire(condition)
+        try:
+            yield query
+        finally:
+            self.release(key, query)
+
+    def _close(self, query: Query):
+        if self._box._store._c_store is not None:  # otherwise, already freed with the store
+            query.close()
+
+    def clear(self):
+        """ Closes all cached queries. """
+        with self._lock:
+            idle, self._idle, self._size = self._idle, OrderedDict(), 0
+        for queries in idle.values():
+            for query in queries:
+                self._close(query)
+
+    def __len__(self) -> int:
+        return self._size
@@ -15,11 +15,15 @@ import inspect
 import logging
 import os
 import sys
+import weakref
 from types import ModuleType
 
 import objectbox.c as c
 import objectbox.transaction
+from objectbox.async_queue import AsyncQueueCompletions
+from objectbox.batcher import Batcher
 from objectbox.model.idsync import sync_model
+from objectbox.observer import ChangeDispatcher, ChangeFeed, Subscription
 from objectbox.store_options import StoreOptions
 import objectbox
 from objectbox.model.entity import _Entity
@@ -118,6 +122,12 @@ class Store:
         """
 
         self._c_store = None
+        self._max_readers = max_readers  # None: library default
+        self._async_completions = None  # created on first use, see _track_async()
+        self._change_dispatcher = None  # created on first use, see subscribe()
+        self._batchers = weakref.WeakSet()  # open batchers; closed (i.e. committed) before closing the store
+        self._active_tx = objectbox.transaction._ActiveTx()  # used by Box/Query operations of the same thread
+        self._object_caches: Dict[int, List['ObjectCache']] = {}  # by entity ID; see Box.enable_cache()
         if not c_store:
             options = StoreOptions()
             try:
@@ -249,13 +259,92 @@ class Store:
         """
         return objectbox.Box(self, entity)
 
-    def read_tx(self):
+    def read_tx(self) -> ContextManager['objectbox.transaction.Transaction']:
+        """ Starts a read transaction; Box and Query operations within the with block (on this thread) use it. """
         return objectbox.transaction.read(self)
 
-    def write_tx(self):
+    def write_tx(self) -> ContextManager['objectbox.transaction.Transaction']:
+        """ Starts a write transaction, committed at the end of the with block unless an exception was raised.
+        Box and Query operations within the with block (on this thread) use it. """
         return objectbox.transaction.write(self)
 
+    def _read_tx_if_needed(self) -> ContextManager:
+        """ Starts a read transaction unless one is active in this thread (which is then used instead). """
+        return objectbox.transaction.read_if_needed(self)
+
+    def _objects_changed(self, entity_id: int, ids: Optional[List[int]] = None):
+        """ Invalidates the cached objects with the given IDs (all if None) after they were put or removed.
+        Within a write transaction, they are invalidated again once it ends (as others may have read them meanwhile). """
+        caches = self._object_caches.get(entity_id)
+        if caches:
+            for cache in list(caches):
+                cache.invalidate(ids)
+            tx = self._active_tx.tx
+            if tx is not None and tx._write:
+                tx._changed.append((entity_id, ids))
+
+    def batcher(self, max_ops: int = 1000, max_delay_ms: float = 10) -> Batcher:
+        """ Creates a Batcher, which coalesces puts and removes submitted from any thread into shared write
+        transactions; e.g. to reduce the commit overhead of many threads putting individual objects.
+
+        :param max_ops:
+            The maximum number of operations per transaction; reaching it triggers a commit.
+        :param max_delay_ms:
+            The maximum time an operation waits for other operations before the transaction is committed.
+        """
+        batcher = Batcher(self, max_ops, max_delay_ms)
+        self._batchers.add(batcher)
+        return batcher
+
+    def subscribe(self, entities: Union[_Entity, Iterable[_Entity]],
+                  callback: Callable[[List[_Entity]], Any]) -> Subscription:
+        """ Calls callback after transactions changing (putting or removing objects of) any of the given entities were
+        committed, passing the list of changed entities.
+
+        Callbacks are called from a dedicated thread, one after another; commits happening until the thread gets to
+        them are coalesced into a single call. Close the returned Subscription to stop the notifications.
+        """
+        entities = [entities] if isinstance(entities, _Entity) else list(entities)
+        if self._change_dispatcher is None:
+            self._change_dispatcher = ChangeDispatcher(self)
+        return self._change_dispatcher.subscribe(entities, callback)
+
+    def changes(self, entities: Union[_Entity, Iterable[_Entity]]) -> ChangeFeed:
+        """ Returns an iterator yielding the list of changed entities after commits changing any of the given entities
+        (see subscribe()); blocks while there are no changes. Close it to stop the iteration. """
+        entities = [entities] if isinstance(entities, _Entity) else list(entities)
+        return ChangeFeed(self, entities)
+
+    def _track_async(self, result: Any) -> 'Future':
+        """ Returns a future resolving to result once all operations submitted to the async queue were processed. """
+        if self._async_completions is None:
+            self._async_completions = AsyncQueueCompletions(self._c_store)
+        return self._async_completions.track(result)
+
+    def await_async_completion(self) -> bool:
+        """ Waits until the async queue is idle, i.e. all async operations (including ones submitted meanwhile by
+        other threads) were processed. Returns False if the async queue was shut down. """
+        return c.obx_store_await_async_completion(self._c_store)
+
+    def await_async_submitted(self) -> bool:
+        """ Waits until all async operations submitted before this call were processed.
+        Returns False if the async queue was shut down. """
+        return c.obx_store_await_async_submitted(self._c_store)
+
     def close(self):
+        for batcher in list(getattr(self, "_batchers", ())):
+            batcher.close()
+        for caches in getattr(self, "_object_caches", {}).values():
+            for cache in caches:
+                cache.close()  # stops observing
+        change_dispatcher = getattr(self, "_change_dispatcher", None)
+        if change_dispatcher is not None:
+            self._change_dispatcher = None
+            change_dispatcher.close()
+        async_completions = getattr(self, "_async_completions", None)
+        if async_completions is not None:
+            self._async_completions = None
+            async_completions.close()
         c_store_to_close = self._c_store
         if c_store_to_close:
             self._c_store = None
@@ -12,25 +12,142 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import *
+
 from objectbox.c import *
-from contextlib import contextmanager
+from objectbox.cursor import Cursor, TxBox
+
+
+class Transaction:
+    """ A read or write transaction as returned by Store.read_tx() and Store.write_tx(); active within the with block.
+
+    While active, Box and Query operations on the same thread run within this transaction instead of using their own.
+    Use box() or cursor() for operations bound directly to the transaction. Transactions must not be used by other
+    threads than the one creating it.
+    """
+
+    def __init__(self, store: 'Store', c_txn, write: bool):
+        self._store = store
+        self._c_txn = c_txn
+        self._write = write
+        self._boxes: Dict[int, TxBox] = {}
+        self._cursors: List[Cursor] = []  # closed when the transaction ends
+        self._changed: List[Tuple[int, Optional[List[int]]]] = []  # objects put/removed; see Store._objects_changed()
+        self._views: List[memoryview] = []  # of native data; released when the transaction ends
+
+    @property
+    def is_write(self) -> bool:
+        return self._write
+
+    @property
+    def is_active(self) -> bool:
+        return self._c_txn is not None
+
+    def box(self, entity: '_Entity') -> 'TxBox':
+        """ Gets the TxBox for the given entity, which operates within this transaction. """
+        box = self._boxes.get(entity._id)
+        if box is None:
+            if self._c_txn is None:
+                raise Exception("Transaction is not active")
+            box = self._boxes[entity._id] = TxBox(self, entity)
+            self._cursors.append(box)
+        return box
+
+    def cursor(self, entity: '_Entity') -> Cursor:
+        """ Creates a new Cursor for the given entity; it's closed at the latest when the transaction ends. """
+        if self._c_txn is None:
+            raise Exception("Transaction is not active")
+        cursor = Cursor(self, entity)
+        self._cursors.append(cursor)
+        return cursor
+
+    def _view(self, data, size: int) -> memoryview:
+        """ Returns a view of native data read in this transaction; it's released (i.e. unusable) once it ends. """
+        if self._c_txn is None:
+            raise Exception("Transaction is not active")
+        view = c_voidp_as_memoryview(data, size)
+        self._views.append(view)
+        return view
+
+    def _end(self):
+        """ Closes the cursors and releases the views; must be called before the native transaction is closed. """
+        for cursor in self._cursors:
+            cursor.close()
+        self._cursors.clear()
+        self._boxes.clear()
+        for view in self._views:
+            view.release()
+        self._views.clear()
+        self._c_txn = None
+
+
+def unmarshaller(entity: '_Entity', lazy: bool, zero_copy: bool,
+                 tx: Optional[Transaction] = None) -> Callable[[int, int], Any]:
+    """ Returns a function unmarshalling an object from native data (pointer and size) read in the transaction.
+
+    Unless zero_copy is set, the data is copied to bytes first. Otherwise, objects are decoded directly from the native
+    memory; lazy objects then keep referencing it and are thus only usable while tx is active.
+    """
+    if not zero_copy:
+        unmarshal = entity._lazy_unmarshaller if lazy else entity._unmarshaller
+        return lambda data, size: unmarshal(c_voidp_as_bytes(data, size))
+    if not lazy:
+        unmarshal = entity._transient_unmarshaller
+        return lambda data, size: unmarshal(c_voidp_as_memoryview(data, size))
+    if tx is None:
+        raise Exception("Reading lazy objects zero-copy requires an active transaction, see Store.read_tx()")
+    unmarshal = entity._transient_lazy_unmarshaller
+    return lambda data, size: unmarshal(tx._view(data, size))
+
+
+class _ActiveTx(threading.local):
+    """ The transaction active in the current thread (per store). """
+    tx: Optional[Transaction] = None
+
+
+# used instead of a new transaction if one is already active
+_ACTIVE_TX_CONTEXT = nullcontext()
+
+
+def read_if_needed(store: 'Store') -> ContextManager:
+    """ Returns the context of a new read transaction unless a transaction is active in this thread already. """
+    if store._active_tx.tx is not None:
+        return _ACTIVE_TX_CONTEXT
+    return read(store)
 
 
 @contextmanager
-def read(store: 'Store'):
-    tx = obx_txn_read(store._c_store)
+def read(store: 'Store', activate: bool = True):
+    c_txn = obx_txn_read(store._c_store)
+    tx = Transaction(store, c_txn, write=False)
+    active = store._active_tx if activate else _ActiveTx()  # a non-activated transaction is not visible to others
+    previous, active.tx = active.tx, tx
     try:
-        yield
+        yield tx
     finally:
-        obx_txn_close(tx)
+        active.tx = previous
+        tx._end()
+        obx_txn_close(c_txn)
 
 
 @contextmanager
 def write(store: 'Store'):
-    tx = obx_txn_write(store._c_store)
+    c_txn = obx_txn_write(store._c_store)
+    tx = Transaction(store, c_txn, write=True)
+    active = store._active_tx
+    previous, active.tx = active.tx, tx
     try:
-        yield
-        obx_txn_success(tx)
+        yield tx
+        active.tx = previous
+        tx._end()
+        obx_txn_success(c_txn)
     except:
-        obx_txn_close(tx)
+        active.tx = previous
+        tx._end()
+        obx_txn_close(c_txn)
         raise
+    finally:
+        for entity_id, ids in tx._changed:
+            store._objects_changed(entity_id, ids)
@@ -0,0 +1,68 @@
+import asyncio
+import pytest
+from objectbox.aio import AsyncStore
+from tests.common import *
+from tests.model import *
+
+
+def test_aio_box():
+    async def main():
+        async with AsyncStore(create_test_store()) as store:
+            box = store.box(TestEntity)
+            ids = await asyncio.gather(*[box.put(TestEntity(str=str(i), int64=i % 2)) for i in range(100)])
+            assert sorted(ids) == list(range(1, 101))
+            assert await box.count() == 100
+
+            obj = await box.get(ids[7])
+            assert obj.str == "7"
+            assert [o.str for o in await box.get_many([ids[1], ids[0]])] == ["1", "0"]
+            assert len(await box.get_all()) == 100
+
+            await box.put([TestEntity(str="a"), TestEntity(str="b")])
+            assert await box.count() == 102
+
+            assert await box.remove(obj)
+            assert not await box.remove(obj)
+            assert await box.get(ids[7]) is None
+
+            query = box.query(TestEntity.int64.equals(1))
+            assert await query.count() == 49
+            assert len(await query.find()) == 49
+            assert len(await query.find_ids()) == 49
+            assert len([o async for o in query.iter(batch_size=7)]) == 49
+            async for _ in query.iter(batch_size=2):
+                break  # stops the iteration (and releases the query)
+            assert await query.count() == 49
+
+            # Concurrent use of the same query is serialized
+            counts = await asyncio.gather(*[query.count() for _ in range(10)])
+            assert counts == [49] * 10
+
+            assert await query.remove() == 49
+            assert await box.remove_all() == 52
+
+    asyncio.run(main())
+
+
+def test_aio_write_errors():
+    async def main():
+        async with AsyncStore(create_test_store()) as store:
+            box = store.box(TestEntity)
+
+            # A failing operation does not affect other operations batched in the same transaction
+            results = await asyncio.gather(box.put(TestEntity(str="ok")), box.put(TestEntity(int8=1000)),
+                                           box.put(TestEntity(str="ok too")), return_exceptions=True)
+            assert isinstance(results[1], Exception)
+            assert results[0] == 1
+            assert isinstance(results[2], int)
+            assert await box.count() == 2
+
+    asyncio.run(main())
+
+
+def test_aio_readers():
+    store = create_test_store()
+    store._max_readers = 4
+    async_store = AsyncStore(store, readers=100)
+    assert async_store._readers._max_workers == 2
+    async_store.close()
@@ -0,0 +1,45 @@
+from concurrent.futures import wait
+from tests.common import *
+from tests.model import *
+
+
+def test_put_remove_async(test_store):
+    box = test_store.box(TestEntity)
+
+    objects = [TestEntity(str=str(i)) for i in range(100)]
+    futures = [box.put_async(obj) for obj in objects]
+    assert [obj.id for obj in objects] == list(range(1, 101))  # assigned immediately
+    assert [future.result(timeout=10) for future in futures] == list(range(1, 101))
+    assert box.count() == 100
+    assert box.get(42).str == "41"
+
+    # Update
+    objects[0].str = "updated"
+    assert box.put_async(objects[0]).result(timeout=10) == 1
+    assert box.get(1).str == "updated"
+
+    futures = [box.remove_async(objects[0]), box.remove_async(2)]
+    assert futures[1].result(timeout=10) is None
+    assert box.count() == 98
+    assert box.get(1) is None
+
+
+def test_async_await(test_store):
+    box = test_store.box(TestEntity)
+    for i in range(10):
+        box.put_async(TestEntity(str=str(i)))
+    assert test_store.await_async_submitted()
+    assert box.count() == 10
+
+    box.put_async(TestEntity())
+    assert test_store.await_async_completion()
+    assert box.count() == 11
+
+
+def test_async_close_store():
+    store = create_test_store()
+    box = store.box(TestEntity)
+    futures = [box.put_async(TestEntity(str=str(i))) for i in range(10)]
+    store.close()  # resolves pending futures
+    done, not_done = wait(futures, timeout=10)
+    assert len(not_done) == 0
@@ -0,0 +1,92 @@
+import threading
+import time
+import pytest
+from tests.common import *
+from tests.model import *
+
+
+def test_batcher_threads(test_store):
+    box = test_store.box(TestEntity)
+    flex_box = test_store.box(TestEntityFlex)
+    futures = []
+    with test_store.batcher(max_ops=50, max_delay_ms=5) as batcher:
+        def produce(n):
+            for i in range(100):
+                futures.append(batcher.put(box, TestEntity(str=f"{n}-{i}")))
+                futures.append(batcher.put(flex_box, TestEntityFlex(flex=i)))
+
+        threads = [threading.Thread(target=produce, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    # close() committed everything
+    assert all(future.done() for future in futures)
+    assert box.count() == 400
+    assert flex_box.count() == 400
+    assert all(future.result() > 0 for future in futures)
+
+    with pytest.raises(Exception):
+        batcher.put(box, TestEntity())
+
+
+def test_batcher_triggers(test_store):
+    box = test_store.box(TestEntity)
+    batcher = test_store.batcher(max_ops=3, max_delay_ms=60_000)
+
+    # size
+    futures = [batcher.put(box, TestEntity(str=str(i))) for i in range(3)]
+    assert [future.result(timeout=10) for future in futures] == [1, 2, 3]
+
+    # explicit flush
+    future = batcher.put(box, TestEntity())
+    time.sleep(0.05)
+    assert not future.done()
+    batcher.flush()
+    assert future.result() == 4
+
+    # remove
+    futures = [batcher.remove(box, 1), batcher.remove(box, 42)]
+    batcher.flush()
+    assert [future.result() for future in futures] == [True, False]
+
+    # flush from an operation would wait for itself
+    future = batcher.submit(batcher.flush)
+    batcher.flush()
+    with pytest.raises(Exception, match="flush"):
+        future.result(timeout=10)
+    batcher.close()
+
+    # time
+    batcher = test_store.batcher(max_ops=1000, max_delay_ms=20)
+    future = batcher.put(box, TestEntity())
+    assert future.result(timeout=10) == 5
+    batcher.close()
+
+
+def test_batcher_errors(test_store):
+    box = test_store.box(TestEntity)
+    batcher = test_store.batcher(max_ops=1000, max_delay_ms=60_000)
+    calls = []
+
+    def submitted():
+        calls.append(1)
+        box.put([TestEntity(str="b"), TestEntity(str="c")])
+
+    futures = [batcher.put(box, TestEntity(str="a")), batcher.submit(submitted),
+               batcher.put(box, TestEntity(int8=1000)), batcher.submit(submitted)]
+    batcher.flush()
+    assert futures[0].result() == 1
+    # a submitted function that ran already is not re-executed, but fails with the error aborting the transaction
+    with pytest.raises(Exception):
+        futures[1].result()
+    with pytest.raises(Exception):
+        futures[2].result()
+    assert futures[3].result() is None  # did not run before the error
+    assert len(calls) == 2
+    assert box.count() == 3
+
+    # the store closes open batchers, committing their pending operations
+    future = batcher.put(box, TestEntity())
+    test_store.close()
+    assert future.result(timeout=10) > 0
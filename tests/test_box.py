@@ -126,6 +126,214 @@ def test_box_bulk(test_store):
     assert removed == 4
     assert box.count() == 0
 
+    # more new objects than IDs reserved at once, of varying sizes (i.e. offsets in the shared buffer)
+    objects = [TestEntity(str="x" * (i % 13), int64=i) for i in range(12000)]
+    box.put(objects)
+    assert box.count() == 12000
+    assert len(set(obj.id for obj in objects)) == 12000
+    for obj in objects[::997]:
+        read = box.get(obj.id)
+        assert read.str == obj.str
+        assert read.int64 == obj.int64
+
+
+def test_box_put_chunked(test_store):
+    box = test_store.box(TestEntity)
+    progress = []
+    objects = []
+
+    def generate(n):
+        for i in range(n):
+            objects.append(TestEntity(str=str(i), int64=i))
+            yield objects[-1]
+
+    assert box.put(generate(25), chunk_size=10, progress=lambda *args: progress.append(args)) == 25
+    assert box.count() == 25
+    assert [count for count, _ in progress] == [10, 20, 25]
+    assert progress[-1][1] > progress[-2][1] > progress[-3][1] > 0
+    assert [obj.id for obj in objects] == list(range(1, 26))
+    assert box.get(25).str == "24"
+
+    # max_bytes: a chunk is put once its size reaches the limit
+    progress.clear()
+    size = len(TestEntity._marshal(TestEntity(str="x"), 1))
+    assert box.put((TestEntity(str="x") for _ in range(10)), max_bytes=3 * size,
+                   progress=lambda *args: progress.append(args)) == 10
+    assert [count for count, _ in progress] == [3, 6, 9, 10]
+    assert box.count() == 35
+
+    # a failing object: chunks before it were committed, unless put in a single transaction
+    def failing():
+        for i in range(10):
+            yield TestEntity(int8=1000 if i == 7 else 0)
+
+    with pytest.raises(Exception):
+        box.put(failing(), chunk_size=5)
+    assert box.count() == 40
+    progress.clear()
+    with pytest.raises(Exception):
+        box.put(failing(), chunk_size=5, single_tx=True, progress=lambda *args: progress.append(args))
+    assert box.count() == 40
+    assert [count for count, _ in progress] == [5]  # reported before the commit, which never happened
+
+    assert box.put([], chunk_size=5) == 0
+    obj = TestEntity(str="single")
+    assert box.put(obj, chunk_size=2) == 1
+    assert box.get(obj.id).str == "single"
+    assert box.put(TestEntity(), TestEntity(), TestEntity(), chunk_size=2) == 3
+    with pytest.raises(ValueError):
+        box.put([TestEntity()], chunk_size=0)
+
+
+def test_box_put_modes(test_store):
+    box = test_store.box(TestEntity)
+    existing = TestEntity(str="existing")
+    box.put(existing)
+
+    new = TestEntity(str="new")
+    assert box.insert(new)
+    assert new.id == 2
+    assert not box.insert(TestEntity(id=existing.id, str="clobbered"))
+    assert box.get(existing.id).str == "existing"
+    assert box.update(TestEntity(id=existing.id, str="updated"))
+    assert box.get(existing.id).str == "updated"
+    assert not box.update(TestEntity(id=100, str="missing"))
+    assert not box.update(TestEntity(str="new"))
+    assert box.count() == 2
+
+    # bulk: a flag per object, failing objects do not affect the others
+    objects = [TestEntity(str="a"), TestEntity(id=existing.id, str="b"), TestEntity(id=50, str="c"),
+               TestEntity(id=50, str="d")]
+    inserted = box.insert(objects)
+    assert isinstance(inserted, np.ndarray)
+    assert inserted.tolist() == [True, False, True, False]
+    assert objects[0].id == 3
+    assert box.get(existing.id).str == "updated"
+    assert box.get(50).str == "c"
+
+    updated = box.put([TestEntity(id=50, str="e"), TestEntity(id=60), TestEntity()], mode=PutMode.UPDATE)
+    assert updated.tolist() == [True, False, False]
+    assert box.get(50).str == "e"
+    assert box.count() == 4
+
+    with pytest.raises(ValueError):
+        box.put(TestEntity(), mode=PutMode.INSERT, chunk_size=10)
+
+
+def test_cache(test_store):
+    box = test_store.box(TestEntity)
+    box.put([TestEntity(str=f"foo{i}") for i in range(5)])
+    cache = box.enable_cache(max_entries=3)
+
+    first = box.get(1)
+    assert box.get(1) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert box.get(42) is None
+
+    # invalidated by writes through any box of the store
+    other_box = test_store.box(TestEntity)
+    other_box.put(TestEntity(id=1, str="bar"))
+    assert box.get(1).str == "bar"
+    other_box.remove(1)
+    assert box.get(1) is None
+    box.get(2)
+    other_box.remove_all()
+    assert box.get(2) is None
+
+    # only the most recently used objects are kept
+    box.put([TestEntity(str=f"foo{i}") for i in range(5)])
+    for id in (6, 7, 8, 9, 6):
+        box.get(id)
+    assert len(cache) == 3 and cache.get(7) is objectbox.object_cache.MISSING
+    assert cache.stats()["evictions"] == 2
+
+    # not used within transactions; invalidated again once the transaction ends
+    with test_store.write_tx():
+        box.put(TestEntity(id=6, str="tx"))
+        assert box.get(6).str == "tx"
+    assert box.get(6).str == "tx"
+    with pytest.raises(ValueError):
+        with test_store.write_tx():
+            box.put(TestEntity(id=6, str="aborted"))
+            raise ValueError()
+    assert box.get(6).str == "tx"
+
+    with test_store.write_tx() as tx:
+        tx.box(TestEntity).put(TestEntity(id=6, str="cursor"))
+    assert box.get(6).str == "cursor"
+
+    box.query(TestEntity.str.equals("cursor")).build().remove()
+    assert box.get(6) is None
+
+    # writes only invalidate the affected objects
+    box.get(8)
+    box.put(TestEntity(id=9, str="other"))
+    assert cache.get(8) is not objectbox.object_cache.MISSING
+
+    # async writes are invalidated again once processed
+    box.put_async(TestEntity(id=8, str="async")).result(timeout=10)
+    assert box.get(8).str == "async"
+
+    box.disable_cache()
+    assert box.cache is None and len(cache) == 0
+
+
+def test_cache_bytes_and_observer(test_store):
+    box = test_store.box(TestEntity)
+    box.put([TestEntity(str="x" * 1000) for _ in range(10)])
+    cache = box.enable_cache(max_entries=0, max_bytes=5000, observe=True)
+    for id in range(1, 11):
+        box.get(id)
+    assert 0 < len(cache) < 5 and cache.stats()["bytes"] <= 5000
+
+    # changes not done via Box methods are noticed by observing commits (if enabled)
+    cache.add(1, "stale", 1, cache.generation)
+    assert box.get(1) == "stale"
+    data = bytes(TestEntity._marshal(TestEntity(id=1, str="native"), 1))
+    objectbox.c.obx_box_put(box._c_box, 1, data, len(data))
+    for _ in range(100):  # observers are notified asynchronously
+        if box.get(1) != "stale":
+            break
+        time.sleep(0.01)
+    assert box.get(1).str == "native"
+
+
+def test_get_many(test_store):
+    box = test_store.box(TestEntity)
+    box.put([TestEntity(str=str(i)) for i in range(1, 6)])
+
+    assert box.get_many([]) == []
+    objects = box.get_many([3, 1, 42, 5, 3])
+    assert [obj.str if obj else None for obj in objects] == ["3", "1", None, "5", "3"]
+    assert_equal(objects[0], box.get(3))
+
+    ids = np.array([5, 4], dtype=np.uint64)
+    assert [obj.id for obj in box.get_many(ids)] == [5, 4]
+    assert [obj.id for obj in box.get_many(ids[::-1])] == [4, 5]  # non-contiguous
+    assert [obj.id for obj in box.get_many(np.arange(1, 3))] == [1, 2]  # int64
+
+
+def test_remove_many(test_store):
+    box = test_store.box(TestEntity)
+    box.put([TestEntity(str=str(i)) for i in range(1, 101)])
+
+    assert box.remove_many([]) == 0
+    assert box.remove_many([3, 1, 42_000]) == 2
+    assert box.remove_many(np.array([1, 2], dtype=np.uint64)) == 1
+    assert box.count() == 97
+    assert box.get(2) is None
+
+    # Chunked, i.e. multiple transactions
+    assert box.remove_many(np.arange(10, 40), chunk_size=7) == 30
+    assert box.count() == 67
+
+    assert box.remove_range(40, 49) == 10
+    assert box.remove_range(45, 59, chunk_size=4) == 10
+    assert box.remove_range(500, 600) == 0
+    assert box.count() == 47
+    assert box.get(60).str == "60"
+    assert box.get(9).str == "9"
+
 
 def test_datetime(test_store):
     box = test_store.box(TestEntityDatetime)
@@ -0,0 +1,179 @@
+import flatbuffers
+import numpy as np
+import time
+from tests.common import *
+from tests.model import *
+
+
+def _test_entity_objects():
+    yield TestEntity()
+    yield TestEntity(str="foo", int64=-5, int32=7, int16=-3, int8=1, bool=True, float64=4.2, float32=1.5)
+    for n in range(0, 9):  # vector lengths around alignment boundaries
+        yield TestEntity(
+            str="x" * n,
+            bytes=bytes(range(n)),
+            bools=np.array([i % 2 == 0 for i in range(n)], dtype=np.bool_),
+            shorts=np.arange(n, dtype=np.int16),
+            chars=np.arange(n, dtype=np.uint16),
+            ints=np.arange(n, dtype=np.int32),
+            longs=np.arange(n, dtype=np.int64),
+            floats=np.arange(n, dtype=np.float32),
+            doubles=np.arange(n, dtype=np.float64),
+            ints_list=list(range(n)),
+            floats_list=[float(i) for i in range(n)],
+            date=time.time(),
+            date_nano=time.time_ns(),
+            flex={"a": n, "b": [1, 2, "three"]})
+
+
+def test_marshal_matches_generic(test_store):
+    entity = TestEntity
+    for obj in _test_entity_objects():
+        for id in [1, 42, 2 ** 40]:
+            assert entity._marshal(obj, id) == entity._marshal_generic(obj, id)
+
+    obj = TestEntityDatetime(date=time.time(), date_nano=time.time())
+    assert TestEntityDatetime._marshal(obj, 3) == TestEntityDatetime._marshal_generic(obj, 3)
+
+    obj = VectorEntity(name="v", vector_euclidean=[1.0, 2.0], vector_cosine=np.array([3, 4], dtype=np.float32))
+    assert VectorEntity._marshal(obj, 9) == VectorEntity._marshal_generic(obj, 9)
+
+
+def test_marshal_into_matches_generic(test_store):
+    entity = TestEntity
+    buf = bytearray(b"prefix")
+    for obj in _test_entity_objects():
+        start = len(buf)
+        size = entity._marshaller_into(buf, obj, 42)
+        assert size == len(buf) - start
+        assert buf[start:] == entity._marshal_generic(obj, 42)
+    assert buf[:6] == b"prefix"
+
+    large = TestEntity(str="x" * 10000, ints=np.arange(5000, dtype=np.int32))  # beyond the preallocated zeros
+    size = entity._marshaller_into(buf, large, 7)
+    assert buf[len(buf) - size:] == entity._marshal_generic(large, 7)
+
+
+def _assert_same_object(actual, expected, entity):
+    for prop in entity._properties:
+        a = getattr(actual, prop.name)
+        e = getattr(expected, prop.name)
+        assert type(a) == type(e), prop.name
+        if isinstance(e, np.ndarray):
+            assert a.dtype == e.dtype
+            assert np.array_equal(a, e)
+        else:
+            assert a == e, prop.name
+
+
+def test_unmarshal_matches_generic(test_store):
+    entity = TestEntity
+    for obj in _test_entity_objects():
+        data = bytes(entity._marshal(obj, 1))
+        _assert_same_object(entity._unmarshal(data), entity._unmarshal_generic(data), entity)
+
+    for obj in [TestEntityDatetime(date=time.time(), date_nano=time.time()), TestEntityDatetime()]:
+        data = bytes(TestEntityDatetime._marshal(obj, 3))
+        _assert_same_object(TestEntityDatetime._unmarshal(data), TestEntityDatetime._unmarshal_generic(data),
+                            TestEntityDatetime)
+
+    # Query and Box read paths
+    box = test_store.box(TestEntity)
+    box.put(list(_test_entity_objects()))
+    objects = box.get_all()
+    assert len(objects) == 11
+    for obj in objects:
+        _assert_same_object(obj, box.get(obj.id), entity)
+    found = box.query(TestEntity.id.greater_than(0)).build().find()
+    assert len(found) == len(objects)
+    for obj, expected in zip(found, objects):
+        _assert_same_object(obj, expected, entity)
+
+
+def test_unmarshal_absent_fields(test_store):
+    # An object written with an older version of the entity only has an ID
+    builder = flatbuffers.Builder(0)
+    builder.StartObject(1)
+    builder.PrependInt64Slot(0, 7, 0)
+    builder.Finish(builder.EndObject())
+    data = bytes(builder.Output())
+
+    obj = TestEntity._unmarshal(data)
+    assert obj.id == 7
+    assert obj.str == ""
+    assert obj.int64 == 0
+    assert obj.float32 == 0.0
+    assert obj.bool is False
+    assert obj.bytes == b""
+    assert obj.flex is None
+    assert obj.floats.dtype == np.float32 and len(obj.floats) == 0
+    assert obj.floats_list == []
+    assert obj.date == datetime.fromtimestamp(0, timezone.utc)
+    assert obj.date_nano == 0
+
+
+def test_unmarshal_lazy(test_store):
+    box = test_store.box(TestEntity)
+    box.put(list(_test_entity_objects()))
+    objects = box.get_all()
+
+    lazy_objects = box.get_all(lazy=True)
+    found = box.query(TestEntity.id.greater_than(0)).build().find(lazy=True)
+    for lazy in [lazy_objects, found]:
+        assert len(lazy) == len(objects)
+        for obj, expected in zip(lazy, objects):
+            assert isinstance(obj, TestEntity._user_type)
+            assert "str" not in obj.__dict__  # not decoded yet
+            _assert_same_object(obj, expected, TestEntity)
+            assert "str" in obj.__dict__  # cached
+
+    # Lazy objects can be modified and put like regular ones
+    obj = lazy_objects[1]
+    obj.str = "modified"
+    assert obj.str == "modified"
+    box.put(obj)
+    assert box.get(obj.id).str == "modified"
+    assert box.get(obj.id).int64 == -5
+    assert box.remove(obj)
+
+    # Absent fields, see test_unmarshal_absent_fields()
+    builder = flatbuffers.Builder(0)
+    builder.StartObject(1)
+    builder.PrependInt64Slot(0, 7, 0)
+    builder.Finish(builder.EndObject())
+    obj = TestEntity._lazy_unmarshaller(bytes(builder.Output()))
+    assert obj.id == 7
+    assert obj.str == ""
+    assert obj.floats_list == []
+
+
+def test_unmarshal_zero_copy(test_store):
+    box = test_store.box(TestEntity)
+    box.put(list(_test_entity_objects()))
+    objects = box.get_all()
+    query = box.query(TestEntity.id.greater_than(0)).build()
+
+    for found in [box.get_all(zero_copy=True), query.find(zero_copy=True)]:
+        for obj, expected in zip(found, objects):
+            _assert_same_object(obj, expected, TestEntity)
+
+    with pytest.raises(Exception, match="requires an active transaction"):
+        box.get_all(lazy=True, zero_copy=True)
+
+    with test_store.read_tx():
+        lazy_objects = box.get_all(lazy=True, zero_copy=True)
+        found = query.find(lazy=True, zero_copy=True)
+        assert lazy_objects[1].str == "foo"
+        kept = box.detach(lazy_objects[2])
+    assert lazy_objects[1].str == "foo"  # decoded within the transaction
+    with pytest.raises(Exception, match="after the transaction"):
+        lazy_objects[1].int64
+    with pytest.raises(Exception, match="after the transaction"):
+        found[0].str
+    _assert_same_object(kept, objects[2], TestEntity)
+
+    visited = []
+    query.visit(lambda obj: visited.append(obj) if obj.str == "foo" else box.detach(obj), lazy=True)
+    assert visited[0].str == "foo"
+    with pytest.raises(Exception, match="after the transaction"):
+        visited[0].int64
@@ -0,0 +1,130 @@
+import numpy as np
+import pytest
+import time
+from tests.common import *
+from tests.model import *
+
+
+def test_find_columns(test_store):
+    box = test_store.box(TestEntity)
+    assert box.get_all_columns(["id", "str"])["id"].shape == (0,)
+
+    box.put(TestEntity(str="foo", int64=-5, int32=7, float32=1.5, bool=True, bytes=b"abc",
+                       floats=np.array([1, 2], dtype=np.float32), ints_list=[1, 2, 3],
+                       date=1700000000123, date_nano=1700000000123456789, flex={"a": 1}))
+    box.put(TestEntity(str="bär", int64=6, floats=np.array([3, 4], dtype=np.float32), ints_list=[4]))
+    box.put(TestEntity(floats=np.array([5, 6], dtype=np.float32)))  # unset values
+
+    columns = box.get_all_columns()
+    assert set(columns.keys()) == set(prop.name for prop in TestEntity._properties)
+    assert columns["id"].dtype == np.int64
+    assert columns["id"].tolist() == [1, 2, 3]
+    assert columns["int64"].dtype == np.int64
+    assert columns["int64"].tolist() == [-5, 6, 0]
+    assert columns["int32"].tolist() == [7, 0, 0]
+    assert columns["float32"].dtype == np.float32
+    assert columns["float32"].tolist() == [1.5, 0.0, 0.0]
+    assert columns["bool"].dtype == np.bool_
+    assert columns["bool"].tolist() == [True, False, False]
+    assert columns["str"].tolist() == ["foo", "bär", ""]
+    assert columns["bytes"].tolist() == [b"abc", b"", b""]
+    assert columns["flex"].tolist() == [{"a": 1}, None, None]
+    assert columns["date"].dtype == np.dtype("datetime64[ms]")
+    assert columns["date"][0] == np.datetime64(1700000000123, "ms")
+    assert columns["date_nano"][0] == np.datetime64(1700000000123456789, "ns")
+    assert columns["date_nano"][1].astype(np.int64) == 0
+
+    # Fixed-dimension vectors are returned as 2-D arrays, others as arrays of 1-D arrays
+    assert columns["floats"].dtype == np.float32
+    assert columns["floats"].shape == (3, 2)
+    assert np.array_equal(columns["floats"], [[1, 2], [3, 4], [5, 6]])
+    assert columns["ints_list"].dtype == object
+    assert [v.tolist() for v in columns["ints_list"]] == [[1, 2, 3], [4], []]
+    assert columns["doubles"].shape == (3, 0)
+
+    # Selected properties, by Property, name or ID
+    query = box.query(TestEntity.int64.greater_than(0)).build()
+    columns = query.find_columns([TestEntity.id, "str", TestEntity.float32.id])
+    assert list(columns.keys()) == ["id", "str", "float32"]
+    assert columns["id"].tolist() == [2]
+    assert columns["str"].tolist() == ["bär"]
+
+    with pytest.raises(Exception):
+        box.get_all_columns(["unknown"])
+
+
+def test_find_columns_matches_objects(test_store):
+    box = test_store.box(TestEntity)
+    box.put([TestEntity(str=str(i), int64=i * 3, float64=i / 2, shorts=np.arange(i, dtype=np.int16),
+                        date_nano=time.time_ns()) for i in range(1000)])
+    objects = box.get_all()
+    columns = box.query(TestEntity.int64.less_than(1500)).build().find_columns()
+    assert len(columns["id"]) == 500
+    for i, obj in enumerate(objects[:500]):
+        assert columns["id"][i] == obj.id
+        assert columns["str"][i] == obj.str
+        assert columns["int64"][i] == obj.int64
+        assert columns["float64"][i] == obj.float64
+        assert np.array_equal(columns["shorts"][i], obj.shorts)
+        assert columns["date_nano"][i].astype(np.int64) == obj.date_nano
+
+
+def test_find_columns_fixed_vectors(test_store, monkeypatch):
+    import objectbox.model.columns
+    monkeypatch.setattr(objectbox.model.columns, "_GATHER_CHUNK_SIZE", 16)  # multiple chunks, some of a single row
+    box = test_store.box(TestEntity)
+    vectors = np.arange(100 * 3, dtype=np.float64).reshape(100, 3)
+    box.put([TestEntity(doubles=vector, bools=np.array([i % 2 == 0] * 17)) for i, vector in enumerate(vectors)])
+    columns = box.get_all_columns(["doubles", "bools"])
+    assert columns["doubles"].dtype == np.float64
+    assert np.array_equal(columns["doubles"], vectors)
+    assert np.array_equal(columns["bools"], [[i % 2 == 0] * 17 for i in range(100)])
+
+    # vectors that are not aligned in the buffer are gathered byte-wise
+    buffer = np.zeros(0, dtype=np.uint8)
+    starts = []
+    for obj in box.get_all():
+        data = TestEntity._marshal(obj, obj.id)
+        starts.append(len(buffer) + 1)
+        buffer = np.concatenate([buffer, [0], np.frombuffer(data, dtype=np.uint8)])
+    columns = objectbox.model.columns.decode_columns(buffer, np.array(starts), [TestEntity.doubles])
+    assert np.array_equal(columns["doubles"], vectors)
+
+
+def test_put_columns(test_store):
+    box = test_store.box(TestEntity)
+    count = 12345  # more than obx_box_ids_for_put() reserves at once
+    ids = box.put_columns({
+        "int64": np.arange(count, dtype=np.int64),
+        "str": [f"s{i}" for i in range(count)],
+        "floats": np.arange(count * 3, dtype=np.float32).reshape(count, 3),
+        "date": np.arange(count).astype("datetime64[s]"),
+    })
+    assert ids.dtype == np.uint64
+    assert ids.tolist() == list(range(1, count + 1))
+    assert box.count() == count
+
+    obj = box.get(101)
+    assert obj.int64 == 100
+    assert obj.str == "s100"
+    assert obj.floats.tolist() == [300, 301, 302]
+    assert obj.date.timestamp() == 100
+    assert obj.int32 == 0  # unset
+    assert obj.flex is None
+
+    columns = box.get_all_columns(["int64", "floats"])
+    assert np.array_equal(columns["int64"], np.arange(count))
+    assert np.array_equal(columns["floats"], np.arange(count * 3, dtype=np.float32).reshape(count, 3))
+
+    # Existing IDs are updated, 0 IDs are inserted
+    ids = box.put_columns({"id": np.array([5, 0]), "str": np.array(["updated", "new"], dtype=object)})
+    assert ids.tolist() == [5, count + 1]
+    assert box.get(5).str == "updated"
+    assert box.get(5).int64 == 0  # columns replace whole objects
+    assert box.get(count + 1).str == "new"
+
+    with pytest.raises(ValueError):
+        box.put_columns({"int64": np.arange(3), "int32": np.arange(2)})
+    with pytest.raises(Exception):
+        box.put_columns({"unknown": np.arange(3)})
+    assert box.count() == count + 1
@@ -0,0 +1,76 @@
+import pytest
+
+from tests.model import TestEntity
+from tests.common import *
+
+
+def test_cursor_iteration(test_store):
+    box = test_store.box(TestEntity)
+    box.put([TestEntity(str=f"foo{i}", int32=i) for i in range(10)])
+    box.remove(4)
+
+    with test_store.read_tx() as tx:
+        cursor = tx.cursor(TestEntity)
+        assert cursor.count() == 9
+        assert [o.int32 for o in cursor] == [0, 1, 2, 4, 5, 6, 7, 8, 9]
+
+        assert cursor.first().id == 1
+        assert cursor.next().id == 2
+        assert cursor.current().id == 2
+
+        assert cursor.seek(7)
+        assert cursor.current().str == "foo6"
+        assert cursor.next().id == 8
+        assert not cursor.seek(4)
+        assert [o.id for o in cursor.iter(start_id=6)] == [6, 7, 8, 9, 10]
+        assert [o.id for o in cursor.iter(start_id=4)] == [5, 6, 7, 8, 9, 10]  # removed: starts at the next ID
+        assert list(cursor.iter(start_id=11)) == []
+
+        # lower-bound seek to a removed or missing ID, also from positions before and after it
+        assert cursor.seek(4, lower_bound=True)
+        assert cursor.current().id == 5
+        cursor.first()
+        assert cursor.seek(4, lower_bound=True) and cursor.current().id == 5
+        cursor.get(9)
+        assert cursor.seek(4, lower_bound=True) and cursor.current().id == 5
+        assert cursor.seek(3, lower_bound=True) and cursor.current().id == 3
+        assert not cursor.seek(11, lower_bound=True)
+
+        assert cursor.get(4) is None
+        assert cursor.get(3).str == "foo2"
+        assert cursor.next().id == 5  # get() moved the cursor
+
+        raw = list(cursor.iter(raw=True))
+        assert len(raw) == 9 and all(isinstance(data, bytes) for data in raw)
+        assert raw[0] == cursor.get_raw(1)
+        assert TestEntity._unmarshal(raw[0]).str == "foo0"
+
+    with pytest.raises(Exception):
+        cursor.first()
+
+
+def test_cursor_write(test_store):
+    box = test_store.box(TestEntity)
+
+    with test_store.write_tx() as tx:
+        with tx.cursor(TestEntity) as cursor:
+            assert cursor.first() is None
+            obj = TestEntity(str="foo")
+            assert cursor.put(obj) == 1 and obj.id == 1
+            cursor.put(TestEntity(str="bar"))
+            data = cursor.get_raw(1)
+            # copy of the data under a new ID (the ID is stored in the data)
+            copy = TestEntity._unmarshal(data)
+            copy.id = 3
+            cursor.put_raw(3, TestEntity._marshal(copy, 3))
+            assert cursor.remove(2)
+            assert not cursor.remove(2)
+        with pytest.raises(Exception):
+            cursor.count()
+
+    assert [o.str for o in box.get_all()] == ["foo", "foo"]
+    assert box.get(3).id == 3
+
+    with test_store.write_tx() as tx:
+        assert tx.cursor(TestEntity).remove_all() == 2
+    assert box.is_empty()
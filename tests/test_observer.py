@@ -0,0 +1,91 @@
+import asyncio
+import threading
+from objectbox.aio import AsyncStore
+from tests.common import *
+from tests.model import *
+
+
+def test_subscribe(test_store):
+    box = test_store.box(TestEntity)
+    flex_box = test_store.box(TestEntityFlex)
+    notified = threading.Event()
+    calls = []
+    threads = []
+
+    def callback(entities):
+        calls.append(entities)
+        threads.append(threading.current_thread())
+        notified.set()
+
+    subscription = test_store.subscribe(TestEntity, callback)
+    flex_box.put(TestEntityFlex(flex=1))  # other entity: no notification
+    box.put(TestEntity(str="a"))
+    assert notified.wait(5)
+    assert calls == [[TestEntity]]
+    assert threads[0] is not threading.current_thread()
+
+    # a callback blocking the thread: commits meanwhile are coalesced into a single call
+    release = threading.Event()
+    calls.clear()
+    notified.clear()
+    blocking = test_store.subscribe([TestEntity, TestEntityFlex], lambda entities: release.wait(5))
+    box.put(TestEntity(str="b"))
+    assert notified.wait(5)
+    notified.clear()
+    calls.clear()
+    for i in range(20):
+        box.put(TestEntity(str=str(i)))
+    with test_store.write_tx():
+        box.put(TestEntity(str="c"))
+        flex_box.put(TestEntityFlex(flex=2))
+    release.set()
+    assert notified.wait(5)
+    blocking.close()
+    box.put(TestEntity(str="d"))
+    assert notified.wait(5)
+    assert len(calls) <= 3  # the first commit may have been picked up before the thread blocked
+    assert calls[-1] == [TestEntity]
+
+    subscription.close()
+    notified.clear()
+    box.put(TestEntity(str="e"))
+    assert not notified.wait(0.2)
+
+
+def test_changes_iterator(test_store):
+    box = test_store.box(TestEntity)
+    with test_store.changes([TestEntity, TestEntityFlex]) as feed:
+        assert feed.next(timeout=0.05) is None
+        box.put(TestEntity(str="a"))
+        box.put(TestEntity(str="b"))
+        assert feed.next(timeout=5) == [TestEntity]
+
+        test_store.box(TestEntityFlex).put(TestEntityFlex(flex=1))
+        for entities in feed:
+            if TestEntityFlex in entities:  # TestEntity may still be pending from the second put
+                break
+
+    # closing the store ends the iteration
+    feed = test_store.changes(TestEntity)
+    thread = threading.Thread(target=lambda: list(feed))
+    thread.start()
+    test_store.close()
+    thread.join(5)
+    assert not thread.is_alive()
+
+
+def test_aio_changes():
+    async def main():
+        async with AsyncStore(create_test_store()) as store:
+            box = store.box(TestEntity)
+            async with store.changes(TestEntity) as feed:
+                await box.put(TestEntity(str="a"))
+                assert await asyncio.wait_for(feed.__anext__(), 5) == [TestEntity]
+                await asyncio.gather(*[box.put(TestEntity(str=str(i))) for i in range(10)])
+                async for entities in feed:
+                    assert entities == [TestEntity]
+                    break
+            with pytest.raises(StopAsyncIteration):
+                await feed.__anext__()
+
+    asyncio.run(main())
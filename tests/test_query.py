@@ -1,3 +1,6 @@
+import os
+import sys
+
 import objectbox
 from objectbox import *
 from objectbox.c import *
@@ -326,6 +329,264 @@ def test_offset_limit(test_store):
     assert len(query.find()) == 4
 
 
+def test_order(test_store):
+    box = test_store.box(TestEntity)
+    box.put([TestEntity(str=s, int64=i, int32=i % 3) for i, s in enumerate(["b", "A", "c", "a", "B", "C"])])
+
+    query = box.query().order(TestEntity.int64, descending=True).build()
+    assert [o.int64 for o in query.find()] == [5, 4, 3, 2, 1, 0]
+    assert [o.int64 for o in query.limit(2).find()] == [5, 4]  # top k
+    assert [o.int64 for o in query.offset(2).limit(3).find()] == [3, 2, 1]
+
+    # multiple keys
+    query = box.query().order(TestEntity.int32).order(TestEntity.int64, descending=True).build()
+    assert [(o.int32, o.int64) for o in query.find()] == [(0, 3), (0, 0), (1, 4), (1, 1), (2, 5), (2, 2)]
+
+    query = box.query(TestEntity.int64.greater_than(0)).order(TestEntity.str, case_sensitive=True).build()
+    assert [o.str for o in query.find()] == ["A", "B", "C", "a", "c"]
+    query = box.query().order(TestEntity.str).order(TestEntity.int64).build()
+    assert [o.str.lower() for o in query.find()] == ["a", "a", "b", "b", "c", "c"]
+
+
+def test_in(test_store):
+    box = test_store.box(TestEntity)
+    box.put([TestEntity(str=f"foo{i}", int64=i * 10, int32=i, int16=i, bool=i % 2 == 1) for i in range(10)])
+
+    def ids(condition):
+        return box.query(condition).build().find_ids()
+
+    assert ids(TestEntity.int64.is_in([20, 40, 45, 90])) == [3, 5, 10]
+    assert ids(TestEntity.int64.is_in(np.array([20, 40], dtype=np.int64))) == [3, 5]
+    assert ids(TestEntity.int32.is_in(np.arange(7, 100))) == [8, 9, 10]
+    assert ids(TestEntity.int32.not_in([0, 1, 2, 3, 4, 5, 6])) == [8, 9, 10]
+    assert ids(TestEntity.int64.not_in(np.arange(10, 100, 10))) == [1]
+    assert ids(TestEntity.id.is_in([2, 4, 42])) == [2, 4]
+    assert ids(TestEntity.int16.is_in([1, 2])) == [2, 3]  # smaller types are supported via any()
+    assert ids(TestEntity.int16.not_in([1, 2]) & TestEntity.bool.is_in([True])) == [4, 6, 8, 10]
+    assert ids(TestEntity.str.is_in(["foo1", "FOO2", "bar"])) == [2]
+    assert ids(TestEntity.str.is_in(["foo1", "FOO2"], case_sensitive=False)) == [2, 3]
+    assert ids(TestEntity.int64.is_in(np.arange(0, 1000000, 20)) & TestEntity.int32.greater_than(3)) == [5, 7, 9]
+
+
+def test_cached_query(test_store):
+    box = test_store.box(TestEntity)
+    box.put([TestEntity(str=f"foo{i}", int64=i, int32=i % 3, float64=i / 2, bytes=bytes([i])) for i in range(10)])
+
+    def find_ids(condition):
+        with box.cached_query(condition) as query:
+            return query.find_ids()
+
+    assert find_ids(TestEntity.int64.greater_than(7)) == [9, 10]
+    assert find_ids(TestEntity.int64.greater_than(5)) == [7, 8, 9, 10]  # reused with a new value
+    assert (box._query_cache.hits, box._query_cache.misses) == (1, 1)
+
+    # conditions with several values of the same property
+    condition = TestEntity.int64.greater_than(2) & TestEntity.int64.less_than(5) | TestEntity.str.equals("foo9")
+    assert find_ids(condition) == [4, 5, 10]
+    condition = TestEntity.int64.greater_than(0) & TestEntity.int64.less_than(2) | TestEntity.str.equals("foo8")
+    assert find_ids(condition) == [2, 9]
+    assert box._query_cache.hits == 2
+
+    assert find_ids(TestEntity.int64.between(2, 3)) == [3, 4]
+    assert find_ids(TestEntity.int64.between(5, 6)) == [6, 7]
+    assert find_ids(TestEntity.float64.between(0.4, 1.1)) == [2, 3]
+    assert find_ids(TestEntity.float64.greater_than(4.1)) == [10]
+    assert find_ids(TestEntity.float64.greater_than(3.6)) == [9, 10]
+    assert find_ids(TestEntity.int64.is_in([1, 2])) == [2, 3]
+    assert find_ids(TestEntity.int64.is_in(np.array([3, 4, 9]))) == [4, 5, 10]
+    assert find_ids(TestEntity.int32.not_in([0, 1])) == [3, 6, 9]
+    assert find_ids(TestEntity.int32.not_in([2])) == [1, 2, 4, 5, 7, 8, 10]
+    assert find_ids(TestEntity.str.is_in(["foo1", "foo2"])) == [2, 3]
+    assert find_ids(TestEntity.str.is_in(["foo4"])) == [5]
+    assert find_ids(TestEntity.bytes.equals(bytes([3]))) == [4]
+    assert find_ids(TestEntity.bytes.equals(bytes([4]))) == [5]
+    assert find_ids(TestEntity.str.equals("FOO1", case_sensitive=False)) == [2]
+    assert find_ids(TestEntity.str.equals("FOO1")) == []  # case_sensitive is part of the shape
+    assert find_ids(None) == list(range(1, 11))
+
+    # in use queries are not shared; offset/limit are reset
+    with box.cached_query(TestEntity.int64.less_than(5)) as query:
+        query.limit(1)
+        assert find_ids(TestEntity.int64.less_than(2)) == [1, 2]
+        assert query.find_ids() == [1]
+    assert find_ids(TestEntity.int64.less_than(3)) == [1, 2, 3]
+
+    # evicted queries are closed
+    cache = box._query_cache
+    cache.clear()
+    cache._max_size = 2
+    with box.cached_query(TestEntity.int8.equals(0)) as first:
+        pass
+    assert find_ids(TestEntity.int16.equals(0)) == list(range(1, 11))
+    assert find_ids(TestEntity.int32.equals(0)) == [1, 4, 7, 10]
+    assert len(cache) == 2 and first._c_query is None
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_query_lifecycle(test_store):
+    box = test_store.box(TestEntity)
+    box.put([TestEntity(int64=i) for i in range(5)])
+
+    qb = box.query(TestEntity.int64.greater_than(2))
+    with qb.build() as query:
+        assert qb._c_builder is None  # closed by build()
+        assert query.count() == 2
+    assert query._c_query is None
+    query.close()  # no effect
+
+    with box.query() as qb:
+        qb.greater_than_int(TestEntity.int64, 3)
+    assert qb._c_builder is None
+
+    # closing the store first makes closing queries a no-op
+    query = box.query().build()
+    test_store.close()
+    query.close()
+    qb.close()
+
+    # a query that failed to initialize can still be closed (e.g. by __del__)
+    Query.__new__(Query).close()
+    PropertyQuery.__new__(PropertyQuery).close()
+
+
+def _rss_kb() -> int:
+    with open("/proc/self/statm") as file:
+        return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Reads RSS from /proc")
+def test_query_no_leak(test_store):
+    """ Builds many queries (one million if OBX_TEST_LEAK_QUERIES=1000000) and checks that the RSS stays flat. """
+    box = test_store.box(TestEntity)
+    count = int(os.environ.get("OBX_TEST_LEAK_QUERIES", 100000))
+
+    def run(n: int):
+        for i in range(n):
+            box.query(TestEntity.int64.greater_than(i) & TestEntity.str.equals("foo")).build().count()
+
+    run(min(count, 10000))  # warm up (allocator pools etc.)
+    before = _rss_kb()
+    run(count)
+    growth = _rss_kb() - before
+    # unreleased queries and builders leaked about 1.7 KB per iteration
+    assert growth < 8 * 1024, f"RSS grew by {growth} KB building {count} queries"
+
+
+def test_iter(test_store):
+    box = test_store.box(TestEntity)
+    box.put([TestEntity(str=str(i), int64=i % 2) for i in range(25)])
+
+    query = box.query(TestEntity.int64.equals(0)).build()
+    assert [obj.str for obj in query.iter(batch_size=5)] == [str(i) for i in range(0, 25, 2)]
+    assert [len(batch) for batch in query.iter(batch_size=5, batches=True)] == [5, 5, 3]
+    assert [len(batch) for batch in query.iter(batch_size=13, batches=True)] == [13]
+    assert len(list(query.iter(batch_size=1))) == 13
+    assert [obj.str for obj in query.find()] == [str(i) for i in range(0, 25, 2)]  # iter() leaves the query unchanged
+
+    # Continues where it left off
+    it = query.iter(batch_size=2)
+    assert next(it).str == "0"
+    assert len(list(it)) == 12
+
+    # Respects offset and limit
+    query.offset(3)
+    query.limit(7)
+    assert [obj.str for obj in query.iter(batch_size=3)] == [str(i) for i in range(6, 20, 2)]
+    query.limit(0)
+    assert [obj.str for obj in query.iter(batch_size=4)] == [str(i) for i in range(6, 25, 2)]
+    assert len(query.find()) == 10
+
+    # Respects the order
+    query = box.query(TestEntity.int64.equals(0)).order(TestEntity.str, descending=True).build()
+    assert [obj.str for obj in query.iter(batch_size=4)] == [obj.str for obj in query.find()]
+
+    # Writing while iterating is not possible (the read transaction is held)
+    it = query.iter(batch_size=2)
+    next(it)
+    with pytest.raises(Exception):
+        box.put(TestEntity())
+
+    # Abandoned iteration releases the transaction
+    it.close()
+    box.put(TestEntity())
+
+    with pytest.raises(ValueError):
+        next(query.iter(batch_size=0))
+
+
+def test_visit(test_store):
+    box = test_store.box(TestEntity)
+    box.put([TestEntity(str=str(i), int64=i % 2, floats=np.array([i, i], dtype=np.float32), flex={"i": i})
+             for i in range(25)])
+    query = box.query(TestEntity.int64.equals(0)).build()
+
+    visited = []
+    query.visit(visited.append)
+    assert [obj.str for obj in visited] == [obj.str for obj in query.find()]
+    assert visited[12].floats.tolist() == [24, 24]  # values are copies, still valid after visiting
+    assert visited[12].flex == {"i": 24}
+
+    # Stops early if the callback returns False
+    visited = []
+    query.visit(lambda obj: visited.append(obj) or len(visited) < 3)
+    assert len(visited) == 3
+
+    def fail(obj):
+        raise ValueError("stop")
+
+    with pytest.raises(ValueError):
+        query.visit(fail)
+
+    # Generator variant
+    assert [obj.str for obj in query.visit_iter(batch_size=4)] == [str(i) for i in range(0, 25, 2)]
+    assert sum(obj.floats[0] for obj in query.visit_iter()) == sum(range(0, 25, 2))
+    it = query.visit_iter(batch_size=2)
+    assert next(it).str == "0"
+    it.close()
+    assert len(query.find()) == 13
+
+
+def test_property_query(test_store):
+    box = test_store.box(TestEntity)
+    box.put([TestEntity(str=f"foo{i % 3}", int64=i, int32=-i, float64=i / 2, bool=i % 2 == 0, date=1000 * i)
+             for i in range(1, 11)])
+    query = box.query(TestEntity.int64.greater_than(2)).build()
+
+    int64 = query.property(TestEntity.int64)
+    assert int64.count() == 8
+    assert (int64.min(), int64.max(), int64.sum()) == (3, 10, 52)
+    assert int64.avg() == 6.5
+    assert int64.find_values().tolist() == list(range(3, 11))
+    assert int64.find_values().dtype == np.int64
+
+    float64 = query.property("float64")
+    assert (float64.min(), float64.max(), float64.sum()) == (1.5, 5.0, 26.0)
+    assert isinstance(float64.max(), float)
+    assert query.property(TestEntity.int32).min() == -10
+    assert query.property(TestEntity.int32).find_values().dtype == np.int32
+    assert query.property(TestEntity.bool).find_values().tolist() == [i % 2 == 0 for i in range(3, 11)]
+    assert query.property(TestEntity.date).find_values()[0] == np.datetime64(3000, 'ms')
+
+    strings = query.property(TestEntity.str)
+    assert sorted(strings.find_values()) == sorted(f"foo{i % 3}" for i in range(3, 11))
+    assert strings.distinct().count() == 3
+    assert sorted(strings.find_values()) == ["foo0", "foo1", "foo2"]
+    with pytest.raises(Exception):
+        strings.max()
+
+    empty = box.query(TestEntity.int64.greater_than(100)).build().property(TestEntity.int64)
+    assert empty.min() is None and empty.max() is None and empty.avg() is None
+    assert empty.sum() == 0 and empty.count() == 0
+    assert len(empty.find_values()) == 0
+    empty.close()
+
+    # closing the query closes its property queries (natively, before the query)
+    query.close()
+    assert int64._c_prop_query is None and strings._c_prop_query is None
+    int64.close()  # no effect
+
+
 def test_any_all(test_store):
     box = test_store.box(TestEntity)
 
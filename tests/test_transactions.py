@@ -1,3 +1,7 @@
+import threading
+
+import pytest
+
 import objectbox
 from tests.model import TestEntity
 from tests.common import *
@@ -39,3 +43,61 @@ def test_transactions(test_store):
         assert "Cannot start a write transaction inside a read only transaction" in str(err)
     finally:
         test_store.close()
+
+
+def test_transaction_box(test_store):
+    box = test_store.box(TestEntity)
+
+    with test_store.write_tx() as tx:
+        assert tx.is_write and tx.is_active
+        tx_box = tx.box(TestEntity)
+        assert tx.box(TestEntity) is tx_box
+        id1 = tx_box.put(TestEntity(str="first"))
+        second = TestEntity(str="second")
+        tx_box.put([second, TestEntity(str="third")])
+        assert second.id == id1 + 1
+        assert tx_box.count() == 3
+        assert tx_box.get(id1).str == "first"
+        assert box.get(id1).str == "first"  # the Box operates within the active transaction too
+        assert tx_box.remove(second)
+        assert not tx_box.remove(second.id)
+        assert tx_box.get(second.id) is None
+
+    assert not tx.is_active
+    with pytest.raises(Exception):
+        tx_box.get(id1)
+
+    with test_store.read_tx() as tx:
+        assert not tx.is_write
+        assert [o.str for o in tx.box(TestEntity).get_all()] == ["first", "third"]
+
+    with test_store.write_tx() as tx:
+        assert tx.box(TestEntity).remove_all() == 2
+    assert box.count() == 0
+
+
+def test_transaction_active(test_store):
+    box = test_store.box(TestEntity)
+    box.put(TestEntity(str="foo"))
+
+    assert test_store._active_tx.tx is None
+    with test_store.read_tx() as tx:
+        assert test_store._active_tx.tx is tx
+        with test_store.read_tx() as inner:
+            assert test_store._active_tx.tx is inner
+            assert box.get(1).str == "foo"
+        assert test_store._active_tx.tx is tx
+        assert len(box.query(TestEntity.str.equals("foo")).build().find()) == 1
+
+        # other threads do not see the transaction
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(test_store._active_tx.tx))
+        thread.start()
+        thread.join()
+        assert seen == [None]
+    assert test_store._active_tx.tx is None
+
+    with pytest.raises(Exception):
+        with test_store.write_tx():
+            raise Exception("abort")
+    assert test_store._active_tx.tx is None